@@ -0,0 +1,208 @@
+"""
+Registry of execution backends for the Matrix class.
+
+A backend is any object exposing some of the kernels below, each taking
+Matrix objects and returning a list of row lists (or a number for det):
+
+    matmul(a, b), add(a, b), sub(a, b), transpose(a), det(a), inverse(a),
+    solve(a, b)
+
+A backend may also provide accepts(*matrices), telling whether its kernels
+can compute with the elements of the given operands.
+
+Matrix looks up the kernel for an operation on its backend and falls back to
+its own pure-Python code when the backend does not provide one or does not
+accept the operands, so the "python" backend simply provides none. The
+"numpy" backend is only registered when NumPy can be imported, and only
+accepts floating point matrices, so that integer and rational matrices keep
+their exact elements.
+
+Example Usage
+-------------
+    import MatrixProgram.backends as backends
+    backends.set_backend("numpy")    # Every matrix without its own backend
+    A = Matrix([[1,2],[3,4]], backend="python")    # This matrix only
+"""
+
+try:
+    import numpy
+except ImportError:    # NumPy is optional
+    numpy = None
+
+
+_backends = {}
+_default = "python"
+
+
+class PythonBackend:
+    """
+    The pure-Python backend, which leaves every operation to Matrix itself.
+    """
+
+    name = "python"
+
+
+class NumpyBackend:
+    """
+    A backend dispatching to vectorized NumPy (and so BLAS/LAPACK) kernels.
+    """
+
+    name = "numpy"
+
+    @staticmethod
+    def accepts(*matrices):
+        # Converting to float64 must change nothing, as in parallel.py
+        return(all(mat.storage == "compact" or all(isinstance(j, float)
+            for i in mat._elements() for j in i) for mat in matrices))
+
+    @staticmethod
+    def _as_array(mat):
+        # Compact matrices share their buffer with NumPy without copying
+        m, n = mat.get_size()
+        if mat._data is not None:
+            return(numpy.frombuffer(mat._data, dtype=numpy.float64)
+                .reshape(m, n))
+        return(numpy.array(mat._elements(), dtype=numpy.float64))
+
+    def matmul(self, a, b):
+        return((self._as_array(a) @ self._as_array(b)).tolist())
+
+    def add(self, a, b):
+        return((self._as_array(a) + self._as_array(b)).tolist())
+
+    def sub(self, a, b):
+        return((self._as_array(a) - self._as_array(b)).tolist())
+
+    def transpose(self, a):
+        return(self._as_array(a).T.tolist())
+
+    def det(self, a):
+        return(float(numpy.linalg.det(self._as_array(a))))
+
+    def inverse(self, a):
+        try:
+            return(numpy.linalg.inv(self._as_array(a)).tolist())
+        except numpy.linalg.LinAlgError:
+            raise AssertionError("The matrix is not invertible.")
+
+    def solve(self, a, b):
+        try:
+            return(numpy.linalg.solve(self._as_array(a),
+                self._as_array(b)).tolist())
+        except numpy.linalg.LinAlgError:
+            raise AssertionError("The matrix is not invertible.")
+
+
+def register_backend(name, backend):
+    """
+    Makes a backend available under the given name, replacing any backend
+    already registered with that name.
+
+    Parameters
+    ----------
+        name : string
+            name used to select the backend
+        backend : object
+            object providing some of the kernels listed in this module
+
+    Returns
+    -------
+        None
+    """
+
+    assert isinstance(name, str) and name, "Name must be a string."
+    _backends[name] = backend
+
+    return
+
+
+def available_backends():
+    """
+    Gives the names of all the registered backends.
+
+    Returns
+    -------
+        names : list of strings
+    """
+
+    return(list(_backends))
+
+
+def get_backend(name=None):
+    """
+    Gives the backend registered under a name, or the global default backend
+    if no name is given.
+
+    Parameters
+    ----------
+        name : string or None
+            name of the backend
+
+    Returns
+    -------
+        backend : object
+    """
+
+    if name is None:
+        name = _default
+    assert name in _backends, \
+        "Backend \"{}\" is not available.".format(name)
+
+    return(_backends[name])
+
+
+def get_kernel(operation, *matrices):
+    """
+    Gives the kernel of an operation on the backend of the first of its
+    operands, or None if the operation should run in pure Python, either
+    because the backend has no such kernel or because it does not accept
+    the elements of the operands.
+
+    Parameters
+    ----------
+        operation : string
+            name of the kernel, e.g. "matmul"
+        matrices : objects of class Matrix
+            the operands of the operation
+
+    Returns
+    -------
+        kernel : function or None
+    """
+
+    backend = get_backend(matrices[0].backend)
+    kernel = getattr(backend, operation, None)
+    accepts = getattr(backend, "accepts", None)
+    if kernel is not None and accepts is not None and \
+            not accepts(*matrices):
+        return(None)
+
+    return(kernel)
+
+
+def set_backend(name):
+    """
+    Selects the global default backend, used by every matrix that has not
+    chosen its own.
+
+    Parameters
+    ----------
+        name : string
+            name of a registered backend
+
+    Returns
+    -------
+        None
+    """
+
+    global _default
+    assert name in _backends, \
+        "Backend \"{}\" is not available.".format(name)
+    _default = name
+
+    return
+
+
+register_backend("python", PythonBackend())
+if numpy is not None:
+    register_backend("numpy", NumpyBackend())
@@ -0,0 +1,416 @@
+from array import array
+from operator import mul
+
+try:    # Imported as part of the MatrixProgram package
+    from . import backends
+    from . import matrix
+except ImportError:    # Imported from within the MatrixProgram directory
+    import backends
+    import matrix
+
+
+class MatrixBatch:
+    """
+    A class to represent a stack of many matrices of the same size, held in
+    one contiguous row-major array("d") buffer, so that an operation on the
+    whole stack is a single call instead of one Matrix object and one method
+    call per matrix. Operations run as vectorized NumPy kernels when the
+    batch's backend is "numpy" and in pure Python otherwise.
+
+    Attributes
+    ----------
+        count : integer
+            number of matrices in the batch
+        m : integer
+            number of rows of each matrix
+        n : integer
+            number of columns of each matrix
+        backend : string or None
+            name of the backend used by the batch (see the backends module),
+            or None to follow the global default
+
+    Methods
+    -------
+        get_shape() :
+            gives the number of matrices and the size of each
+        to_matrices() :
+            gives the matrices of the batch as Matrix objects
+        matrix_multiply(other) :
+            multiplies each matrix by the matching matrix of another batch,
+            or by a single matrix
+        transpose() :
+            transposes each matrix
+        determinant() :
+            gives the determinant of each matrix
+        inverse() :
+            inverts each matrix
+        solve(b) :
+            solves a system of linear equations with each matrix
+
+    Example Usage
+    -------------
+        A = MatrixBatch([Matrix([[1,2],[3,4]]), Matrix([[0,1],[1,0]])])
+        A.determinant()    # [-2.0, -1.0]
+        B = MatrixBatch([[[1,0],[0,1]]] * 1000)    # From lists of rows
+    """
+
+    __slots__ = ("_data", "_count", "_m", "_n", "_backend")
+
+    def __init__(self, matrices, backend=None):
+        """
+        Instantiates the batch by copying a list of same-sized matrices into
+        one buffer.
+
+        Parameters
+        ----------
+            matrices : list of Matrix objects or of lists of lists of numbers
+                the matrices to place in the batch
+            backend : string or None
+                name of a registered backend, or None (default) to follow
+                the global default backend
+
+        Returns
+        -------
+            None, but creates the batch
+        """
+
+        assert matrices and isinstance(matrices, list), \
+            "Argument must be a list of matrices."
+        if backend is not None:
+            backends.get_backend(backend)    # Ensure backend is available
+
+        data = array("d")
+        shape = None
+        for i in matrices:
+            if not isinstance(i, matrix.Matrix):
+                i = matrix.Matrix(i)    # Validates the rows
+            if shape is None:
+                shape = i.get_size()
+            assert i.get_size() == shape, "Matrices must be the same size."
+            for j in i._elements():
+                data.extend(j)
+
+        self._data = data
+        self._count = len(matrices)
+        self._m, self._n = shape
+        self._backend = backend
+
+        return
+
+    @classmethod
+    def _from_buffer(cls, data, count, m, n, backend=None):
+        """
+        Wraps a buffer of count m x n matrices produced by the library itself
+        without copying or validating it.
+        """
+
+        newBatch = cls.__new__(cls)
+        newBatch._data = data
+        newBatch._count = count
+        newBatch._m = m
+        newBatch._n = n
+        newBatch._backend = backend
+
+        return(newBatch)
+
+    def __len__(self):
+        return(self._count)
+
+    def __getitem__(self, k):
+        """
+        Gives a copy of one matrix of the batch.
+        """
+
+        assert isinstance(k, int) and -self._count <= k < self._count, \
+            "Batch must contain the given matrix."
+        return(matrix.Matrix._from_rows(self._rows(k % self._count),
+            backend=self._backend))
+
+    def __repr__(self):
+        count, m, n = self.get_shape()
+        return("Batch of {} {} x {} matrices with id of {}.".format(
+            count, m, n, str(id(self))))
+
+    @property
+    def backend(self):
+        return(self._backend)
+
+    def get_shape(self):
+        """
+        Gives the number of matrices and the size of each.
+
+        Returns
+        -------
+            count : integer
+                number of matrices in the batch
+            m : integer
+                number of rows of each matrix
+            n : integer
+                number of columns of each matrix
+        """
+
+        return(self._count, self._m, self._n)
+
+    def _rows(self, k):
+        """
+        Gives the rows of the k-th matrix (counted from zero) as lists.
+        """
+
+        m, n = self._m, self._n
+        start = k*m*n
+        return([self._data[start+i*n:start+(i+1)*n].tolist()
+            for i in range(m)])
+
+    def to_matrices(self):
+        """
+        Gives the matrices of the batch as separate Matrix objects.
+
+        Returns
+        -------
+            matrices : list of Matrix objects
+        """
+
+        return([self[k] for k in range(self._count)])
+
+    def _numpy(self):
+        """
+        Gives the NumPy module if the batch should use it, otherwise None.
+        """
+
+        if backends.get_backend(self._backend).name == "numpy":
+            return(backends.numpy)
+        return(None)
+
+    def _as_array(self):
+        # Shares the buffer with NumPy without copying
+        return(backends.numpy.frombuffer(self._data, dtype="float64")
+            .reshape(self._count, self._m, self._n))
+
+    def _from_array(self, result):
+        """
+        Copies a NumPy array of shape (count, m, n) into a new batch.
+        """
+
+        data = array("d")
+        data.frombytes(backends.numpy.ascontiguousarray(result,
+            dtype="float64").tobytes())
+        return(MatrixBatch._from_buffer(data, *result.shape,
+            backend=self._backend))
+
+    def _other_matrices(self, other):
+        """
+        Gives a function returning the rows of the k-th matrix of another
+        batch, or of a single matrix for every k, and the size of them.
+        """
+
+        if isinstance(other, MatrixBatch):
+            assert other._count == self._count, \
+                "Batches must contain the same number of matrices."
+            return(other._rows, other._m, other._n)
+        assert isinstance(other, matrix.Matrix), \
+            "Argument must be a batch or a matrix."
+        rows = [list(i) for i in other._elements()]
+        m, n = other.get_size()
+        return(lambda k: rows, m, n)
+
+    def matrix_multiply(self, other):
+        """
+        Multiplies each matrix by the matching matrix of another batch, or
+        every matrix by the same single matrix.
+
+        Parameters
+        ----------
+            other : object of class MatrixBatch or Matrix
+                the right-hand matrices
+
+        Returns
+        -------
+            newBatch : object of class MatrixBatch
+                the batch of products
+        """
+
+        otherRows, m2, n2 = self._other_matrices(other)
+        count, m1, n1 = self.get_shape()
+        assert n1 == m2, "Matrices must be of compatible size."
+
+        numpy = self._numpy()
+        if numpy is not None:
+            right = other._as_array() if isinstance(other, MatrixBatch) \
+                else numpy.array(otherRows(0), dtype="float64")
+            return(self._from_array(numpy.matmul(self._as_array(), right)))
+
+        data = array("d")
+        columns = None
+        for k in range(count):
+            if columns is None or isinstance(other, MatrixBatch):
+                columns = list(zip(*otherRows(k)))
+            for row in self._rows(k):
+                data.extend([sum(map(mul, row, column))
+                    for column in columns])
+
+        return(MatrixBatch._from_buffer(data, count, m1, n2, self._backend))
+
+    def transpose(self):
+        """
+        Transposes each matrix of the batch.
+
+        Returns
+        -------
+            newBatch : object of class MatrixBatch
+                the batch of transposes
+        """
+
+        count, m, n = self.get_shape()
+        numpy = self._numpy()
+        if numpy is not None:
+            return(self._from_array(self._as_array().transpose(0, 2, 1)))
+
+        data = array("d")
+        for k in range(count):
+            start = k*m*n
+            for j in range(n):
+                # Each column is a strided slice of the matrix
+                data.extend(self._data[start+j:start+m*n:n])
+
+        return(MatrixBatch._from_buffer(data, count, n, m, self._backend))
+
+    def determinant(self):
+        """
+        Computes the determinant of each (square) matrix of the batch, with
+        closed forms for 2 x 2 and 3 x 3 matrices and LU elimination for
+        larger ones.
+
+        Returns
+        -------
+            values : list of floating point numbers
+                the determinant of each matrix
+        """
+
+        count, m, n = self.get_shape()
+        assert m == n, "Matrices must be square."
+
+        numpy = self._numpy()
+        if numpy is not None:
+            return(numpy.linalg.det(self._as_array()).tolist())
+
+        d = self._data
+        if m == 1:
+            return(d.tolist())
+        if m == 2:
+            return([d[k]*d[k+3] - d[k+1]*d[k+2] for k in range(0, 4*count, 4)])
+        if m == 3:
+            return([d[k]*(d[k+4]*d[k+8] - d[k+5]*d[k+7])
+                - d[k+1]*(d[k+3]*d[k+8] - d[k+5]*d[k+6])
+                + d[k+2]*(d[k+3]*d[k+7] - d[k+4]*d[k+6])
+                for k in range(0, 9*count, 9)])
+
+        values = []
+        for k in range(count):
+            lu, perm, sign, singular = matrix.lu_decompose(self._rows(k),
+                overwrite=True)
+            value = 0.0
+            if not singular:
+                value = float(sign)
+                for i in range(m):
+                    value *= lu[i][i]
+            values.append(value)
+
+        return(values)
+
+    def inverse(self):
+        """
+        Inverts each (square, invertible) matrix of the batch.
+
+        Returns
+        -------
+            newBatch : object of class MatrixBatch
+                the batch of inverses
+        """
+
+        count, m, n = self.get_shape()
+        assert m == n, "Matrices must be square."
+
+        if m in (2, 3) and self._numpy() is None:
+            # Closed form of the adjugate divided by the determinant
+            d = self._data
+            size = m*m
+            data = array("d")
+            for index, det in enumerate(self.determinant()):
+                k = index*size
+                scale = max(abs(i) for i in d[k:k+size])
+                assert abs(det) > matrix.PIVOT_TOLERANCE * scale**m, \
+                    "Matrix {} of the batch is not invertible.".format(index)
+                if m == 2:
+                    data.extend((d[k+3]/det, -d[k+1]/det,
+                        -d[k+2]/det, d[k]/det))
+                    continue
+                a, b, c, e, f, g, h, i, j = d[k:k+9]
+                data.extend(((f*j - g*i)/det, (c*i - b*j)/det,
+                    (b*g - c*f)/det, (g*h - e*j)/det, (a*j - c*h)/det,
+                    (c*e - a*g)/det, (e*i - f*h)/det, (b*h - a*i)/det,
+                    (a*f - b*e)/det))
+            return(MatrixBatch._from_buffer(data, count, m, n, self._backend))
+
+        identity = [[float(i == j) for j in range(n)] for i in range(n)]
+
+        return(self._solve(lambda k: identity, n, "inverse"))
+
+    def solve(self, b):
+        """
+        Solves A * X = B for each matrix A of the batch.
+
+        Parameters
+        ----------
+            b : object of class MatrixBatch or Matrix
+                the constants, either one n x k matrix per matrix of the
+                batch or a single n x k matrix used for all of them
+
+        Returns
+        -------
+            newBatch : object of class MatrixBatch
+                the batch of solutions
+        """
+
+        count, m, n = self.get_shape()
+        assert m == n, "Matrices must be square."
+        otherRows, m2, n2 = self._other_matrices(b)
+        assert m2 == m, \
+            "The matrix and the vector do not have the same number of rows."
+
+        numpy = self._numpy()
+        if numpy is not None:
+            right = b._as_array() if isinstance(b, MatrixBatch) else \
+                numpy.broadcast_to(numpy.array(otherRows(0), dtype="float64"),
+                    (count, m2, n2))
+            try:
+                return(self._from_array(numpy.linalg.solve(self._as_array(),
+                    right)))
+            except numpy.linalg.LinAlgError:
+                raise AssertionError("The matrix is not invertible.")
+
+        return(self._solve(otherRows, n2, "solve"))
+
+    def _solve(self, otherRows, k, operation):
+        """
+        Solves A * X = B for each matrix, in pure Python unless the batch
+        uses NumPy, with B given by otherRows(index) and having k columns.
+        """
+
+        count, m, n = self.get_shape()
+        numpy = self._numpy()
+        if numpy is not None and operation == "inverse":
+            try:
+                return(self._from_array(numpy.linalg.inv(self._as_array())))
+            except numpy.linalg.LinAlgError:
+                raise AssertionError("The matrix is not invertible.")
+
+        data = array("d")
+        for index in range(count):
+            lu, perm, sign, singular = matrix.lu_decompose(self._rows(index),
+                overwrite=True)
+            assert not singular, \
+                "Matrix {} of the batch is not invertible.".format(index)
+            for row in matrix.lu_solve(lu, perm, otherRows(index)):
+                data.extend(row)
+
+        return(MatrixBatch._from_buffer(data, count, n, k, self._backend))
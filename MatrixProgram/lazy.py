@@ -0,0 +1,296 @@
+"""
+Lazy matrix expressions with elementwise fusion.
+
+Operations on a LazyMatrix only record an expression graph. When the result
+is needed, every chain of elementwise operations (additions, subtractions and
+scalar operations) is compiled into a single function of the input elements
+and applied in one pass over the rows, so no intermediate matrix is built
+(except once every FUSION_DEPTH operations of a very long chain). Each node
+is compiled once, so subexpressions used several times are computed once per
+element. Matrix products are evaluated on their own and then take part in the
+fused pass like any other input.
+
+Evaluation happens on evaluate() or on any access to the elements
+(get_value, values, printing); the result is kept so that later accesses are
+free.
+
+Example Usage
+-------------
+    from MatrixProgram.lazy import lazy
+    D = lazy(A).matrix_add(B).matrix_sub(C).scalar_multiply(2)
+    D.evaluate()    # One pass, no temporaries for A + B or (A + B) - C
+"""
+
+try:    # Imported as part of the MatrixProgram package
+    from . import matrix
+except ImportError:    # Imported from within the MatrixProgram directory
+    import matrix
+
+
+# Elementwise operations and the source code template each compiles to
+_ELEMENTWISE = {
+    "add": "{} + {}",
+    "sub": "{} - {}",
+    "scalar_add": "{} + {}",
+    "scalar_multiply": "{} * {}",
+}
+
+# Longest chain of elementwise operations fused into one pass; longer chains
+# are split into several passes so that the generated functions stay small
+FUSION_DEPTH = 64
+
+
+class LazyMatrix:
+    """
+    A class to represent a matrix expression which has not been computed
+    yet, as a node of an expression graph.
+
+    Attributes
+    ----------
+        operation : string
+            "leaf" for a wrapped Matrix, otherwise the operation of the node
+        operands : tuple
+            the Matrix of a leaf, or the LazyMatrix/number operands
+
+    Methods
+    -------
+        get_size() :
+            gives the size of the result without evaluating it
+        matrix_add(other), matrix_sub(other), matrix_multiply(other) :
+            records an operation with another (lazy) matrix
+        scalar_add(number), scalar_multiply(number) :
+            records an operation with a scalar number
+        evaluate() :
+            computes the expression, fusing elementwise operations
+        get_value(row, column), values :
+            elements of the result, evaluating it if needed
+    """
+
+    __slots__ = ("operation", "operands", "_size", "_result")
+
+    def __init__(self, operation, operands, size):
+        self.operation = operation
+        self.operands = operands
+        self._size = size
+        self._result = None
+
+    def __repr__(self):
+        m, n = self.get_size()
+        return("{} x {} LazyMatrix object ({}) with id of {}.".format(
+            m, n, self.operation, str(id(self))))
+
+    def __str__(self):
+        return(str(self.evaluate()))
+
+    def get_size(self):
+        """
+        Gives the size of the result, which is known without evaluating.
+
+        Returns
+        -------
+            m : integer
+                number of rows
+            n : integer
+                number of columns
+        """
+
+        return(self._size)
+
+    def _binary(self, operation, other):
+        """
+        Records an elementwise operation with a matrix of the same size.
+        """
+
+        other = lazy(other)
+        assert self.get_size() == other.get_size(), \
+            "Matrices must be the same size."
+        return(LazyMatrix(operation, (self, other), self._size))
+
+    def _scalar(self, operation, number):
+        """
+        Records an elementwise operation with a scalar number.
+        """
+
+        assert matrix.is_number(number), "Argument must be a number."
+        return(LazyMatrix(operation, (self, number), self._size))
+
+    def matrix_add(self, other):
+        """
+        Records the addition of another (lazy) matrix.
+        """
+
+        return(self._binary("add", other))
+
+    def matrix_sub(self, other):
+        """
+        Records the subtraction of another (lazy) matrix.
+        """
+
+        return(self._binary("sub", other))
+
+    def scalar_add(self, number):
+        """
+        Records the addition of a number to every element. Unlike
+        Matrix.scalar_add, this gives a new expression.
+        """
+
+        return(self._scalar("scalar_add", number))
+
+    def scalar_multiply(self, number):
+        """
+        Records the multiplication of every element by a number. Unlike
+        Matrix.scalar_multiply, this gives a new expression.
+        """
+
+        return(self._scalar("scalar_multiply", number))
+
+    def matrix_multiply(self, other):
+        """
+        Records the product (self * other) with another (lazy) matrix.
+        """
+
+        other = lazy(other)
+        m1, n1 = self.get_size()
+        m2, n2 = other.get_size()
+        assert n1 == m2, "Matrices must be of compatible size."
+        return(LazyMatrix("matmul", (self, other), (m1, n2)))
+
+    def _operands(self):
+        """
+        Gives the operands of this node which are elementwise operations
+        not evaluated yet, and so can be fused with it.
+        """
+
+        return([i for i in self.operands if isinstance(i, LazyMatrix)
+            and i._result is None and i.operation in _ELEMENTWISE])
+
+    def _postorder(self):
+        """
+        Gives this node and the elementwise nodes below it which are not
+        evaluated yet, each once and after its operands. The graph is walked
+        without recursion, so that long chains do not hit the recursion
+        limit.
+        """
+
+        order = []
+        seen = {id(self)}
+        stack = [(self, iter(self._operands()))]
+        while stack:
+            node, operands = stack[-1]
+            for i in operands:
+                if id(i) not in seen:
+                    seen.add(id(i))
+                    stack.append((i, iter(i._operands())))
+                    break
+            else:
+                stack.pop()
+                order.append(node)
+
+        return(order)
+
+    def _fuse(self):
+        """
+        Computes this elementwise node in a single pass over the elements of
+        its inputs. Every node of the expression is compiled once into an
+        assignment to a temporary of a generated function, so that shared
+        subexpressions are computed once per element.
+        """
+
+        leaves, constants, names, lines = {}, {}, {}, []
+        for node in self._postorder():
+            codes = []
+            for i in node.operands:
+                if not isinstance(i, LazyMatrix):
+                    code = "c{}".format(len(constants))
+                    constants[code] = i
+                elif id(i) in names:
+                    code = names[id(i)]
+                else:    # Evaluated already, a leaf or a product
+                    mat = i.evaluate()
+                    if id(mat) not in leaves:
+                        leaves[id(mat)] = ("a{}".format(len(leaves)), mat)
+                    code = leaves[id(mat)][0]
+                codes.append(code)
+            names[id(node)] = "t{}".format(len(lines))
+            lines.append("    {} = {}".format(names[id(node)],
+                _ELEMENTWISE[node.operation].format(*codes)))
+
+        exec("def fused({}):\n{}\n    return {}".format(", ".join(
+            i for i, mat in leaves.values()), "\n".join(lines),
+            names[id(self)]), constants)
+        function = constants["fused"]
+        inputs = [mat._elements() for i, mat in leaves.values()]
+        rows = [list(map(function, *row)) for row in zip(*inputs)]
+        first = next(iter(leaves.values()))[1]
+        self._result = first._new_like(rows)
+
+        return
+
+    def evaluate(self):
+        """
+        Computes the expression, fusing every elementwise operation into a
+        single pass over the elements of the inputs, or into one pass per
+        FUSION_DEPTH operations of a longer chain.
+
+        Returns
+        -------
+            newMatrix : object of class Matrix
+                the value of the expression
+        """
+
+        if self._result is not None:
+            return(self._result)
+
+        if self.operation == "leaf":
+            self._result = self.operands[0]
+        elif self.operation == "matmul":
+            left, right = self.operands
+            self._result = left.evaluate().matrix_multiply(right.evaluate())
+        else:
+            depths = {}
+            for node in self._postorder():
+                depth = 1 + max([depths[id(i)] for i in node._operands()],
+                    default=0)
+                if node is self or depth >= FUSION_DEPTH:
+                    node._fuse()    # Its users read it as an input
+                else:
+                    depths[id(node)] = depth
+
+        return(self._result)
+
+    @property
+    def values(self):
+        """
+        The elements of the result, evaluating it if needed.
+        """
+
+        return(self.evaluate().values)
+
+    def get_value(self, row, column):
+        """
+        Gives the value of an element of the result, evaluating it if needed.
+        """
+
+        return(self.evaluate().get_value(row, column))
+
+
+def lazy(mat):
+    """
+    Wraps a matrix so that operations on it build an expression instead of
+    being computed straight away.
+
+    Parameters
+    ----------
+        mat : object of class Matrix or LazyMatrix
+            the matrix to wrap (lazy matrices are returned unchanged)
+
+    Returns
+    -------
+        expression : object of class LazyMatrix
+    """
+
+    if isinstance(mat, LazyMatrix):
+        return(mat)
+    assert isinstance(mat, matrix.Matrix), "Argument must be a matrix."
+
+    return(LazyMatrix("leaf", (mat,), mat.get_size()))
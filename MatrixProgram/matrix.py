@@ -1,5 +1,904 @@
 # Made by Isaac Joffe
-from copy import deepcopy
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections import OrderedDict
+from fractions import Fraction
+from itertools import islice
+from operator import add, mul, sub
+from weakref import WeakSet
+
+try:    # Imported as part of the MatrixProgram package
+    from . import backends
+    from . import profiling
+except ImportError:    # Imported from within the MatrixProgram directory
+    import backends
+    import profiling
+
+
+# Validation policies a matrix can be created with:
+#     "eager" rescans the whole matrix after every mutation,
+#     "on-construct" checks the input once at construction and afterwards
+#         only checks the arguments of each mutation,
+#     "off" trusts the caller completely and performs no checks
+VALIDATION_POLICIES = ("eager", "on-construct", "off")
+
+# Number of rows and columns of the result computed together as one tile by
+# the pure-Python multiplication kernel
+MULTIPLY_BLOCK_SIZE = 64
+
+# Number of derived results (determinant, factorizations, inverse, ...) each
+# matrix keeps before discarding the least recently used one
+CACHE_SIZE = 8
+
+# Pivots smaller than this fraction of the largest element of their column
+# are treated as zero
+PIVOT_TOLERANCE = 1e-12
+
+# Largest number of elements the workspace pool keeps in scratch rows
+WORKSPACE_SIZE = 1 << 20
+
+# Header of a saved matrix file (see Matrix.save): magic number, format
+# version, element type, number of rows, number of columns and CRC-32 of the
+# payload, little-endian and padded to 32 bytes so the payload is aligned
+FILE_MAGIC = b"MATX"
+FILE_VERSION = 1
+_FILE_HEADER = struct.Struct("<4sBc2xQQI4x")
+# Number of lines of text parsed together by Matrix.from_text
+TEXT_CHUNK_LINES = 4096
+
+# Bytes per element of each element type: 8-byte floats, 8-byte integers and
+# rationals as pairs of 8-byte integers (numerator, denominator)
+_FILE_TYPES = {b"d": 8, b"q": 8, b"r": 16}
+
+# Matrices with more rows (columns) than this are printed with only the first
+# and last PRINT_EDGE_ITEMS rows (columns), and "..." in place of the others
+PRINT_MAX_ROWS = 20
+PRINT_MAX_COLUMNS = 20
+PRINT_EDGE_ITEMS = 5
+
+
+class _Workspace:
+    """
+    A pool of scratch rows (lists of numbers) recycled between operations,
+    so that elimination and multiplication reuse the row lists of their
+    temporaries instead of allocating new ones on every call. Rows are
+    grouped by length and at most WORKSPACE_SIZE elements are kept.
+    """
+
+    __slots__ = ("_free", "_size")
+
+    def __init__(self):
+        self._free = {}
+        self._size = 0
+
+    def take(self, m, n):
+        """
+        Gives m rows of length n with unspecified contents, which the caller
+        must overwrite.
+        """
+
+        free = self._free.get(n)
+        rows = []
+        while free and len(rows) < m:
+            rows.append(free.pop())
+        self._size -= len(rows)*n
+        rows.extend([0.0] * n for i in range(m - len(rows)))
+
+        return(rows)
+
+    def give(self, rows):
+        """
+        Returns rows taken earlier, which the caller must no longer use.
+        """
+
+        for i in rows:
+            if self._size + len(i) > WORKSPACE_SIZE:
+                break
+            self._free.setdefault(len(i), []).append(i)
+            self._size += len(i)
+
+        return
+
+
+_workspace = _Workspace()
+
+
+def take_rows(m, n):
+    """
+    Takes scratch rows from the pool of rows recycled between operations,
+    for temporaries which are given back with give_rows once done with.
+
+    Parameters
+    ----------
+        m : integer
+            number of rows
+        n : integer
+            length of each row
+
+    Returns
+    -------
+        rows : list of lists
+            m rows of length n with unspecified contents, which the caller
+            must overwrite
+    """
+
+    return(_workspace.take(m, n))
+
+
+def give_rows(rows):
+    """
+    Gives scratch rows taken with take_rows back to the pool.
+
+    Parameters
+    ----------
+        rows : list of lists
+            the rows, which the caller must no longer use
+
+    Returns
+    -------
+        None
+    """
+
+    _workspace.give(rows)
+
+    return
+
+
+def lu_decompose(rows, overwrite=False):
+    """
+    Factors a square matrix as P * A = L * U using Gaussian elimination with
+    partial pivoting. L (unit lower triangular, diagonal not stored) and U are
+    packed together into a single list of rows.
+
+    Parameters
+    ----------
+        rows : list of lists of integer/floating point numbers
+            elements of the square matrix to be factored, which are not
+            modified unless overwrite is set
+        overwrite : boolean
+            whether to factor the rows in place rather than a copy of them,
+            for rows which are themselves a temporary
+
+    Returns
+    -------
+        lu : list of lists of floating point numbers
+            multipliers of L below the diagonal and U on and above it
+        perm : list of integers
+            perm[i] is the original row index of row i of the factored matrix
+        sign : integer
+            1 or -1, the sign of the row permutation
+        singular : boolean
+            whether a (numerically) zero pivot was encountered
+    """
+
+    n = len(rows)
+    if overwrite:
+        lu = rows
+    else:
+        lu = [[float(j) for j in i] for i in rows]    # Working copy
+    perm = list(range(n))
+    sign = 1
+    singular = False
+
+    # Pivots are compared against the scale of their own column, so that a
+    # matrix with columns of very different magnitudes is not taken as
+    # singular
+    tolerances = [PIVOT_TOLERANCE * max(abs(i[k]) for i in lu)
+        for k in range(n)]
+
+    for k in range(n):
+        # Choose the row with the largest element in the current column
+        pivotRow = max(range(k, n), key=lambda r: abs(lu[r][k]))
+        if abs(lu[pivotRow][k]) <= tolerances[k]:
+            lu[pivotRow][k] = 0.0    # Column is already eliminated
+            singular = True
+            continue
+        if pivotRow != k:
+            lu[k], lu[pivotRow] = lu[pivotRow], lu[k]
+            perm[k], perm[pivotRow] = perm[pivotRow], perm[k]
+            sign = -sign
+
+        pivotValues = lu[k]
+        pivot = pivotValues[k]
+        for r in range(k+1, n):
+            rowValues = lu[r]
+            factor = rowValues[k] / pivot
+            if factor == 0:
+                continue
+            rowValues[k] = factor    # Store the multiplier in place of zero
+            for c in range(k+1, n):
+                rowValues[c] -= factor * pivotValues[c]
+
+    return(lu, perm, sign, singular)
+
+
+def lu_solve(lu, perm, rows):
+    """
+    Solves A * X = B given the packed factors of A from lu_decompose, by
+    forward substitution with L and back substitution with U, in O(n^2)
+    operations per column of B.
+
+    Parameters
+    ----------
+        lu : list of lists of floating point numbers
+            packed factors from lu_decompose, which must not be singular
+        perm : list of integers
+            row permutation from lu_decompose
+        rows : list of lists of integer/floating point numbers
+            elements of B, n rows of any number of columns
+
+    Returns
+    -------
+        x : list of lists of floating point numbers
+            elements of the solution X
+    """
+
+    n = len(lu)
+    x = [[float(j) for j in rows[p]] for p in perm]    # Permuted copy of B
+    k = len(x[0])
+
+    # Forward substitution with the unit lower triangular L
+    for i in range(n):
+        row, xi = lu[i], x[i]
+        for j in range(i):
+            factor = row[j]
+            if factor != 0:
+                xj = x[j]
+                for c in range(k):
+                    xi[c] -= factor * xj[c]
+
+    # Back substitution with the upper triangular U
+    for i in range(n-1, -1, -1):
+        row, xi = lu[i], x[i]
+        for j in range(i+1, n):
+            factor = row[j]
+            if factor != 0:
+                xj = x[j]
+                for c in range(k):
+                    xi[c] -= factor * xj[c]
+        pivot = row[i]
+        for c in range(k):
+            xi[c] /= pivot
+
+    return(x)
+
+
+def _exact_divide(numerator, denominator):
+    """
+    Divides two numbers which are known to divide exactly, staying in
+    integers when both are integers.
+    """
+
+    if isinstance(numerator, int) and isinstance(denominator, int):
+        return(numerator // denominator)
+    return(numerator / denominator)
+
+
+def bareiss_eliminate(rows, reduce=False, columns=None):
+    """
+    Brings a matrix to row echelon form with fraction-free (Bareiss)
+    elimination. Every intermediate element is a minor of the input, so
+    integer input stays integer and the size of the numbers only grows
+    polynomially. Integer/rational input gives exact results.
+
+    Parameters
+    ----------
+        rows : list of lists of integer/floating point/rational numbers
+            elements of the matrix, which are not modified
+        reduce : boolean
+            whether to also eliminate above each pivot (fraction-free
+            Gauss-Jordan); every pivot then ends up equal to the last one,
+            so dividing each pivot row by its pivot gives the reduced row
+            echelon form
+        columns : integer or None
+            number of leading columns in which to look for pivots, all of
+            them by default (e.g. only those of A for an augmented [A | B])
+
+    Returns
+    -------
+        echelon : list of lists of numbers
+            the fraction-free (reduced) row echelon form
+        sign : integer
+            1 or -1, the sign of the row swaps performed
+        pivots : list of integers
+            column (counted from zero) of the pivot of each nonzero row
+    """
+
+    echelon = [list(i) for i in rows]    # Working copy
+    m, n = len(echelon), len(echelon[0])
+    sign = 1
+    pivots = []
+    previous = 1    # Pivot of the previous step, which divides exactly
+    r = 0
+    for c in range(n if columns is None else columns):
+        if r == m:
+            break
+        pivotRow = next((i for i in range(r, m) if echelon[i][c] != 0), None)
+        if pivotRow is None:
+            continue    # No pivot in this column
+        if pivotRow != r:
+            echelon[r], echelon[pivotRow] = echelon[pivotRow], echelon[r]
+            sign = -sign
+
+        pivotValues = echelon[r]
+        pivot = pivotValues[c]
+        for i in range(m) if reduce else range(r+1, m):
+            if i == r:
+                continue
+            rowValues = echelon[i]
+            factor = rowValues[c]
+            for j in range(n):
+                if j != c:
+                    rowValues[j] = _exact_divide(
+                        pivot*rowValues[j] - factor*pivotValues[j], previous)
+            rowValues[c] = 0
+        pivots.append(c)
+        previous = pivot
+        r += 1
+
+    return(echelon, sign, pivots)
+
+
+def is_number(value):
+    """
+    Determines if a value can be an element of a matrix.
+
+    Parameters
+    ----------
+        value : any object
+            the value to check
+
+    Returns
+    -------
+        result : boolean
+            whether the value is an integer, floating point or rational
+            (fractions.Fraction) number
+    """
+
+    return(isinstance(value, (int, float, Fraction)))
+
+
+def _shown(count, maxCount, edgeItems):
+    # Indices of the rows (columns) to print, with None for the elided ones
+    if count <= maxCount:
+        return(range(count))
+    return(list(range(edgeItems)) + [None] +
+        list(range(count - edgeItems, count)))
+
+
+def format_elements(element, m, n, formatter=str, maxRows=None,
+        maxColumns=None, edgeItems=None):
+    """
+    Formats the elements of an m x n matrix to be printed, eliding the
+    middle rows and columns of large matrices. Only the elements shown are
+    read and each is formatted once.
+
+    Parameters
+    ----------
+        element : function
+            gives the element in a row and a column (counted from zero)
+        m : integer
+            number of rows
+        n : integer
+            number of columns
+        formatter : function
+            gives the string of an element, str by default
+        maxRows : integer or None
+            largest number of rows printed in full, PRINT_MAX_ROWS by default
+        maxColumns : integer or None
+            largest number of columns printed in full, PRINT_MAX_COLUMNS by
+            default
+        edgeItems : integer or None
+            number of rows (columns) kept at each end of an elided matrix,
+            PRINT_EDGE_ITEMS by default
+
+    Returns
+    -------
+        cells : list of lists of strings
+            the formatted elements of each row shown, with "..." for the
+            elided rows and columns
+    """
+
+    if edgeItems is None:
+        edgeItems = PRINT_EDGE_ITEMS
+    rows = _shown(m, PRINT_MAX_ROWS if maxRows is None else maxRows,
+        edgeItems)
+    columns = _shown(n, PRINT_MAX_COLUMNS if maxColumns is None
+        else maxColumns, edgeItems)
+
+    cells = []
+    for i in rows:
+        if i is None:
+            cells.append(["..."] * len(columns))
+        else:
+            cells.append(["..." if j is None else formatter(element(i, j))
+                for j in columns])
+
+    return(cells)
+
+
+def _grid_string(cells):
+    # Right-justifies every cell to the widest one, one row per line
+    width = max(len(j) for i in cells for j in i)
+    return("\n".join(" ".join(j.rjust(width) for j in i) for i in cells))
+
+
+def _multiply_blocked(aRows, bColumns, blockSize=None, out=None):
+    """
+    Multiplies two matrices given as the rows of the first and the columns
+    of the second, computing the result one tile of rows and columns at a
+    time so the columns of a tile are reused while they are still cached.
+
+    Parameters
+    ----------
+        aRows : list of sequences of integer/floating point numbers
+            rows of the left matrix
+        bColumns : list of sequences of integer/floating point numbers
+            columns of the right matrix
+        blockSize : integer or None
+            side length of a tile, MULTIPLY_BLOCK_SIZE by default
+        out : list of lists or None
+            existing rows of the right size to write the product into,
+            which must not be any of aRows, or None for new rows
+
+    Returns
+    -------
+        rows : list of lists of integer/floating point numbers
+            rows of the product
+    """
+
+    if blockSize is None:
+        blockSize = MULTIPLY_BLOCK_SIZE
+    m, n = len(aRows), len(bColumns)
+    rows = out if out is not None else [[0] * n for i in range(m)]
+
+    for jStart in range(0, n, blockSize):
+        columns = list(enumerate(bColumns[jStart:jStart+blockSize], jStart))
+        for iStart in range(0, m, blockSize):
+            for i in range(iStart, min(iStart + blockSize, m)):
+                row, rowValues = aRows[i], rows[i]
+                for j, column in columns:
+                    # Inner product of a row and a column, run in C
+                    rowValues[j] = sum(map(mul, row, column))
+
+    return(rows)
+
+
+def _check_out(out, m, n):
+    """
+    Checks that a matrix can receive a result of size m x n through the out
+    argument of an operation, and prepares it to be written to.
+    """
+
+    assert isinstance(out, Matrix), "Output must be a matrix."
+    assert out.get_size() == (m, n), \
+        "Output matrix must be the size of the result."
+    out._before_write()    # Detach views before the inputs are read
+
+    return
+
+
+def _selection(key, size):
+    """
+    Translates one component of a Matrix index (an integer or a slice,
+    counted from zero) into the range of positions it selects.
+    """
+
+    if isinstance(key, int):
+        if key < 0:
+            key += size
+        if key < 0 or key >= size:
+            raise IndexError("Matrix index out of range.")
+        return(range(key, key+1))
+    assert isinstance(key, slice), "Index must be an integer or a slice."
+    positions = range(size)[key]
+    assert len(positions) > 0, "Matrix must not be empty."
+
+    return(positions)
+
+
+def _as_slice(positions, offset=0, stride=1):
+    """
+    Gives the slice selecting offset + k*stride for every k of a range of
+    positions, so that a whole row of a view is one C-level slice.
+    """
+
+    step = positions.step*stride
+    start = offset + positions[0]*stride
+    stop = offset + positions[-1]*stride + (1 if step > 0 else -1)
+
+    return(slice(start, stop if stop >= 0 else None, step))
+
+
+def _compose(outer, inner):
+    """
+    Gives outer[k] for every position k of inner, keeping ranges as ranges.
+    """
+
+    if isinstance(outer, range) and isinstance(inner, range):
+        return(outer[_as_slice(inner)])
+
+    return([outer[k] for k in inner])
+
+
+def _cofactor_expansion(rows, row, columns):
+    """
+    Computes the determinant of the square sub matrix made of the rows from
+    row onwards and the given columns, by cofactor expansion along its first
+    row.
+    """
+
+    if len(columns) == 1:    # Base case of recursion
+        return(rows[row][columns[0]])    # Determinant is just only value
+
+    value = 0
+    for k, j in enumerate(columns):
+        # Formula applies negative as needed, includes factor of present
+        # element, and makes recursive call for the sub matrix without the
+        # row and column that the present element is in
+        value += (-1)**k*rows[row][j] * \
+            _cofactor_expansion(rows, row+1, columns[:k] + columns[k+1:])
+
+    return(value)
+
+
+def parse_number(text):
+    """
+    Parses one element of a matrix written as text, keeping integers and
+    fractions such as 1/3 exact and reading anything else, decimals
+    included, as a float.
+
+    Parameters
+    ----------
+        text : string
+            the element, e.g. "2", "0.1" or "1/3"
+
+    Returns
+    -------
+        value : integer/floating point/rational number
+            the element, raising ValueError if the text is not a number
+    """
+
+    try:
+        return(int(text))
+    except ValueError:
+        pass
+    if "/" in text:
+        value = Fraction(text.strip())
+        return(value.numerator if value.denominator == 1 else value)
+
+    return(float(text))
+
+
+def _copy_buffer(data):
+    """
+    Copies a buffer of 8-byte floats (an array or a memory-mapped view) into
+    a new array("d") in one block.
+    """
+
+    newData = array("d")
+    newData.frombytes(memoryview(data).cast("B"))
+
+    return(newData)
+
+
+def _map_payload(file, offset, count):
+    """
+    Maps count 8-byte floats starting at offset of an open file read-only
+    into memory, so that they are only read from disk when accessed.
+    """
+
+    mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    return(memoryview(mapping)[offset:offset + 8*count].cast("d"))
+
+
+class _ListRow:
+    """
+    A list-like view of a single row of a matrix held in list storage.
+    Reads go straight to the row list; writes go through the matrix, so
+    that its views are detached and its cache emptied first.
+    """
+
+    __slots__ = ("_matrix", "_i")
+
+    def __init__(self, mat, i):
+        self._matrix = mat
+        self._i = i
+
+    def __getitem__(self, j):
+        return(self._matrix._rows[self._i][j])
+
+    def __setitem__(self, j, value):
+        mat = self._matrix
+        row = list(mat._rows[self._i])
+        row[j] = value
+        assert len(row) == len(mat._rows[self._i]), \
+            "Rows must be of same length."
+        mat._before_write()    # Copy on write
+        mat._rows[self._i][:] = row
+        mat.mark_modified()
+
+    def __len__(self):
+        return(len(self._matrix._rows[self._i]))
+
+    def __iter__(self):
+        return(iter(self._matrix._rows[self._i]))
+
+    def __eq__(self, other):
+        return(self._matrix._rows[self._i] == list(other))
+
+    def __repr__(self):
+        return(repr(self._matrix._rows[self._i]))
+
+
+class _ListValues:
+    """
+    A list-of-lists-like view of all the rows of a matrix held in list
+    storage, so that writes through Matrix.values are tracked like those of
+    the other storages.
+    """
+
+    __slots__ = ("_matrix",)
+
+    def __init__(self, mat):
+        self._matrix = mat
+
+    def __getitem__(self, i):
+        m = len(self._matrix._rows)
+        if isinstance(i, slice):
+            return([self[k] for k in range(m)[i]])
+        if i < 0:
+            i += m
+        if i < 0 or i >= m:
+            raise IndexError("Matrix index out of range.")
+        return(_ListRow(self._matrix, i))
+
+    def __setitem__(self, i, row):
+        # Replace whole rows, keeping the row lists themselves; the number
+        # of rows cannot change
+        mat = self._matrix
+        m, n = mat.get_size()
+        if isinstance(i, slice):
+            indices = range(m)[i]
+            rows = [list(k) for k in row]
+            assert len(rows) == len(indices), \
+                "Number of rows must stay the same."
+        else:
+            self[i]    # Bounds check
+            indices = [i + m if i < 0 else i]
+            rows = [list(row)]
+        for k in rows:
+            assert len(k) == n, "Rows must be of same length."
+
+        mat._before_write()    # Copy on write
+        for k, values in zip(indices, rows):
+            mat._rows[k][:] = values
+        mat.mark_modified()
+
+    def __len__(self):
+        return(len(self._matrix._rows))
+
+    def __iter__(self):
+        for i in range(len(self._matrix._rows)):
+            yield _ListRow(self._matrix, i)
+
+    def __eq__(self, other):
+        return(self._matrix._rows == [list(i) for i in other])
+
+    def __repr__(self):
+        return(repr(self._matrix._rows))
+
+
+class _CompactRow:
+    """
+    A list-like view of a single row of a matrix held in compact storage.
+    Reads go straight to the flat buffer; writes go through the matrix, so
+    that its views are detached and its cache emptied first.
+    """
+
+    __slots__ = ("_matrix", "_start", "_n")
+
+    def __init__(self, mat, start, n):
+        self._matrix = mat
+        self._start = start
+        self._n = n
+
+    def _index(self, j):
+        # Translate a (possibly negative) column index into a buffer index
+        if j < 0:
+            j += self._n
+        if j < 0 or j >= self._n:
+            raise IndexError("Row index out of range.")
+        return(self._start + j)
+
+    def __getitem__(self, j):
+        data = self._matrix._data
+        if isinstance(j, slice):
+            return(list(data[self._start:self._start+self._n])[j])
+        return(data[self._index(j)])
+
+    def __setitem__(self, j, value):
+        mat = self._matrix
+        if isinstance(j, slice):
+            row = list(self)
+            row[j] = value
+            assert len(row) == self._n, "Rows must be of same length."
+            row = array("d", row)
+            mat._before_write()    # Copy on write
+            mat._data[self._start:self._start+self._n] = row
+        else:
+            j = self._index(j)
+            mat._before_write()
+            mat._data[j] = value
+        mat.mark_modified()
+
+    def __len__(self):
+        return(self._n)
+
+    def __iter__(self):
+        return(iter(self._matrix._data[self._start:self._start+self._n]))
+
+    def __eq__(self, other):
+        return(list(self) == list(other))
+
+    def __repr__(self):
+        return(repr(list(self)))
+
+
+class _CompactValues:
+    """
+    A list-of-lists-like view of all the rows of a matrix held in compact
+    storage, kept so that code written against Matrix.values still works.
+    """
+
+    __slots__ = ("_matrix", "_m", "_n")
+
+    def __init__(self, mat, m, n):
+        self._matrix = mat
+        self._m = m
+        self._n = n
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return([self[k] for k in range(self._m)[i]])
+        if i < 0:
+            i += self._m
+        if i < 0 or i >= self._m:
+            raise IndexError("Matrix index out of range.")
+        return(_CompactRow(self._matrix, i*self._n, self._n))
+
+    def __setitem__(self, i, row):
+        # Replace whole rows, copying the values into the buffer; the
+        # number of rows cannot change
+        if isinstance(i, slice):
+            indices = range(self._m)[i]
+            rows = [array("d", k) for k in row]
+            assert len(rows) == len(indices), \
+                "Number of rows must stay the same."
+        else:
+            self[i]    # Bounds check
+            indices = [i + self._m if i < 0 else i]
+            rows = [array("d", row)]
+        n = self._n
+        for k in rows:
+            assert len(k) == n, "Rows must be of same length."
+
+        mat = self._matrix
+        mat._before_write()    # Copy on write
+        for k, values in zip(indices, rows):
+            mat._data[k*n:(k+1)*n] = values
+        mat.mark_modified()
+
+    def __len__(self):
+        return(self._m)
+
+    def __iter__(self):
+        for i in range(self._m):
+            yield _CompactRow(self._matrix, i*self._n, self._n)
+
+    def __eq__(self, other):
+        return([list(i) for i in self] == [list(i) for i in other])
+
+    def __repr__(self):
+        return(repr([list(i) for i in self]))
+
+
+class _ViewRow:
+    """
+    A list-like view of a single row of a matrix view. Reads are mapped onto
+    the storage the view was taken from; a write makes the view copy its
+    elements first.
+    """
+
+    __slots__ = ("_matrix", "_i")
+
+    def __init__(self, mat, i):
+        self._matrix = mat
+        self._i = i
+
+    def _list(self):
+        # The current elements of the row, wherever they are held
+        mat = self._matrix
+        if mat._view is None:
+            return(list(mat._elements()[self._i]))
+        return(mat._view_row(self._i))
+
+    def __getitem__(self, j):
+        mat = self._matrix
+        if isinstance(j, slice):
+            return(self._list()[j])
+        if mat._view is None:
+            return(mat._elements()[self._i][j])
+        n = mat.get_size()[1]
+        if j < 0:
+            j += n
+        if j < 0 or j >= n:
+            raise IndexError("Row index out of range.")
+        return(mat._view_element(self._i, j))
+
+    def __setitem__(self, j, value):
+        mat = self._matrix
+        mat._before_write()    # Copy on write
+        mat.values[self._i][j] = value
+        mat.mark_modified()
+
+    def __len__(self):
+        return(self._matrix.get_size()[1])
+
+    def __iter__(self):
+        return(iter(self._list()))
+
+    def __eq__(self, other):
+        return(self._list() == list(other))
+
+    def __repr__(self):
+        return(repr(self._list()))
+
+
+class _ViewValues:
+    """
+    A list-of-lists-like view of all the rows of a matrix view, kept so that
+    code written against Matrix.values works on views without copying them.
+    """
+
+    __slots__ = ("_matrix",)
+
+    def __init__(self, mat):
+        self._matrix = mat
+
+    def __getitem__(self, i):
+        m = self._matrix.get_size()[0]
+        if isinstance(i, slice):
+            return([self[k] for k in range(m)[i]])
+        if i < 0:
+            i += m
+        if i < 0 or i >= m:
+            raise IndexError("Matrix index out of range.")
+        return(_ViewRow(self._matrix, i))
+
+    def __setitem__(self, i, row):
+        mat = self._matrix
+        mat._before_write()    # Copy on write
+        mat.values[i] = list(row)
+        mat.mark_modified()
+
+    def __len__(self):
+        return(self._matrix.get_size()[0])
+
+    def __iter__(self):
+        for i in range(self._matrix.get_size()[0]):
+            yield _ViewRow(self._matrix, i)
+
+    def __eq__(self, other):
+        return([list(i) for i in self] == [list(i) for i in other])
+
+    def __repr__(self):
+        return(repr([list(i) for i in self]))
 
 
 class Matrix:
@@ -8,9 +907,20 @@ class Matrix:
 
     Attributes
     ----------
-        values : list of lists of integer/floating point numbers
+        values : list of lists of integer/floating point/rational numbers
             all the elements of the matrix, where each list inside the list
-            contains all the elements of a row of the matrix
+            contains all the elements of a row of the matrix (a list-like
+            view of the storage, through which writes are tracked)
+        storage : string
+            "list" if the elements are held as a list of row lists, or
+            "compact" if they are held in one contiguous row-major
+            array("d") buffer (8 bytes per element, always floating point)
+        validation : string
+            the validation policy of the matrix, one of "eager",
+            "on-construct" (default) or "off" (see VALIDATION_POLICIES)
+        backend : string or None
+            name of the execution backend used by this matrix (see the
+            backends module), or None to follow the global default
         m : integer
             numbers of rows in the matrix (for an m x n matrix)
         n : integer
@@ -43,23 +953,65 @@ class Matrix:
             adds a specified number to every element of the matrix
         scalar_multiply(number) :
             multiplies each element of the matrix by a specified number
-        matrix_add(otherMatrix) :
+        matrix_add(otherMatrix, out) :
             adds two matrices together, producing a new matrix
-        matrix_multiply(otherMatrix) :
+        matrix_sub(otherMatrix, out) :
+            subtracts a matrix from the matrix, producing a new matrix
+        matrix_multiply(otherMatrix, out) :
             multiplies two matrices together, producing a new matrix
         transpose() :
             transposes the matrix, producing a new matrix
-        determinant() :
+        determinant(method) :
             gives the value of the determinant of the matrix
+        is_exact() :
+            determines if all the elements are integers or rationals
+        copy() :
+            produces an independent copy of the matrix
+        like(rows, storage) :
+            wraps computed rows as a matrix with the same settings
+        mark_modified() :
+            records a change to the matrix, invalidating the cache
+        memoize(key, compute) :
+            gives a cached derived result, computing it if needed
+        view_minor(row, column) :
+            gives a view of the matrix without a row and a column
+        T :
+            a view of the transpose of the matrix
+        save(path) :
+            writes the matrix to a binary file
+        load(path, mmap) :
+            reads a matrix saved to a binary file, memory-mapping it
+        from_text(stream, delimiter, storage) :
+            reads a matrix written as text, one row per line
+        A[i, j] :
+            an element, or a view of a block of rows and columns given by
+            slices (counted from zero, as for Python sequences)
+        A + B, A - B, A @ B, A * B, A * c, c * A, -A :
+            operators for the sums, differences and products above (* is
+            the matrix product between matrices), producing new matrices;
+            +=, -=, *= and @= write the result into the existing matrix
 
     Example Usage
     -------------
         A = Matrix([[1,2,3],[4,5,6],[7,8,9]])    # 3 x 3 matrix
         B = Matrix([[1,2,3]])    # Row vector
         C = Matrix([[1],[2],[3]])    # Column vector
+        D = Matrix([[1,2],[3,4]], storage="compact")    # Flat buffer
+        E = Matrix([[1,2],[3,4]], validation="off")    # Trusted input
+        F = Matrix([[1,2],[3,4]], backend="numpy")    # Needs NumPy
+        G = A[0:2, 1:]    # 2 x 2 view sharing the elements of A
+        H = 2 * (A @ A.T) - A    # New matrices from operators
+        A.matrix_add(H, out=A)    # Same as A += H, reusing A's storage
+        A.save("a.mat")
+        I = Matrix.load("a.mat")    # Pages in from disk lazily
+        J = Matrix.from_text("a.csv", delimiter=",", storage="compact")
     """
 
-    def __init__(self, values):
+    __slots__ = ("_rows", "_data", "_validation", "_backend", "_version",
+        "_cache", "_view", "_views", "__m", "__n", "__weakref__")
+
+    def __init__(self, values, storage="list", validation="on-construct",
+            backend=None):
         """
         Instantiates the matrix, assigning all the attributes of the matrix
         either as an empty matrix or based on the inputted values.
@@ -68,31 +1020,756 @@ class Matrix:
         ----------
         values : list of lists of integer/floating point numbers
             elements to be placed in the matrix in the form of row vectors
+        storage : string
+            "list" (default) or "compact", see the class attributes
+        validation : string
+            "on-construct" (default), "eager" or "off", see
+            VALIDATION_POLICIES
+        backend : string or None
+            name of a registered backend, or None (default) to follow the
+            global default backend
 
         Returns
         -------
             None, but creates the matrix
         """
 
-        # Ensure argument passed in is valid
-        assert values and isinstance(values, list), \
-            "Argument must be a list of lists of numbers."
-        for i in values:
-            assert i and isinstance(i, list), \
+        assert storage in ("list", "compact"), \
+            "Storage must be either \"list\" or \"compact\"."
+        assert validation in VALIDATION_POLICIES, \
+            "Validation must be one of {}.".format(VALIDATION_POLICIES)
+        if backend is not None:
+            backends.get_backend(backend)    # Ensure backend is available
+
+        if validation != "off":
+            # Ensure argument passed in is valid
+            assert values and isinstance(values, list), \
                 "Argument must be a list of lists of numbers."
-            for j in i:
-                assert isinstance(j, int) or isinstance(j, float), \
+            for i in values:
+                assert i and isinstance(i, list), \
                     "Argument must be a list of lists of numbers."
+                assert len(i) == len(values[0]), \
+                    "Rows must be of same length."
+                for j in i:
+                    assert is_number(j), \
+                        "Argument must be a list of lists of numbers."
+
+        # Copy the rows into the chosen storage in a single pass
+        self._rows = []
+        self._data = None
+        self._validation = validation
+        self._backend = backend
+        self._version = 0
+        self._cache = None
+        self._view = None
+        self._views = None
+        self.__m = len(values)
+        self.__n = len(values[0])
+        if storage == "compact":
+            self._data = array("d")
+            for i in values:
+                self._data.extend(i)
+        else:
+            self._rows = [list(i) for i in values]
+        if validation == "eager":
+            self.check_validity()    # Ensure matrix is valid
+
+        return
+
+    @classmethod
+    def _from_rows(cls, rows, validation="on-construct", backend=None):
+        """
+        Wraps a list of row lists produced by the library itself as a matrix
+        without copying or validating it. The rows must be non-empty, of
+        equal length and contain only numbers.
+        """
+
+        newMatrix = cls.__new__(cls)
+        newMatrix._rows = rows
+        newMatrix._data = None
+        newMatrix._validation = validation
+        newMatrix._backend = backend
+        newMatrix._version = 0
+        newMatrix._cache = None
+        newMatrix._view = None
+        newMatrix._views = None
+        newMatrix.__m = len(rows)
+        newMatrix.__n = len(rows[0])
+
+        return(newMatrix)
+
+    @classmethod
+    def _from_buffer(cls, data, m, n, validation="on-construct",
+            backend=None):
+        """
+        Wraps an existing row-major array("d") buffer of m x n elements as a
+        compact matrix without copying or validating it.
+        """
 
-        # Instantiate an empty matrix
-        self.values = []
-        self.__m = 0
-        self.__n = 0
-        self.add_rows(values)    # Add rows
-        self.check_validity()    # Ensure matrix is valid
+        newMatrix = cls.__new__(cls)
+        newMatrix._rows = []
+        newMatrix._data = data
+        newMatrix._validation = validation
+        newMatrix._backend = backend
+        newMatrix._version = 0
+        newMatrix._cache = None
+        newMatrix._view = None
+        newMatrix._views = None
+        newMatrix.__m = m
+        newMatrix.__n = n
+
+        return(newMatrix)
+
+    @classmethod
+    def _from_view(cls, parent, rows, columns, transposed,
+            validation="on-construct", backend=None):
+        """
+        Creates a view of the elements of a matrix which is not a view
+        itself. Element (i, j) of the view is element (rows[i], columns[j])
+        of the parent, or (rows[j], columns[i]) if transposed, counted from
+        zero.
+        """
+
+        newMatrix = cls.__new__(cls)
+        newMatrix._rows = None
+        newMatrix._data = None
+        newMatrix._validation = validation
+        newMatrix._backend = backend
+        newMatrix._version = 0
+        newMatrix._cache = None
+        newMatrix._view = (parent, rows, columns, transposed)
+        newMatrix._views = None
+        newMatrix.__m = len(columns) if transposed else len(rows)
+        newMatrix.__n = len(rows) if transposed else len(columns)
+        if parent._views is None:
+            parent._views = WeakSet()
+        parent._views.add(newMatrix)    # So the parent can detach it
+
+        return(newMatrix)
+
+    @property
+    def values(self):
+        """
+        The elements of the matrix as a list-like view of row lists onto the
+        underlying storage. Writes through it copy shared elements first and
+        empty the cache, as set_value does.
+        """
+
+        if self._view is not None:
+            return(_ViewValues(self))
+        if self._data is not None:
+            return(_CompactValues(self, self.__m, self.__n))
+        return(_ListValues(self))
+
+    def _elements(self):
+        """
+        Gives the rows of the matrix for reading only: the row lists
+        themselves for list storage, so that the kernels read them without
+        going through the row views of .values.
+        """
+
+        if self._data is None and self._view is None:
+            return(self._rows)
+        return(self.values)
+
+    @property
+    def storage(self):
+        """
+        The storage mode of the matrix, either "list" or "compact".
+        """
+
+        if self._view is not None:
+            return(self._view[0].storage)
+        return("list" if self._data is None else "compact")
+
+    @property
+    def is_view(self):
+        """
+        Whether the matrix still shares the elements of the matrix it was
+        taken from (see __getitem__, view_minor and T).
+        """
+
+        return(self._view is not None)
+
+    @property
+    def validation(self):
+        """
+        The validation policy of the matrix, see VALIDATION_POLICIES.
+        """
+
+        return(self._validation)
+
+    def is_exact(self):
+        """
+        Determines if every element of the matrix is an integer or a
+        rational number, so that exact (fraction-free) methods apply.
+
+        Returns
+        -------
+            result : boolean
+        """
+
+        return(all(isinstance(j, (int, Fraction)) for i in self._elements()
+            for j in i))
+
+    def _new_like(self, rows):
+        """
+        Wraps a list of row lists computed from this matrix as a new trusted
+        matrix with the same storage mode and validation policy.
+        """
+
+        if self.storage == "compact":
+            data = array("d")
+            for i in rows:
+                data.extend(i)
+            return(Matrix._from_buffer(data, len(rows), len(rows[0]),
+                self._validation, self._backend))
+
+        return(Matrix._from_rows(rows, self._validation, self._backend))
+
+    def like(self, rows, storage=None):
+        """
+        Wraps a list of row lists computed from this matrix as a new matrix
+        with the same validation policy and backend, without copying or
+        validating it. The rows must be non-empty, of equal length and
+        contain only numbers.
+
+        Parameters
+        ----------
+            rows : list of lists of integer/floating point/rational numbers
+                elements of the new matrix, which it takes over
+            storage : string or None
+                "list" or "compact", or None (default) for the storage mode
+                of this matrix; exact results need "list"
+
+        Returns
+        -------
+            newMatrix : object of class Matrix
+                the new matrix
+        """
+
+        if storage is None:
+            return(self._new_like(rows))
+        assert storage in ("list", "compact"), \
+            "Storage must be either \"list\" or \"compact\"."
+        if storage == "compact":
+            data = array("d")
+            for i in rows:
+                data.extend(i)
+            return(Matrix._from_buffer(data, len(rows), len(rows[0]),
+                self._validation, self._backend))
+
+        return(Matrix._from_rows(rows, self._validation, self._backend))
+
+    @property
+    def backend(self):
+        """
+        The name of the backend used by the matrix, or None if it follows
+        the global default backend. Assign to it to switch backends.
+        """
+
+        return(self._backend)
+
+    @backend.setter
+    def backend(self, name):
+        if name is not None:
+            backends.get_backend(name)    # Ensure backend is available
+        self._backend = name
+        self.mark_modified()    # Results may differ between backends
+
+    @property
+    def version(self):
+        """
+        A counter increased by every change to the matrix.
+        """
+
+        return(self._version)
+
+    def mark_modified(self):
+        """
+        Records that the matrix has changed, discarding every cached derived
+        result. Every mutating method calls this, as do writes through
+        .values.
+
+        Parameters
+        ----------
+            None
+
+        Returns
+        -------
+            None
+        """
+
+        self._version += 1
+        self._cache = None
+
+        return
+
+    def memoize(self, key, compute):
+        """
+        Gives a derived result of the matrix, computing it only if it has
+        not been computed since the matrix last changed. At most CACHE_SIZE
+        results are kept, discarding the least recently used.
+
+        Parameters
+        ----------
+            key : hashable object
+                identifies the result, including any options it depends on
+            compute : function
+                computes the result when called without arguments
+
+        Returns
+        -------
+            value : object
+                the cached or newly computed result, which callers must not
+                modify
+        """
+
+        if self._cache is None:
+            self._cache = OrderedDict()
+        cache = self._cache
+        entry = cache.get(key)
+        if entry is not None and entry[0] == self._version:
+            cache.move_to_end(key)    # Mark as most recently used
+            return(entry[1])
+
+        version = self._version
+        value = compute()
+        if version == self._version:    # Unchanged while computing
+            cache[key] = (version, value)
+            cache.move_to_end(key)
+            if len(cache) > CACHE_SIZE:
+                cache.popitem(last=False)
+
+        return(value)
+
+    def copy(self):
+        """
+        Produces an independent copy of the matrix with the same storage
+        mode, validation policy and backend, but an empty cache.
+
+        Parameters
+        ----------
+            None
+
+        Returns
+        -------
+            newMatrix : object of class Matrix
+                the copy of the matrix
+        """
+
+        m, n = self.get_size()
+        if self._view is not None:
+            return(self._new_like([self._view_row(i) for i in range(m)]))
+        if self._data is not None:
+            return(Matrix._from_buffer(_copy_buffer(self._data), m, n,
+                self._validation, self._backend))
+
+        return(Matrix._from_rows([list(i) for i in self._rows],
+            self._validation, self._backend))
+
+    def __deepcopy__(self, memo):
+        # Elements are immutable numbers, so copying the rows is enough
+        return(self.copy())
+
+    def __reduce__(self):
+        # Pickle only the elements: views are materialized, memory-mapped
+        # files copied, and the cache and the links between views dropped
+        m, n = self.get_size()
+        if self._view is not None or (self._data is not None
+                and not isinstance(self._data, array)):
+            return(self.copy().__reduce__())
+        if self._data is not None:
+            return(Matrix._from_buffer, (self._data, m, n, self._validation,
+                self._backend))
+
+        return(Matrix._from_rows, (self._rows, self._validation,
+            self._backend))
+
+    def save(self, path):
+        """
+        Writes the matrix to a binary file: a 32-byte header holding the
+        format version, the element type, the size and a CRC-32 checksum,
+        followed by the elements in row-major order as little-endian 8-byte
+        values. Matrices with floating point elements are saved as floats,
+        integer matrices as integers and rational ones as pairs of integers.
+        The file is replaced in a single step, so a matrix loaded from the
+        same path stays valid.
+
+        Parameters
+        ----------
+            path : string
+                path of the file to write
+
+        Returns
+        -------
+            None, but writes the file
+        """
+
+        m, n = self.get_size()
+        if self._data is not None and self._view is None:
+            kind, payload = b"d", self._data    # Already the file's layout
+        else:
+            elements = [j for i in self._elements() for j in i]
+            try:
+                if any(isinstance(i, float) for i in elements):
+                    kind, payload = b"d", array("d", elements)
+                elif any(isinstance(i, Fraction) for i in elements):
+                    kind, payload = b"r", array("q")
+                    for i in elements:
+                        payload.append(i.numerator)
+                        payload.append(i.denominator)
+                else:
+                    kind, payload = b"q", array("q", elements)
+            except OverflowError:
+                raise AssertionError(
+                    "Elements must fit in 64-bit integers to be saved.")
+        if sys.byteorder == "big":
+            payload = array(payload.typecode, payload)
+            payload.byteswap()    # The file is always little-endian
+
+        header = _FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, kind, m, n,
+            zlib.crc32(payload))
+        temporary = "{}.{}.tmp".format(path, os.getpid())
+        with open(temporary, "wb") as file:
+            file.write(header)
+            file.write(payload)
+        os.replace(temporary, path)
+
+        return
+
+    @classmethod
+    def load(cls, path, mmap=True, verify=None):
+        """
+        Reads a matrix written by save. Floating point matrices come back in
+        compact storage and, if mmap is set, are memory-mapped rather than
+        read: loading is immediate whatever the size, elements are paged in
+        from disk as they are used, and the matrix copies them into memory
+        only once it is written to. Integer and rational matrices are read
+        into list storage.
+
+        Parameters
+        ----------
+            path : string
+                path of the file to read
+            mmap : boolean
+                whether to memory-map a floating point matrix (default)
+            verify : boolean or None
+                whether to check the checksum of the elements, which reads
+                all of them; by default only when they are not memory-mapped
+
+        Returns
+        -------
+            newMatrix : object of class Matrix
+                the saved matrix
+        """
+
+        with open(path, "rb") as file:
+            header = file.read(_FILE_HEADER.size)
+            assert len(header) == _FILE_HEADER.size and \
+                header[:4] == FILE_MAGIC, "File must be a saved matrix."
+            magic, version, kind, m, n, checksum = \
+                _FILE_HEADER.unpack(header)
+            assert version == FILE_VERSION, \
+                "File format version {} is not supported.".format(version)
+            assert kind in _FILE_TYPES and m > 0 and n > 0, \
+                "File must be a saved matrix."
+            size = _FILE_TYPES[kind]*m*n
+            assert os.fstat(file.fileno()).st_size == \
+                _FILE_HEADER.size + size, "File is truncated or corrupted."
+
+            mapped = mmap and kind == b"d" and sys.byteorder == "little"
+            if verify is None:
+                verify = not mapped
+            if mapped:
+                data = _map_payload(file, _FILE_HEADER.size, m*n)
+            else:
+                data = array("d" if kind == b"d" else "q")
+                data.fromfile(file, size // 8)
+                if sys.byteorder == "big":
+                    data.byteswap()
+        if verify:
+            payload = data
+            if sys.byteorder == "big":
+                payload = array(data.typecode, data)
+                payload.byteswap()    # Checksum of the little-endian bytes
+            assert zlib.crc32(payload) == checksum, \
+                "File is truncated or corrupted."
+
+        if kind == b"d":
+            return(cls._from_buffer(data, m, n))
+        if kind == b"q":
+            elements = data.tolist()
+        else:
+            elements = [Fraction(data[i], data[i+1])
+                for i in range(0, len(data), 2)]
+            elements = [i.numerator if i.denominator == 1 else i
+                for i in elements]
+
+        return(cls._from_rows([elements[i*n:(i+1)*n] for i in range(m)]))
+
+    @classmethod
+    def from_text(cls, stream, delimiter=None, storage="list",
+            validation="on-construct", backend=None):
+        """
+        Reads a matrix written as text, one row per line, such as a CSV or
+        whitespace-separated file. Lines are parsed in chunks of
+        TEXT_CHUNK_LINES as they are read, straight into the chosen storage,
+        and the shape is validated once at the end. Blank lines and lines
+        starting with # are skipped.
+
+        Parameters
+        ----------
+            stream : string or iterable of strings
+                path of a text file, or an open file or any other iterable
+                of lines
+            delimiter : string or None
+                the string separating the elements of a row, or None
+                (default) for any run of whitespace
+            storage : string
+                "list" (default), keeping integers and fractions such as 1/3
+                exact, or "compact", reading every element as a float
+            validation : string
+                "on-construct" (default), "eager" or "off", see
+                VALIDATION_POLICIES; "off" skips the check that all rows
+                have the same length
+            backend : string or None
+                name of a registered backend, or None (default) to follow
+                the global default backend
+
+        Returns
+        -------
+            newMatrix : object of class Matrix
+                the matrix read from the text
+        """
+
+        assert storage in ("list", "compact"), \
+            "Storage must be either \"list\" or \"compact\"."
+        assert validation in VALIDATION_POLICIES, \
+            "Validation must be one of {}.".format(VALIDATION_POLICIES)
+        if backend is not None:
+            backends.get_backend(backend)    # Ensure backend is available
+        if isinstance(stream, str):
+            with open(stream) as file:
+                return(cls.from_text(file, delimiter, storage, validation,
+                    backend))
+
+        compact = storage == "compact"
+        data = array("d") if compact else None
+        rows = []
+        lengths = []    # Number of elements of each row
+        lines = iter(stream)
+        lineNumber = 0
+        while True:
+            chunk = list(islice(lines, TEXT_CHUNK_LINES))
+            if not chunk:
+                break
+            try:
+                for line in chunk:
+                    lineNumber += 1
+                    if not line.strip() or line.lstrip().startswith("#"):
+                        continue
+                    fields = line.split(delimiter)
+                    lengths.append(len(fields))
+                    if compact:
+                        data.extend(map(float, fields))
+                        continue
+                    try:    # Most rows are entirely integers or not at all
+                        rows.append(list(map(int, fields)))
+                    except ValueError:
+                        rows.append(list(map(parse_number, fields)))
+            except ValueError:
+                raise AssertionError(
+                    "Line {} must contain only numbers.".format(lineNumber))
+
+        # Validate the shape once, now that every row has been read
+        assert lengths, "Text must contain at least one row of numbers."
+        m, n = len(lengths), lengths[0]
+        if validation != "off":
+            assert lengths.count(n) == m, "Rows must be of same length."
+        if compact:
+            newMatrix = cls._from_buffer(data, m, n, validation, backend)
+        else:
+            newMatrix = cls._from_rows(rows, validation, backend)
+        if validation == "eager":
+            newMatrix.check_validity()
+
+        return(newMatrix)
+
+    def _kernel(self, operation, *operands):
+        """
+        Gives the backend's kernel for an operation of this matrix with the
+        other matrices given, or None if the operation should run in pure
+        Python, either because the backend has no such kernel or because it
+        does not accept the elements of the matrices.
+        """
+
+        return(backends.get_kernel(operation, self, *operands))
+
+    def _view_row(self, i):
+        """
+        Gives row i (counted from zero) of a view as a new list, read from
+        the storage of its parent with a single slice where possible.
+        """
+
+        parent, rows, columns, transposed = self._view
+        n = parent.__n
+        data = parent._data
+        if transposed:    # The row is part of a column of the parent
+            j = columns[i]
+            if data is not None:
+                if isinstance(rows, range):
+                    return(data[_as_slice(rows, j, n)].tolist())
+                return([data[k*n + j] for k in rows])
+            parentRows = parent._rows
+            return([parentRows[k][j] for k in rows])
+
+        k = rows[i]
+        if data is not None:
+            if isinstance(columns, range):
+                return(data[_as_slice(columns, k*n)].tolist())
+            return([data[k*n + j] for j in columns])
+        parentRow = parent._rows[k]
+        if isinstance(columns, range):
+            return(parentRow[_as_slice(columns)])
+        return([parentRow[j] for j in columns])
+
+    def _view_element(self, i, j):
+        """
+        Gives element (i, j) (counted from zero) of a view from the storage
+        of its parent.
+        """
+
+        parent, rows, columns, transposed = self._view
+        if transposed:
+            i, j = j, i
+        if parent._data is not None:
+            return(parent._data[rows[i]*parent.__n + columns[j]])
+
+        return(parent._rows[rows[i]][columns[j]])
+
+    def _before_write(self):
+        """
+        Prepares the matrix to be written to: a view first copies its
+        elements so that its parent is unaffected, and every view taken from
+        the matrix is given its own copy of the elements it shares. Every
+        mutating method calls this, as do writes through .values.
+        """
+
+        if self._view is not None:
+            m = self.__m
+            rows = [self._view_row(i) for i in range(m)]
+            parent = self._view[0]
+            if parent._data is not None:
+                self._rows = []
+                self._data = array("d")
+                for i in rows:
+                    self._data.extend(i)
+            else:
+                self._rows = rows
+            parent._views.discard(self)
+            self._view = None
+        if self._data is not None and not isinstance(self._data, array):
+            # A memory-mapped file is read-only, so copy it on first write
+            self._data = _copy_buffer(self._data)
+        if self._views is not None:
+            for i in list(self._views):
+                i._before_write()
+            self._views = None
 
         return
 
+    def _view_of(self, rows, columns):
+        """
+        Gives a view of the given rows and columns (ranges or lists of
+        positions counted from zero) of this matrix, mapped directly onto
+        the storage of the matrix that owns the elements.
+        """
+
+        if self._view is None:
+            return(Matrix._from_view(self, rows, columns, False,
+                self._validation, self._backend))
+
+        parent, parentRows, parentColumns, transposed = self._view
+        if transposed:
+            rows, columns = columns, rows
+        return(Matrix._from_view(parent, _compose(parentRows, rows),
+            _compose(parentColumns, columns), transposed, self._validation,
+            self._backend))
+
+    def __getitem__(self, key):
+        """
+        Gives an element of the matrix, or a view of a block of it, with
+        rows and columns counted from zero as for Python sequences.
+
+        Parameters
+        ----------
+            key : integer, slice or tuple of two of them
+                the rows and the columns to select; a single one selects
+                whole rows
+
+        Returns
+        -------
+            value : integer/floating point number or object of class Matrix
+                the element if both the row and the column are integers,
+                otherwise a view sharing the elements of the matrix, which
+                copies them only once it is written to
+        """
+
+        if not isinstance(key, tuple):
+            key = (key, slice(None))
+        assert len(key) == 2, "Index must be a row and a column."
+        m, n = self.get_size()
+        rows, columns = _selection(key[0], m), _selection(key[1], n)
+        if isinstance(key[0], int) and isinstance(key[1], int):
+            return(self.get_value(rows[0]+1, columns[0]+1))
+
+        return(self._view_of(rows, columns))
+
+    def view_minor(self, row, column):
+        """
+        Gives a view of the matrix without one row and one column, sharing
+        the elements of the matrix instead of copying them.
+
+        Parameters
+        ----------
+            row : integer
+                number of the row to leave out
+            column : integer
+                number of the column to leave out
+
+        Returns
+        -------
+            newMatrix : object of class Matrix
+                a view of the (m-1) x (n-1) sub matrix
+        """
+
+        assert isinstance(row, int) and isinstance(column, int), \
+            "Location must be an integer value."
+        m, n = self.get_size()
+        assert row > 0 and column > 0 and row <= m and column <= n, \
+            "Matrix must be defined at the given location."
+        assert m > 1 and n > 1, "Matrix must have more than one row and column."
+
+        return(self._view_of([i for i in range(m) if i != row-1],
+            [j for j in range(n) if j != column-1]))
+
+    @property
+    def T(self):
+        """
+        A view of the transpose of the matrix, sharing its elements. Use
+        transpose() for an independent matrix.
+        """
+
+        m, n = self.get_size()
+        if self._view is None:
+            return(Matrix._from_view(self, range(m), range(n), True,
+                self._validation, self._backend))
+
+        parent, rows, columns, transposed = self._view
+        return(Matrix._from_view(parent, rows, columns, not transposed,
+            self._validation, self._backend))
+
     def __str__(self):
         """
         Gives a string representation of the matrix as a grid of numbers.
@@ -105,33 +1782,16 @@ class Matrix:
         -------
             matrixString : string
                 elements of the matrix represented in an easily printable and
-                human-readable form
+                human-readable form, with "..." in place of the middle rows
+                and columns of a matrix larger than PRINT_MAX_ROWS x
+                PRINT_MAX_COLUMNS
         """
 
-        # Determine the largest number of characters among all the elements
-        maxLength = 0
-        for i in self.values:
-            for j in i:
-                if len(str(j)) > maxLength:    # Check if longest number
-                    maxLength = len(str(j))    # Mark a new maximum length
-
-        # Pad each element with necessary whitespace for readablity
-        stringValues = []
-        for i in self.values:
-            rowValues = []
-            for j in i:
-                # Create a right-justified string representation of element
-                # according to the largest length seen
-                rowValues.append(str(j).rjust(maxLength))
-            stringValues.append(rowValues)
-
-        # Join strings representing each element into one single string
-        matrixString = []
-        for i in stringValues:
-            # Join elements of each row into a space-separated string
-            matrixString.append(" ".join(i))
-        # Join each row into a newline-separated string
-        matrixString = "\n".join(matrixString)
+        # Read and format only the elements shown, each of them once
+        m, n = self.get_size()
+        values = self._elements()
+        matrixString = _grid_string(format_elements(
+            lambda i, j: values[i][j], m, n))
 
         return(matrixString)
 
@@ -200,7 +1860,12 @@ class Matrix:
         assert row > 0 and column > 0 and row <= m and column <= n, \
             "Matrix must be defined at the given location."
 
-        value = self.values[row-1][column-1]    # Index into matrix
+        if self._view is not None:    # Index into the parent's storage
+            value = self._view_element(row-1, column-1)
+        elif self._data is not None:    # Index straight into the buffer
+            value = self._data[(row-1)*n + column-1]
+        else:
+            value = self._rows[row-1][column-1]    # Index into matrix
 
         return(value)
 
@@ -225,14 +1890,21 @@ class Matrix:
         # Ensure arguments passed in are valid
         assert isinstance(row, int) and isinstance(column, int), \
             "Location must be an integer value."
-        assert isinstance(value, int) or isinstance(value, float), \
-            "Value must be a number."
+        if self._validation != "off":
+            assert is_number(value), \
+                "Value must be a number."
         m, n = self.get_size()
         assert row > 0 and column > 0 and row <= m and column <= n, \
             "Matrix must be defined at the given location."
 
-        self.values[row-1][column-1] = value    # Update value in matrix
-        self.check_validity()    # Double check that matrix is still valid
+        self._before_write()
+        if self._data is not None:    # Write straight into the buffer
+            self._data[(row-1)*n + column-1] = value
+        else:
+            self._rows[row-1][column-1] = value    # Update value in matrix
+        self.mark_modified()
+        if self._validation == "eager":
+            self.check_validity()    # Double check that matrix is still valid
 
         return
 
@@ -252,13 +1924,13 @@ class Matrix:
         """
 
         m, n = self.get_size()
-        for i in self.values:
+        for i in self._elements():
             assert i, "Matrix must not be empty."
             # Terminate if the rows are of different length
             assert len(i) == n, "Rows must be of same length."
             for j in i:
                 # Terminate if any element is not a number
-                assert isinstance(j, float) or isinstance(j, int), \
+                assert is_number(j), \
                     "Elements must be numbers."
 
         return
@@ -284,19 +1956,25 @@ class Matrix:
         """
 
         # Ensure argument passed in is valid
-        assert row and isinstance(row, list), \
-            "Argument must be a list of numbers."
-        for i in row:
-            assert isinstance(i, int) or isinstance(i, float), \
-                "Argument must be a list of numbers."
         m, n = self.get_size()
-        if self.values:    # Since it may be the first row
+        if self._validation != "off":
+            assert row and isinstance(row, list), \
+                "Argument must be a list of numbers."
+            for i in row:
+                assert is_number(i), \
+                    "Argument must be a list of numbers."
             assert len(row) == n, "Rows must be of same length."
 
-        self.values.append(row)    # Add the new row
+        self._before_write()
+        if self._data is not None:
+            self._data.extend(row)    # Add the new row to the buffer
+        else:
+            self._rows.append(row)    # Add the new row
         self.__m += 1    # Update number of rows
         self.__n = len(row)    # Update number of columns
-        self.check_validity()    # Double check that matrix is still valid
+        self.mark_modified()
+        if self._validation == "eager":
+            self.check_validity()    # Double check that matrix is still valid
 
         return
 
@@ -320,18 +1998,21 @@ class Matrix:
         """
 
         # Ensure argument is valid
-        assert rows and isinstance(rows, list), \
-            "Argument must be a list of lists of numbers."
-        for i in rows:
-            assert i and isinstance(i, list), \
+        if self._validation != "off":
+            assert rows and isinstance(rows, list), \
                 "Argument must be a list of lists of numbers."
-            for j in i:
-                assert isinstance(j, int) or isinstance(j, float), \
+            for i in rows:
+                assert i and isinstance(i, list), \
                     "Argument must be a list of lists of numbers."
+                for j in i:
+                    assert is_number(j), \
+                        "Argument must be a list of lists of numbers."
 
         for i in rows:
             self.add_row(i)    # Add row by row
-        self.check_validity()    # Double check that matrix is still valid
+        self.mark_modified()
+        if self._validation == "eager":
+            self.check_validity()    # Double check that matrix is still valid
 
         return
 
@@ -356,9 +2037,15 @@ class Matrix:
             "Matrix must be defined at the given location."
         assert m != 1, "Matrix must have more than one row."
 
-        del self.values[row-1]    # Remove the list for that row
+        self._before_write()
+        if self._data is not None:    # Remove that stretch of the buffer
+            del self._data[(row-1)*n:row*n]
+        else:
+            del self._rows[row-1]    # Remove the list for that row
         self.__m -= 1
-        self.check_validity()    # Double check that matrix is still valid
+        self.mark_modified()
+        if self._validation == "eager":
+            self.check_validity()    # Double check that matrix is still valid
 
         return
 
@@ -383,19 +2070,31 @@ class Matrix:
         """
 
         # Ensure argument passed in is valid
-        assert column and isinstance(column, list), \
-            "Argument must be a list of numbers."
-        for i in column:
-            assert isinstance(i, int) or isinstance(i, float), \
-                "Argument must be a list of numbers."
         m, n = self.get_size()
-        assert len(column) == m, "Columns must be of same length."
-
-        for i in range(len(self.values)):
-            self.values[i].append(column[i])    # Add the new column
+        if self._validation != "off":
+            assert column and isinstance(column, list), \
+                "Argument must be a list of numbers."
+            for i in column:
+                assert is_number(i), \
+                    "Argument must be a list of numbers."
+            assert len(column) == m, "Columns must be of same length."
+
+        self._before_write()
+        if self._data is not None:
+            # Rebuild the buffer with the new element ending each row
+            data = array("d")
+            for i in range(m):
+                data.extend(self._data[i*n:(i+1)*n])
+                data.append(column[i])
+            self._data = data
+        else:
+            for i in range(len(self._rows)):
+                self._rows[i].append(column[i])    # Add the new column
         self.__m = len(column)    # Update number of rows
         self.__n += 1    # Update number of columns
-        self.check_validity()    # Double check that matrix is still valid
+        self.mark_modified()
+        if self._validation == "eager":
+            self.check_validity()    # Double check that matrix is still valid
 
         return
 
@@ -419,18 +2118,21 @@ class Matrix:
         """
 
         # Ensure argument is valid
-        assert columns and isinstance(columns, list), \
-            "Argument must be a list of lists of numbers."
-        for i in columns:
-            assert i and isinstance(i, list), \
+        if self._validation != "off":
+            assert columns and isinstance(columns, list), \
                 "Argument must be a list of lists of numbers."
-            for j in i:
-                assert isinstance(j, int) or isinstance(j, float), \
+            for i in columns:
+                assert i and isinstance(i, list), \
                     "Argument must be a list of lists of numbers."
+                for j in i:
+                    assert is_number(j), \
+                        "Argument must be a list of lists of numbers."
 
         for i in columns:
             self.add_column(i)    # Add column by column
-        self.check_validity()    # Double check that matrix is still valid
+        self.mark_modified()
+        if self._validation == "eager":
+            self.check_validity()    # Double check that matrix is still valid
 
         return
 
@@ -456,10 +2158,21 @@ class Matrix:
             "Matrix must be defined at the given location."
         assert n != 1, "Matrix must have more than one column."
 
-        for i in range(len(self.values)):
-            del self.values[i][column-1]
+        self._before_write()
+        if self._data is not None:
+            # Rebuild the buffer without the elements of that column
+            data = array("d")
+            for i in range(m):
+                data.extend(self._data[i*n:i*n+column-1])
+                data.extend(self._data[i*n+column:(i+1)*n])
+            self._data = data
+        else:
+            for i in range(len(self._rows)):
+                del self._rows[i][column-1]
         self.__n -= 1
-        self.check_validity()    # Double check that matrix is still valid
+        self.mark_modified()
+        if self._validation == "eager":
+            self.check_validity()    # Double check that matrix is still valid
 
         return
 
@@ -477,13 +2190,21 @@ class Matrix:
             None, but updates the existing matrix
         """
 
-        assert isinstance(number, int) or isinstance(number, float), \
+        assert is_number(number), \
             "Argument must be a number."
 
-        for i in range(len(self.values)):
-            for j in range(len(self.values[i])):
-                self.values[i][j] += number    # Increase each value by number
-        self.check_validity()
+        self._before_write()
+        if self._data is not None:
+            data = self._data
+            for i in range(len(data)):
+                data[i] += number    # Increase each value by number
+        else:
+            for i in range(len(self._rows)):
+                for j in range(len(self._rows[i])):
+                    self._rows[i][j] += number    # Increase each value
+        self.mark_modified()
+        if self._validation == "eager":
+            self.check_validity()
 
         return
 
@@ -502,17 +2223,25 @@ class Matrix:
         """
 
         # Ensure argument is valid
-        assert isinstance(number, int) or isinstance(number, float), \
+        assert is_number(number), \
             "Argument must be a number."
 
-        for i in range(len(self.values)):
-            for j in range(len(self.values[i])):
-                self.values[i][j] *= number    # Multiply each value by number
-        self.check_validity()
+        self._before_write()
+        if self._data is not None:
+            data = self._data
+            for i in range(len(data)):
+                data[i] *= number    # Multiply each value by number
+        else:
+            for i in range(len(self._rows)):
+                for j in range(len(self._rows[i])):
+                    self._rows[i][j] *= number    # Multiply each value
+        self.mark_modified()
+        if self._validation == "eager":
+            self.check_validity()
 
         return
 
-    def matrix_add(self, otherMatrix):
+    def matrix_add(self, otherMatrix, out=None):
         """
         Produces the resultant matrix from adding two matrices together.
 
@@ -520,6 +2249,10 @@ class Matrix:
         ----------
             otherMatrix : object of class Matrix
                 the other matrix to be added to the active matrix
+            out : object of class Matrix or None
+                a matrix of the same size to overwrite with the result,
+                reusing its storage (it may be one of the two matrices), or
+                None (default) for a new matrix
 
         Returns
         -------
@@ -534,19 +2267,9 @@ class Matrix:
         m2, n2 = otherMatrix.get_size()
         assert m1 == m2 and n1 == n2, "Matrices must be the same size."
 
-        # Instantiate the zero matrix of the right size as a placeholder
-        newMatrix = Matrix([[0 for i in range(n1)] for j in range(m1)])
-
-        for i in range(m1):
-            for j in range(n1):
-                # New element value is sum of the value of the elements in the
-                # same location in each input matrix
-                newMatrix.values[i][j] = self.values[i][j] + \
-                    otherMatrix.values[i][j]
+        return(self._elementwise(otherMatrix, "add", add, out))
 
-        return(newMatrix)
-    
-    def matrix_sub(self, otherMatrix):
+    def matrix_sub(self, otherMatrix, out=None):
         """
         Produces the resultant matrix from subtracting another matrix from the
         current matrix.
@@ -555,6 +2278,10 @@ class Matrix:
         ----------
         otherMatrix : object of class Matrix
             the matrix to be subtracted from the current matrix
+        out : object of class Matrix or None
+            a matrix of the same size to overwrite with the result, reusing
+            its storage (it may be one of the two matrices), or None
+            (default) for a new matrix
 
         Returns
         -------
@@ -569,17 +2296,61 @@ class Matrix:
         m2, n2 = otherMatrix.get_size()
         assert m1 == m2 and n1 == n2, "Matrices must be the same size."
 
-        # Instantiate a matrix with the same size as placeholders
-        newMatrix = Matrix([[0 for i in range(n1)] for j in range(m1)])
+        return(self._elementwise(otherMatrix, "sub", sub, out))
+
+    def _elementwise(self, otherMatrix, operation, function, out):
+        """
+        Applies an elementwise operation to two matrices of the same size,
+        with the backend's kernel if it has one, writing the result into out
+        one row at a time if given.
+        """
+
+        m, n = self.get_size()
+        if out is not None:
+            _check_out(out, m, n)
+
+        kernel = self._kernel(operation, otherMatrix)
+        if kernel is not None:    # Dispatch to the backend
+            rows = kernel(self, otherMatrix)
+        elif out is not None:
+            # Each row of the result only depends on the same row of the
+            # inputs, so it is safe to write over one of them
+            rows = (map(function, i, j)
+                for i, j in zip(self._elements(), otherMatrix._elements()))
+        else:
+            # New element value is the operation applied to the elements in
+            # the same location in each input matrix
+            rows = [list(map(function, i, j))
+                for i, j in zip(self._elements(), otherMatrix._elements())]
+
+        if out is not None:
+            out._store_rows(rows)
+            return(out)
+        newMatrix = self._new_like(rows)
+
+        return(newMatrix)
+
+    def _store_rows(self, rows):
+        """
+        Overwrites the elements with rows of the same size, given as any
+        iterables, reusing the existing storage.
+        """
 
-        for i in range(m1):
-            for j in range(n1):
-                # Subtract the corresponding elements of the matrices
-                newMatrix.values[i][j] = self.values[i][j] - otherMatrix.values[i][j]
+        n = self.__n
+        if self._data is not None:
+            data = self._data
+            for i, row in enumerate(rows):
+                data[i*n:(i+1)*n] = array("d", row)
+        else:
+            for target, row in zip(self._rows, rows):
+                target[:] = row    # Keep the row lists themselves
+        self.mark_modified()
+        if self._validation == "eager":
+            self.check_validity()
 
-        return newMatrix
+        return
 
-    def matrix_multiply(self, otherMatrix):
+    def matrix_multiply(self, otherMatrix, out=None):
         """
         Produces the resultant matrix from multiplying two matrices together.
         To be clear, this method outputs the result of (self * otherMatrix),
@@ -589,6 +2360,10 @@ class Matrix:
         ----------
             otherMatrix : object of class Matrix
                 the other matrix to be multiplied with the active matrix
+            out : object of class Matrix or None
+                a matrix of the size of the result to overwrite with it,
+                reusing its storage (it may be one of the two matrices), or
+                None (default) for a new matrix
 
         Returns
         -------
@@ -603,23 +2378,154 @@ class Matrix:
         m1, n1 = self.get_size()
         m2, n2 = otherMatrix.get_size()
         assert n1 == m2, "Matrices must be of compatible size."
+        if out is not None:
+            _check_out(out, m1, n2)
+
+        kernel = self._kernel("matmul", otherMatrix)
+        if kernel is not None:    # Dispatch to the backend
+            rows = kernel(self, otherMatrix)
+            if out is not None:
+                out._store_rows(rows)
+                return(out)
+            return(self._new_like(rows))
+
+        # Pre-transpose the other matrix so that each element of the result
+        # is an inner product of two contiguous sequences
+        if self._view is not None:
+            aRows = [self._view_row(i) for i in range(m1)]
+        elif self._data is not None:
+            a = self._data
+            aRows = [a[i*n1:(i+1)*n1] for i in range(m1)]
+        else:
+            aRows = self._rows
+        if otherMatrix._data is not None:
+            b = otherMatrix._data
+            bColumns = [b[j::n2] for j in range(n2)]    # Strided slices
+        else:
+            bColumns = list(zip(*otherMatrix._elements()))
+
+        if out is None and self.storage == "list":
+            return(self._new_like(_multiply_blocked(aRows, bColumns)))
+
+        if out is not None and out._data is None and out._rows is not aRows:
+            # Write straight into the rows of the output
+            _multiply_blocked(aRows, bColumns, out=out._rows)
+            out.mark_modified()
+            if out._validation == "eager":
+                out.check_validity()
+            return(out)
+
+        # The rows are only a temporary, so take them from the workspace
+        rows = _multiply_blocked(aRows, bColumns,
+            out=_workspace.take(m1, n2))
+        if out is not None:
+            out._store_rows(rows)
+            newMatrix = out
+        else:
+            newMatrix = self._new_like(rows)    # Copied into a buffer
+        _workspace.give(rows)
 
-        # Instantiate the zero matrix of the right size as a placeholder
-        newMatrix = Matrix([[0 for i in range(n2)] for j in range(m1)])
+        return(newMatrix)
 
-        for i in range(m1):
-            for j in range(n2):
-                # New element value is sum of products of corresponding row
-                # and column vectors of the matrices
-                value = 0    # Initially set to zero
-                for k in range(n1):
-                    # Add the value of each relevant product to the cumulative
-                    # value of the new element
-                    value += self.values[i][k] * otherMatrix.values[k][j]
-                newMatrix.values[i][j] = value    # Assign final value
+    def _binary_operand(self, other):
+        """
+        Determines if an operand of an operator is a matrix or a number, so
+        that unsupported operands are left to Python.
+        """
+
+        if isinstance(other, Matrix):
+            return("matrix")
+        if is_number(other):
+            return("number")
+        return(None)
+
+    def __add__(self, other):
+        kind = self._binary_operand(other)
+        if kind == "matrix":
+            return(self.matrix_add(other))
+        if kind == "number":
+            newMatrix = self.copy()
+            newMatrix.scalar_add(other)
+            return(newMatrix)
+        return(NotImplemented)
+
+    def __radd__(self, other):
+        return(self.__add__(other))
+
+    def __sub__(self, other):
+        kind = self._binary_operand(other)
+        if kind == "matrix":
+            return(self.matrix_sub(other))
+        if kind == "number":
+            newMatrix = self.copy()
+            newMatrix.scalar_add(-other)
+            return(newMatrix)
+        return(NotImplemented)
+
+    def __rsub__(self, other):
+        if self._binary_operand(other) != "number":
+            return(NotImplemented)
+        newMatrix = -self
+        newMatrix.scalar_add(other)
+        return(newMatrix)
 
+    def __neg__(self):
+        newMatrix = self.copy()
+        newMatrix.scalar_multiply(-1)
         return(newMatrix)
 
+    def __mul__(self, other):
+        kind = self._binary_operand(other)
+        if kind == "matrix":
+            return(self.matrix_multiply(other))
+        if kind == "number":
+            newMatrix = self.copy()
+            newMatrix.scalar_multiply(other)
+            return(newMatrix)
+        return(NotImplemented)
+
+    def __rmul__(self, other):
+        if self._binary_operand(other) != "number":
+            return(NotImplemented)
+        return(self.__mul__(other))
+
+    def __matmul__(self, other):
+        if self._binary_operand(other) != "matrix":
+            return(NotImplemented)
+        return(self.matrix_multiply(other))
+
+    def __iadd__(self, other):
+        kind = self._binary_operand(other)
+        if kind == "matrix":
+            return(self.matrix_add(other, out=self))
+        if kind == "number":
+            self.scalar_add(other)
+            return(self)
+        return(NotImplemented)
+
+    def __isub__(self, other):
+        kind = self._binary_operand(other)
+        if kind == "matrix":
+            return(self.matrix_sub(other, out=self))
+        if kind == "number":
+            self.scalar_add(-other)
+            return(self)
+        return(NotImplemented)
+
+    def __imul__(self, other):
+        kind = self._binary_operand(other)
+        if kind == "matrix":
+            return(self.matrix_multiply(other, out=self))
+        if kind == "number":
+            self.scalar_multiply(other)
+            return(self)
+        return(NotImplemented)
+
+    def __imatmul__(self, other):
+        if self._binary_operand(other) != "matrix":
+            return(NotImplemented)
+        return(self.matrix_multiply(other, out=self))
+
     def transpose(self):
         """
         Produces the a matrix equivalent to the transpose of the existing
@@ -635,25 +2541,39 @@ class Matrix:
                 the transpose of the original matrix
         """
 
-        # Instantiate the zero matrix of the right size as a placeholder
         m, n = self.get_size()
-        newMatrix = Matrix([[0 for i in range(m)] for j in range(n)])
-
-        for i in range(m):
+        kernel = self._kernel("transpose")
+        if kernel is not None:    # Dispatch to the backend
+            return(self._new_like(kernel(self)))
+
+        if self._view is not None:
+            return(self.T.copy())    # Copy the rows of the transposed view
+        if self._data is not None:
+            # Each column of the buffer is a strided slice of it
+            data = array("d")
             for j in range(n):
-                # Map each element from the existing matrix to the new location
-                # on the resultant matrix
-                newMatrix.values[j][i] = self.values[i][j]
+                data.extend(self._data[j::n])
+            return(Matrix._from_buffer(data, n, m, self._validation,
+                self._backend))
+
+        # Each column of the existing matrix becomes a row of the new one
+        newMatrix = self._new_like([list(i) for i in zip(*self._rows)])
 
         return(newMatrix)
 
-    def determinant(self):
+    def determinant(self, method="lu"):
         """
         Computes the determinant of a square matrix.
 
         Parameters
         ----------
-            None
+            method : string
+                "lu" (default) uses Gaussian elimination with partial
+                pivoting in O(n^3) time, "bareiss" uses fraction-free
+                elimination in O(n^3) arithmetic operations, which is exact
+                for integer/rational matrices, and "cofactor" uses
+                recursive cofactor expansion in O(n!) time, which is also
+                exact but only practical for small matrices
 
         Returns
         -------
@@ -664,19 +2584,196 @@ class Matrix:
         # Ensure matrix is valid for determinant operation
         m, n = self.get_size()
         assert m == n, "Matrix must be square."
+        assert method in ("lu", "bareiss", "cofactor"), \
+            "Method must be one of \"lu\", \"bareiss\" or \"cofactor\"."
+
+        value = self.memoize(("determinant", method),
+            lambda: self._compute_determinant(method))
 
-        if m == 1:    # Base case of recursion
-            value = self.get_value(1, 1)    # Determinant is just only value
-        else:    # Apply method of cofactor expansion
-            value = 0
+        return(value)
+
+    def _compute_determinant(self, method):
+        """
+        Computes the determinant of a square matrix with the given method,
+        without looking at the cache.
+        """
+
+        m, n = self.get_size()
+        if method == "cofactor":
+            return(self._cofactor_determinant())
+
+        if method == "bareiss":
+            echelon, sign, pivots = bareiss_eliminate(self._elements())
+            if len(pivots) < m:
+                return(0)
+            return(sign * echelon[m-1][m-1])    # Last pivot is determinant
+
+        kernel = self._kernel("det")
+        if kernel is not None:    # Dispatch to the backend
+            return(kernel(self))
+
+        # Factor a copy held in rows taken from the workspace
+        lu = _workspace.take(m, n)
+        for target, i in zip(lu, self._elements()):
+            target[:] = map(float, i)
+        lu, perm, sign, singular = lu_decompose(lu, overwrite=True)
+        value = 0.0
+        if not singular:
+            value = float(sign)
             for i in range(m):
-                subMatrix = deepcopy(self)
-                # Consider the sub matrix without the row and column that the
-                # present element is in
-                subMatrix.delete_row(1)
-                subMatrix.delete_column(i+1)
-                # Formula applies negative as needed, includes factor of
-                # present element, and makes recursive call for the sub matrix
-                value += (-1)**i*self.get_value(1, i+1)*subMatrix.determinant()
+                value *= lu[i][i]    # Product of the pivots of U
+        _workspace.give(lu)
+
+        return(value)
+
+    def _cofactor_determinant(self):
+        """
+        Computes the determinant of a square matrix by cofactor expansion
+        along the first row.
+
+        Parameters
+        ----------
+            None
+
+        Returns
+        -------
+            value : integer/floating point number
+                the scalar number representing the value of the determinant
+        """
+
+        # Read the elements once; each sub matrix is then just the columns
+        # left over below the row being expanded, rather than a copy
+        rows = [list(i) for i in self._elements()]
+        value = _cofactor_expansion(rows, 0, list(range(len(rows))))
 
         return(value)
+
+
+def profile():
+    """
+    Gives a context manager counting and timing every Matrix method, the
+    kernels behind them and the registered operations of other modules
+    (such as operation.advanced) while it is entered. Nothing is wrapped
+    outside of it, so unprofiled code pays nothing.
+
+    Returns
+    -------
+        profile : object of class profiling.Profile
+            the counters, filled in while entered, see report()
+
+    Example Usage
+    -------------
+        with profile() as p:
+            A.determinant()
+        print(p.report())
+    """
+
+    return(profiling.Profile())
+
+
+def _elements(mat):
+    # Number of elements of a matrix, for the profiling cost functions
+    return(mat._Matrix__m * mat._Matrix__n)
+
+
+def _lu_cost(args, kwargs, result):
+    # Step k updates the j x j block below and right of the pivot, j = n-k-1
+    n = len(args[0])
+    updates = sum(j*j for j in range(n))
+    multipliers = n*(n-1)//2
+    return({"flops": 2*updates + multipliers, "reads": 2*updates + multipliers,
+        "writes": updates + multipliers})
+
+
+def _lu_solve_cost(args, kwargs, result):
+    n, k = len(args[0]), len(args[2][0])
+    return({"flops": 2*n*n*k, "reads": 2*n*n*k})
+
+
+def _bareiss_cost(args, kwargs, result):
+    # Each update of an element is two products, a difference and a division
+    echelon, sign, pivots = result
+    m, n = len(echelon), len(echelon[0])
+    reduce = kwargs.get("reduce", args[1] if len(args) > 1 else False)
+    updates = sum(((m-1) if reduce else (m-1-k)) * (n-c)
+        for k, c in enumerate(pivots))
+    return({"flops": 4*updates, "reads": 3*updates})
+
+
+def _multiply_cost(args, kwargs, result):
+    aRows, bColumns = args[0], args[1]
+    products = len(aRows) * len(bColumns) * (len(aRows[0]) if aRows else 0)
+    return({"flops": 2*products, "reads": 2*products})
+
+
+def _allocation_cost(args, kwargs, result):
+    return({"allocations": 1, "writes": _elements(result)})
+
+
+def _elementwise_cost(args, kwargs, result):
+    count = _elements(args[0])
+    return({"flops": count, "reads": 2*count})
+
+
+def _scalar_cost(args, kwargs, result):
+    count = _elements(args[0])
+    return({"flops": count, "reads": count, "writes": count})
+
+
+# Bookkeeping methods the operations call themselves, left out of the
+# reports so that they only list the operations users call
+_PROFILE_HELPERS = ("get_size", "memoize", "mark_modified", "like")
+
+# Costs of the public methods, beyond those of the kernels they call
+_PROFILE_COSTS = {
+    "__init__": lambda args, kwargs, result: {"allocations": 1,
+        "writes": _elements(args[0])},
+    "__getitem__": lambda args, kwargs, result: {"reads": 0 if
+        isinstance(result, Matrix) else 1},
+    "get_value": lambda args, kwargs, result: {"reads": 1},
+    "set_value": lambda args, kwargs, result: {"writes": 1},
+    "check_validity": lambda args, kwargs, result: {"validations": 1,
+        "reads": _elements(args[0])},
+    "copy": lambda args, kwargs, result: {"copies": 1,
+        "reads": _elements(args[0])},
+    "transpose": lambda args, kwargs, result: {"reads": _elements(args[0])},
+    "matrix_add": _elementwise_cost,
+    "matrix_sub": _elementwise_cost,
+    "scalar_add": _scalar_cost,
+    "scalar_multiply": _scalar_cost,
+}
+
+
+def _register_profiling():
+    """
+    Registers the public methods of Matrix, except the bookkeeping ones, and
+    the kernels behind them with the profiling module.
+    """
+
+    for name, attribute in list(Matrix.__dict__.items()):
+        public = name in ("__init__", "__getitem__") or (
+            not name.startswith("_") and not isinstance(attribute, property)
+            and name not in _PROFILE_HELPERS)
+        if public and callable(getattr(Matrix, name)):
+            profiling.register(Matrix, name, cost=_PROFILE_COSTS.get(name))
+
+    profiling.register(Matrix, "_from_rows", cost=_allocation_cost,
+        operation=False)
+    profiling.register(Matrix, "_from_buffer", cost=_allocation_cost,
+        operation=False)
+    profiling.register(Matrix, "_store_rows", operation=False,
+        cost=lambda args, kwargs, result: {"writes": _elements(args[0])})
+    module = sys.modules[__name__]
+    profiling.register(module, "lu_decompose", cost=_lu_cost,
+        operation=False)
+    profiling.register(module, "lu_solve", cost=_lu_solve_cost,
+        operation=False)
+    profiling.register(module, "bareiss_eliminate", cost=_bareiss_cost,
+        operation=False)
+    profiling.register(module, "_multiply_blocked", cost=_multiply_cost,
+        operation=False)
+
+    return
+
+
+_register_profiling()
@@ -0,0 +1,258 @@
+"""
+Parallel matrix multiplication over a pool of worker processes.
+
+The operands are copied once into multiprocessing.shared_memory blocks (the
+left matrix row-major, the right one column-major) and every worker computes
+a contiguous block of rows of the result straight into a shared output
+block, so no matrix data is pickled per task. Each element is computed with
+the same inner product as the serial Matrix.matrix_multiply, so results are
+identical. Matrices with integer or rational elements are multiplied
+serially, so that they stay exact.
+
+Importing this module also registers a "parallel" backend, so that
+
+    import MatrixProgram.backends as backends
+    import MatrixProgram.parallel
+    backends.set_backend("parallel")
+
+makes every matrix_multiply call run in parallel above the threshold.
+
+Example Usage
+-------------
+    from MatrixProgram.parallel import parallel_multiply
+    C = parallel_multiply(A, B, workers=8)
+"""
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from operator import mul
+
+try:    # Imported as part of the MatrixProgram package
+    from . import backends
+    from . import matrix
+except ImportError:    # Imported from within the MatrixProgram directory
+    import backends
+    import matrix
+
+
+# Products with fewer multiply-adds than this stay serial, since starting
+# tasks and copying into shared memory would cost more than they save
+PARALLEL_THRESHOLD = 128**3
+
+_executors = {}
+
+
+def _get_executor(workers):
+    """
+    Gives a process pool with the given number of workers, reusing the pool
+    from earlier calls so that processes are only started once.
+    """
+
+    if workers not in _executors:
+        _executors[workers] = ProcessPoolExecutor(max_workers=workers)
+
+    return(_executors[workers])
+
+
+def shutdown():
+    """
+    Stops all the worker processes started by this module.
+
+    Returns
+    -------
+        None
+    """
+
+    for executor in _executors.values():
+        executor.shutdown()
+    _executors.clear()
+
+    return
+
+
+def _to_shared(values, size):
+    """
+    Copies a sequence of numbers into a new block of shared memory holding
+    8-byte floats.
+    """
+
+    block = shared_memory.SharedMemory(create=True, size=max(8*size, 8))
+    view = block.buf.cast("d")
+    view[:size] = array("d", values)
+    view.release()
+
+    return(block)
+
+
+def _multiply_rows(aName, bName, outName, n1, n2, start, stop):
+    """
+    Worker task computing rows start to stop (exclusive) of the product of
+    an m1 x n1 matrix and an n1 x n2 matrix held in shared memory.
+    """
+
+    aBlock = shared_memory.SharedMemory(name=aName)
+    bBlock = shared_memory.SharedMemory(name=bName)
+    outBlock = shared_memory.SharedMemory(name=outName)
+    a, b, out = aBlock.buf.cast("d"), bBlock.buf.cast("d"), \
+        outBlock.buf.cast("d")
+    try:
+        columns = [b[j*n1:(j+1)*n1].tolist() for j in range(n2)]
+        for i in range(start, stop):
+            row = a[i*n1:(i+1)*n1].tolist()
+            out[i*n2:(i+1)*n2] = array("d",
+                [sum(map(mul, row, column)) for column in columns])
+    finally:
+        # Views must be released before the blocks can be closed
+        a.release()
+        b.release()
+        out.release()
+        aBlock.close()
+        bBlock.close()
+        outBlock.close()
+
+    return
+
+
+def _multiply(aRows, bColumns, workers):
+    """
+    Multiplies two matrices given as the rows of the first and the columns
+    of the second across a pool of processes.
+
+    Returns
+    -------
+        data : array("d")
+            row-major elements of the product
+    """
+
+    m1, n2 = len(aRows), len(bColumns)
+    n1 = len(aRows[0])
+
+    blocks = []
+    try:
+        blocks.append(_to_shared((x for i in aRows for x in i), m1*n1))
+        blocks.append(_to_shared((x for j in bColumns for x in j), n1*n2))
+        blocks.append(shared_memory.SharedMemory(create=True,
+            size=max(8*m1*n2, 8)))
+        aName, bName, outName = (i.name for i in blocks)
+
+        # Split the rows of the result into one contiguous block per worker
+        step = -(-m1 // workers)
+        executor = _get_executor(workers)
+        tasks = [executor.submit(_multiply_rows, aName, bName, outName, n1,
+            n2, start, min(start + step, m1)) for start in range(0, m1, step)]
+        for task in tasks:
+            task.result()    # Raises if the worker failed
+
+        out = blocks[2].buf.cast("d")
+        data = array("d", out[:m1*n2])
+        out.release()
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    return(data)
+
+
+def _all_float(mat):
+    """
+    Determines if every element of a matrix is a floating point number, so
+    that copying it into a float buffer changes nothing. Integers and
+    fractions are left to the serial product, which keeps them exact.
+    """
+
+    if mat.storage == "compact":
+        return(True)
+
+    return(all(isinstance(j, float) for i in mat._elements() for j in i))
+
+
+def parallel_multiply(matrixA, matrixB, workers=None,
+        threshold=None):
+    """
+    Produces the result of (matrixA * matrixB) by splitting the rows of the
+    result across worker processes.
+
+    Parameters
+    ----------
+        matrixA : object of class Matrix
+            the left matrix
+        matrixB : object of class Matrix
+            the right matrix
+        workers : integer or None
+            number of worker processes, the number of CPUs by default
+        threshold : integer or None
+            minimum number of multiply-adds (m * n * p) for the product to
+            be computed in parallel, PARALLEL_THRESHOLD by default
+
+    Returns
+    -------
+        newMatrix : object of class Matrix
+            the product, with the storage mode of matrixA
+    """
+
+    assert isinstance(matrixA, matrix.Matrix) and \
+        isinstance(matrixB, matrix.Matrix), "Arguments must be matrices."
+    m1, n1 = matrixA.get_size()
+    m2, n2 = matrixB.get_size()
+    assert n1 == m2, "Matrices must be of compatible size."
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if threshold is None:
+        threshold = PARALLEL_THRESHOLD
+    assert isinstance(workers, int) and workers > 0, \
+        "Number of workers must be a positive integer."
+
+    if workers == 1 or m1 == 1 or m1*n1*n2 < threshold:
+        return(matrixA.matrix_multiply(matrixB))    # Not worth it
+    if not (_all_float(matrixA) and _all_float(matrixB)):
+        return(matrixA.matrix_multiply(matrixB))    # Keep exact elements
+
+    data = _multiply(matrixA._elements(), list(zip(*matrixB._elements())),
+        workers)
+    if matrixA.storage == "compact":
+        return(matrix.Matrix._from_buffer(data, m1, n2,
+            matrixA.validation, matrixA.backend))
+    newMatrix = matrixA._new_like(
+        [data[i*n2:(i+1)*n2].tolist() for i in range(m1)])
+
+    return(newMatrix)
+
+
+class ParallelBackend:
+    """
+    A backend running matrix_multiply in parallel above a size threshold.
+
+    Attributes
+    ----------
+        workers : integer or None
+            number of worker processes, the number of CPUs if None
+        threshold : integer or None
+            minimum number of multiply-adds for a parallel product,
+            PARALLEL_THRESHOLD if None
+    """
+
+    name = "parallel"
+
+    def __init__(self, workers=None, threshold=None):
+        self.workers = workers
+        self.threshold = threshold
+
+    def matmul(self, a, b):
+        m1, n1 = a.get_size()
+        n2 = b.get_size()[1]
+        workers = self.workers or os.cpu_count() or 1
+        threshold = self.threshold
+        if threshold is None:
+            threshold = PARALLEL_THRESHOLD
+        bColumns = list(zip(*b._elements()))
+        if workers == 1 or m1 == 1 or m1*n1*n2 < threshold or \
+                not (_all_float(a) and _all_float(b)):
+            return(matrix._multiply_blocked(a._elements(), bColumns))
+        data = _multiply(a._elements(), bColumns, workers)
+        return([data[i*n2:(i+1)*n2].tolist() for i in range(m1)])
+
+
+backends.register_backend("parallel", ParallelBackend())
@@ -0,0 +1,271 @@
+"""
+Opt-in instrumentation of the matrix operations.
+
+Modules register the functions and methods worth watching together with a
+cost function estimating the work each call does. Nothing is wrapped until
+a Profile is entered: the registered functions are then replaced by
+counting wrappers, and put back when it exits, so that code which is not
+being profiled runs exactly as before.
+
+Every call to a registered operation is counted and timed under the name of
+the operation. The counters below are charged to every operation active
+when the work happens, so that an operation's totals include the work of
+the operations it calls:
+
+    flops : arithmetic operations of the elimination and product kernels
+    reads : elements read through the Matrix API (every element of each
+        operand of a whole-matrix operation, one per get_value)
+    writes : elements written to matrices (every element of each new
+        matrix, one per set_value)
+    validations : calls to check_validity
+    copies : calls to Matrix.copy, through which deepcopy also goes
+    allocations : new matrices holding their own elements (not views)
+
+Example Usage
+-------------
+    with matrix.profile() as p:
+        advanced.row_echelon(A)
+    print(p.report())
+    p.report("json")
+"""
+
+import json
+import time
+from functools import wraps
+
+
+COUNTERS = ("flops", "reads", "writes", "validations", "copies",
+    "allocations")
+
+# Name under which work done outside of any registered operation is charged
+OUTSIDE = "(outside operations)"
+
+# (owner, attribute, name, cost, operation) for every registered function
+_hooks = []
+
+# The profile currently entered, if any
+_current = None
+
+
+def register(owner, attribute, name=None, cost=None, operation=True):
+    """
+    Registers a function or method to be wrapped while a profile is active.
+
+    Parameters
+    ----------
+        owner : module or class
+            the object holding the function as an attribute
+        attribute : string
+            name of the attribute
+        name : string or None
+            name of the operation in reports, "Owner.attribute" by default
+        cost : function or None
+            called with the positional arguments, the keyword arguments and
+            the result of each call, gives a dictionary of counters (see
+            COUNTERS) to increase
+        operation : boolean
+            whether calls are counted and timed as an operation of their
+            own (True, default) or only charge their cost to the active
+            operations, as for private kernels
+
+    Returns
+    -------
+        None
+    """
+
+    if name is None:
+        name = "{}.{}".format(owner.__name__.rsplit(".", 1)[-1], attribute)
+    _hooks.append((owner, attribute, name, cost, operation))
+
+    return
+
+
+class Profile:
+    """
+    A class to represent the counters and timers collected while it is
+    entered as a context manager.
+
+    Attributes
+    ----------
+        operations : dictionary
+            for each operation name, a dictionary of its "calls", its
+            cumulative "seconds", its "self_seconds" spent outside of other
+            operations and every counter of COUNTERS
+        seconds : floating point number
+            wall time the profile was active for
+
+    Methods
+    -------
+        to_dict() :
+            gives the results as plain dictionaries
+        report(format) :
+            gives the results as a table or as JSON
+    """
+
+    def __init__(self):
+        self.operations = {}
+        self.seconds = 0.0
+        self._active = {}    # Depth of each running operation
+        self._children = []    # Time spent in nested calls, per frame
+        self._saved = []
+        self._start = None
+
+    def __enter__(self):
+        global _current
+        assert _current is None, "Only one profile can be active at a time."
+
+        for owner, attribute, name, cost, operation in _hooks:
+            original = owner.__dict__[attribute]
+            self._saved.append((owner, attribute, original))
+            setattr(owner, attribute,
+                self._wrap(original, name, cost, operation))
+        _current = self
+        self._start = time.perf_counter()
+
+        return(self)
+
+    def __exit__(self, *exception):
+        global _current
+
+        self.seconds += time.perf_counter() - self._start
+        _current = None
+        for owner, attribute, original in reversed(self._saved):
+            setattr(owner, attribute, original)
+        self._saved.clear()
+
+        return(False)
+
+    def _record(self, name):
+        """
+        Gives the counters of an operation, creating them if needed.
+        """
+
+        record = self.operations.get(name)
+        if record is None:
+            record = dict.fromkeys(("calls", "seconds", "self_seconds"), 0)
+            record.update(dict.fromkeys(COUNTERS, 0))
+            self.operations[name] = record
+
+        return(record)
+
+    def _charge(self, counts):
+        """
+        Adds counters to every active operation.
+        """
+
+        for name in self._active or (OUTSIDE,):
+            record = self._record(name)
+            for key, value in counts.items():
+                record[key] += value
+
+        return
+
+    def _wrap(self, original, name, cost, operation):
+        """
+        Gives the counting replacement of a registered function, keeping
+        class and static methods as such.
+        """
+
+        if isinstance(original, (classmethod, staticmethod)):
+            return(type(original)(self._wrap(original.__func__, name, cost,
+                operation)))
+
+        function = original
+        profile = self
+
+        if not operation:
+            @wraps(function)
+            def kernel(*args, **kwargs):
+                result = function(*args, **kwargs)
+                if _current is profile and cost is not None:
+                    profile._charge(cost(args, kwargs, result))
+                return(result)
+            return(kernel)
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if _current is not profile:    # Kept by a caller after exit
+                return(function(*args, **kwargs))
+            return(profile._call(function, name, cost, args, kwargs))
+
+        return(wrapper)
+
+    def _call(self, function, name, cost, args, kwargs):
+        """
+        Runs a call to an operation, counting and timing it.
+        """
+
+        active = self._active
+        depth = active.get(name, 0)
+        active[name] = depth + 1
+        self._children.append(0.0)
+        start = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+            if cost is not None:
+                self._charge(cost(args, kwargs, result))
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._children.pop()
+            if depth:
+                active[name] = depth
+            else:
+                del active[name]
+            record = self._record(name)
+            record["calls"] += 1
+            record["self_seconds"] += elapsed - children
+            if not depth:    # Recursive calls are already inside the time
+                record["seconds"] += elapsed
+            if self._children:
+                self._children[-1] += elapsed
+
+        return(result)
+
+    def to_dict(self):
+        """
+        Gives the results of the profile.
+
+        Returns
+        -------
+            results : dictionary
+                the total "seconds" and the "operations" (see the class
+                attributes)
+        """
+
+        return({"seconds": self.seconds,
+            "operations": {name: dict(record)
+                for name, record in self.operations.items()}})
+
+    def report(self, format="table"):
+        """
+        Gives the results of the profile, the most time consuming
+        operations first.
+
+        Parameters
+        ----------
+            format : string
+                "table" (default) for a text table or "json"
+
+        Returns
+        -------
+            text : string
+                the report
+        """
+
+        assert format in ("table", "json"), \
+            "Format must be either \"table\" or \"json\"."
+        if format == "json":
+            return(json.dumps(self.to_dict(), indent=1))
+
+        columns = ("calls", "seconds", "self_seconds") + COUNTERS
+        width = max([len(i) for i in self.operations] + [len("operation")])
+        lines = ["{:<{}}".format("operation", width) + "".join(
+            "{:>13}".format(i) for i in columns)]
+        for name, record in sorted(self.operations.items(),
+                key=lambda item: -item[1]["seconds"]):
+            lines.append("{:<{}}".format(name, width) + "".join(
+                "{:>13.6f}".format(record[i]) if "seconds" in i else
+                "{:>13}".format(record[i]) for i in columns))
+        lines.append("Total time: {:.6f} seconds".format(self.seconds))
+
+        return("\n".join(lines))
@@ -0,0 +1,465 @@
+from array import array
+from bisect import bisect_left
+
+try:    # Imported as part of the MatrixProgram package
+    from . import matrix
+except ImportError:    # Imported from within the MatrixProgram directory
+    import matrix
+
+
+class SparseMatrix:
+    """
+    A class to represent a sparse matrix, holding only its nonzero elements
+    in compressed sparse row (CSR) form, so that memory and the cost of
+    operations grow with the number of nonzeros rather than with m x n.
+
+    Attributes
+    ----------
+        m : integer
+            number of rows in the matrix (for an m x n matrix)
+        n : integer
+            number of columns in the matrix (for an m x n matrix)
+        indptr : array of integers
+            the nonzeros of row i are at positions indptr[i] to
+            indptr[i+1] - 1 of indices and data
+        indices : array of integers
+            column (counted from zero) of each nonzero, sorted within a row
+        data : list of integer/floating point numbers
+            value of each nonzero, kept exactly as given
+
+    Methods
+    -------
+        get_size() :
+            gives the size of the matrix (for an m x n matrix)
+        get_value(row, column) :
+            gives the value of a specified element of the matrix
+        nonzeros() :
+            gives the number of stored nonzero elements
+        from_matrix(mat) :
+            builds a sparse matrix from the nonzeros of a Matrix
+        to_matrix() :
+            gives the equivalent dense Matrix
+        transpose() :
+            transposes the matrix, producing a new sparse matrix
+        scalar_multiply(number) :
+            multiplies each element of the matrix by a specified number
+        matrix_add(otherMatrix) :
+            adds a sparse or dense matrix, producing a new matrix
+        matrix_multiply(otherMatrix) :
+            multiplies by a sparse or dense matrix, producing a new matrix
+        matvec(vector) :
+            multiplies the matrix by a vector given as a list
+
+    Example Usage
+    -------------
+        # 3 x 3 matrix with entries given as (row, column, value)
+        A = SparseMatrix(3, 3, [(1,1,4), (2,3,-1), (3,2,2.5)])
+        B = SparseMatrix.from_matrix(Matrix([[0,1],[2,0]]))
+    """
+
+    __slots__ = ("indptr", "indices", "data", "__m", "__n")
+
+    def __init__(self, m, n, entries=()):
+        """
+        Instantiates the matrix from coordinate (COO) form. Entries given
+        more than once for the same location are added together and zero
+        entries are not stored.
+
+        Parameters
+        ----------
+            m : integer
+                number of rows
+            n : integer
+                number of columns
+            entries : iterable of (row, column, value) tuples
+                location (counted from one, as in Matrix) and value of each
+                nonzero element
+
+        Returns
+        -------
+            None, but creates the matrix
+        """
+
+        # Ensure arguments passed in are valid
+        assert isinstance(m, int) and isinstance(n, int) and m > 0 and \
+            n > 0, "Size must be positive integers."
+
+        rows = [{} for i in range(m)]
+        for row, column, value in entries:
+            assert isinstance(row, int) and isinstance(column, int), \
+                "Location must be an integer value."
+            assert row > 0 and column > 0 and row <= m and column <= n, \
+                "Matrix must be defined at the given location."
+            assert matrix.is_number(value), "Value must be a number."
+            rowValues = rows[row-1]
+            rowValues[column-1] = rowValues.get(column-1, 0) + value
+
+        # Compress the rows, dropping entries which cancelled out
+        self.indptr = array("l", [0])
+        self.indices = array("l")
+        self.data = []
+        for rowValues in rows:
+            for column in sorted(rowValues):
+                if rowValues[column] != 0:
+                    self.indices.append(column)
+                    self.data.append(rowValues[column])
+            self.indptr.append(len(self.data))
+        self.__m = m
+        self.__n = n
+
+        return
+
+    @classmethod
+    def _from_csr(cls, m, n, indptr, indices, data):
+        """
+        Wraps CSR arrays produced by the library itself without copying or
+        validating them.
+        """
+
+        newMatrix = cls.__new__(cls)
+        newMatrix.indptr = indptr
+        newMatrix.indices = indices
+        newMatrix.data = data
+        newMatrix.__m = m
+        newMatrix.__n = n
+
+        return(newMatrix)
+
+    @classmethod
+    def _from_rows(cls, m, n, rows):
+        """
+        Builds a sparse matrix from one dictionary per row mapping columns
+        (counted from zero) to values, dropping zeros.
+        """
+
+        indptr = array("l", [0])
+        indices = array("l")
+        data = []
+        for rowValues in rows:
+            for column in sorted(rowValues):
+                if rowValues[column] != 0:
+                    indices.append(column)
+                    data.append(rowValues[column])
+            indptr.append(len(data))
+
+        return(cls._from_csr(m, n, indptr, indices, data))
+
+    @classmethod
+    def from_matrix(cls, mat):
+        """
+        Builds a sparse matrix holding the nonzero elements of a Matrix.
+
+        Parameters
+        ----------
+            mat : object of class Matrix
+                the dense matrix to convert
+
+        Returns
+        -------
+            newMatrix : object of class SparseMatrix
+                the sparse equivalent of the matrix
+        """
+
+        assert isinstance(mat, matrix.Matrix), "Argument must be a matrix."
+        m, n = mat.get_size()
+        indptr = array("l", [0])
+        indices = array("l")
+        data = []
+        for row in mat._elements():
+            for column, value in enumerate(row):
+                if value != 0:
+                    indices.append(column)
+                    data.append(value)
+            indptr.append(len(data))
+
+        return(cls._from_csr(m, n, indptr, indices, data))
+
+    def to_matrix(self, storage="list"):
+        """
+        Gives the equivalent dense matrix.
+
+        Parameters
+        ----------
+            storage : string
+                storage mode of the new matrix, "list" or "compact"
+
+        Returns
+        -------
+            newMatrix : object of class Matrix
+                the dense equivalent of the matrix
+        """
+
+        rows = [[0] * self.__n for i in range(self.__m)]
+        for i in range(self.__m):
+            rowValues = rows[i]
+            for k in range(self.indptr[i], self.indptr[i+1]):
+                rowValues[self.indices[k]] = self.data[k]
+
+        return(matrix.Matrix(rows, storage=storage))
+
+    def __str__(self):
+        """
+        Gives a string representation of the matrix as a grid of numbers,
+        the same as for the equivalent dense matrix.
+        """
+
+        # Only the elements shown are looked up, without densifying
+        m, n = self.get_size()
+        return(matrix._grid_string(matrix.format_elements(
+            lambda i, j: self.get_value(i+1, j+1), m, n)))
+
+    def __repr__(self):
+        """
+        Gives an official string representation of the matrix.
+        """
+
+        m, n = self.get_size()
+        matrixString = \
+            "{} x {} SparseMatrix object with {} nonzeros and id of {}." \
+            .format(m, n, self.nonzeros(), str(id(self)))
+
+        return(matrixString)
+
+    def get_size(self):
+        """
+        Gives the size of the matrix.
+
+        Returns
+        -------
+            m : integer
+                number of rows in the matrix
+            n : integer
+                number of columns in the matrix
+        """
+
+        m, n = self.__m, self.__n
+
+        return(m, n)
+
+    def nonzeros(self):
+        """
+        Gives the number of stored nonzero elements.
+
+        Returns
+        -------
+            count : integer
+        """
+
+        return(len(self.data))
+
+    def get_value(self, row, column):
+        """
+        Gives the value of a specified element of the matrix.
+
+        Parameters
+        ----------
+            row : integer
+                row number of desired element
+            column : integer
+                column number of desired element
+
+        Returns
+        -------
+            value : integer/floating point number
+                value of the element at the given location
+        """
+
+        # Ensure arguments passed in are valid
+        assert isinstance(row, int) and isinstance(column, int), \
+            "Location must be an integer value."
+        m, n = self.get_size()
+        assert row > 0 and column > 0 and row <= m and column <= n, \
+            "Matrix must be defined at the given location."
+
+        # Binary search the sorted columns of the row
+        start, stop = self.indptr[row-1], self.indptr[row]
+        k = bisect_left(self.indices, column-1, start, stop)
+        if k < stop and self.indices[k] == column-1:
+            return(self.data[k])
+
+        return(0)
+
+    def transpose(self):
+        """
+        Produces the transpose of the matrix in O(nonzeros) time.
+
+        Returns
+        -------
+            newMatrix : object of class SparseMatrix
+                the transpose of the original matrix
+        """
+
+        m, n = self.get_size()
+
+        # Count the nonzeros of each column to find where its row starts
+        indptr = array("l", [0] * (n + 1))
+        for column in self.indices:
+            indptr[column+1] += 1
+        for j in range(n):
+            indptr[j+1] += indptr[j]
+
+        # Scatter each nonzero into its row of the transpose, which keeps
+        # the columns of the transpose sorted
+        position = array("l", indptr[:-1])
+        indices = array("l", [0] * len(self.data))
+        data = [0] * len(self.data)
+        for i in range(m):
+            for k in range(self.indptr[i], self.indptr[i+1]):
+                column = self.indices[k]
+                indices[position[column]] = i
+                data[position[column]] = self.data[k]
+                position[column] += 1
+
+        return(SparseMatrix._from_csr(n, m, indptr, indices, data))
+
+    def scalar_multiply(self, number):
+        """
+        Multiplies each element of the matrix by some scalar number.
+
+        Parameters
+        ----------
+            number : integer/floating point number
+                the scalar number for the matrix to be mutiplied by
+
+        Returns
+        -------
+            None, but updates the existing matrix
+        """
+
+        assert matrix.is_number(number), "Argument must be a number."
+
+        if number == 0:    # Every element becomes zero, so drop them all
+            self.indptr = array("l", [0] * (self.__m + 1))
+            self.indices = array("l")
+            self.data = []
+        else:
+            self.data = [i * number for i in self.data]
+
+        return
+
+    def _row(self, i):
+        """
+        Gives the nonzeros of a row (counted from zero) as (column, value)
+        pairs.
+        """
+
+        start, stop = self.indptr[i], self.indptr[i+1]
+
+        return(zip(self.indices[start:stop], self.data[start:stop]))
+
+    def matrix_add(self, otherMatrix):
+        """
+        Produces the resultant matrix from adding two matrices together.
+
+        Parameters
+        ----------
+            otherMatrix : object of class SparseMatrix or Matrix
+                the other matrix to be added to the active matrix
+
+        Returns
+        -------
+            newMatrix : object of class SparseMatrix or Matrix
+                the sum, sparse if both matrices are sparse and dense
+                otherwise
+        """
+
+        # Ensure argument is valid
+        assert isinstance(otherMatrix, (SparseMatrix, matrix.Matrix)), \
+            "Argument must be a matrix."
+        m1, n1 = self.get_size()
+        m2, n2 = otherMatrix.get_size()
+        assert m1 == m2 and n1 == n2, "Matrices must be the same size."
+
+        if isinstance(otherMatrix, matrix.Matrix):
+            # Only the nonzeros change the elements of the dense matrix
+            rows = [list(i) for i in otherMatrix._elements()]
+            for i in range(m1):
+                rowValues = rows[i]
+                for column, value in self._row(i):
+                    rowValues[column] += value
+            return(otherMatrix._new_like(rows))
+
+        rows = []
+        for i in range(m1):
+            rowValues = dict(self._row(i))
+            for column, value in otherMatrix._row(i):
+                rowValues[column] = rowValues.get(column, 0) + value
+            rows.append(rowValues)
+
+        return(SparseMatrix._from_rows(m1, n1, rows))
+
+    def matrix_multiply(self, otherMatrix):
+        """
+        Produces the resultant matrix from multiplying two matrices together,
+        (self * otherMatrix), touching only the nonzeros of this matrix.
+
+        Parameters
+        ----------
+            otherMatrix : object of class SparseMatrix or Matrix
+                the other matrix to be multiplied with the active matrix
+
+        Returns
+        -------
+            newMatrix : object of class SparseMatrix or Matrix
+                the product, sparse if both matrices are sparse and dense
+                otherwise
+        """
+
+        # Ensure argument is valid
+        assert isinstance(otherMatrix, (SparseMatrix, matrix.Matrix)), \
+            "Argument must be a matrix."
+        m1, n1 = self.get_size()
+        m2, n2 = otherMatrix.get_size()
+        assert n1 == m2, "Matrices must be of compatible size."
+
+        if isinstance(otherMatrix, matrix.Matrix):
+            # Each nonzero scales a whole row of the dense matrix
+            other = otherMatrix._elements()
+            rows = []
+            for i in range(m1):
+                rowValues = [0] * n2
+                for k, value in self._row(i):
+                    otherRow = other[k]
+                    for j in range(n2):
+                        rowValues[j] += value * otherRow[j]
+                rows.append(rowValues)
+            return(otherMatrix._new_like(rows))
+
+        # Row-by-row (Gustavson) product, accumulating each row in a dict
+        rows = []
+        for i in range(m1):
+            rowValues = {}
+            for k, value in self._row(i):
+                for j, otherValue in otherMatrix._row(k):
+                    rowValues[j] = rowValues.get(j, 0) + value * otherValue
+            rows.append(rowValues)
+
+        return(SparseMatrix._from_rows(m1, n2, rows))
+
+    def matvec(self, vector):
+        """
+        Multiplies the matrix by a vector in O(nonzeros) time.
+
+        Parameters
+        ----------
+            vector : list of integer/floating point numbers
+                the n elements of the vector
+
+        Returns
+        -------
+            result : list of integer/floating point numbers
+                the m elements of the product
+        """
+
+        m, n = self.get_size()
+        assert len(vector) == n, "Vector must have one element per column."
+
+        indptr, indices, data = self.indptr, self.indices, self.data
+        result = []
+        for i in range(m):
+            value = 0
+            for k in range(indptr[i], indptr[i+1]):
+                value += data[k] * vector[indices[k]]
+            result.append(value)
+
+        return(result)
@@ -4,8 +4,28 @@
 
 # Made by Isaac Joffe
 
+import io
+import itertools
+import json
+import os
+import pickle
+import sys
+import tempfile
 import unittest
+from fractions import Fraction
+import backends
+import matrix
 from matrix import Matrix
+from sparse import SparseMatrix
+from batch import MatrixBatch
+from lazy import lazy
+import parallel
+
+# The operation and iomodule packages live next to MatrixProgram and import
+# it as a package, so their matrices are made with advanced.matrix.Matrix
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import iomodule.Script as Script
+import operation.advanced as advanced
 
 
 class TestMatrix(unittest.TestCase):
@@ -19,6 +39,13 @@ class TestMatrix(unittest.TestCase):
             "\n12 13 14 15")
         self.assertEqual(str(C), "1 2 3")
         self.assertEqual(str(D), "1\n2\n3")
+        E = Matrix([[i*30 + j for j in range(30)] for i in range(30)])
+        lines = str(E).split("\n")
+        self.assertEqual(len(lines), 11)    # 5 rows, "...", 5 rows
+        self.assertEqual(lines[0].split(), ["0", "1", "2", "3", "4", "...",
+            "25", "26", "27", "28", "29"])
+        self.assertEqual(set(lines[5].split()), {"..."})
+        self.assertEqual(str(SparseMatrix.from_matrix(E)), str(E))
         return
 
     def test_size(self):
@@ -100,6 +127,456 @@ class TestMatrix(unittest.TestCase):
         self.assertEqual(str(E), str(F))
         return
 
+    def test_determinant(self):
+        A = Matrix([[1,2,3],[4,5,6],[7,8,9]])
+        B = Matrix([[2,0,1],[1,3,2],[1,1,2]])
+        C = Matrix([[0,1],[1,0]])
+        D = Matrix([[5]])
+        self.assertEqual(A.determinant(), 0)
+        self.assertAlmostEqual(B.determinant(), 6)
+        self.assertAlmostEqual(C.determinant(), -1)
+        self.assertAlmostEqual(D.determinant(), 5)
+        self.assertEqual(A.determinant(method="cofactor"), 0)
+        self.assertEqual(B.determinant(method="cofactor"), 6)
+        self.assertEqual(C.determinant(method="cofactor"), -1)
+        self.assertEqual(A.determinant(method="bareiss"), 0)
+        self.assertEqual(B.determinant(method="bareiss"), 6)
+        self.assertEqual(C.determinant(method="bareiss"), -1)
+        self.assertEqual(D.determinant(method="bareiss"), 5)
+        E = Matrix([[Fraction(1,2),1],[3,4]])
+        self.assertEqual(E.determinant(method="bareiss"), -1)
+        self.assertTrue(E.is_exact())
+        self.assertFalse(Matrix([[1.5]]).is_exact())
+        F = Matrix([[1e6,0],[0,1e-7]])    # Ill-scaled but not singular
+        self.assertAlmostEqual(F.determinant(), 0.1)
+        self.assertAlmostEqual(F.determinant(), F.determinant("bareiss"))
+        self.assertEqual(Matrix([[1e6,2e6],[1e-7,2e-7]]).determinant(), 0)
+        with self.assertRaises(AssertionError):
+            Matrix([[1,2,3]]).determinant()
+        with self.assertRaises(AssertionError):
+            B.determinant(method="magic")
+        return
+
+    def test_compact(self):
+        A = Matrix([[1,2,3],[4,5,6]], storage="compact")
+        B = Matrix([[1,2],[3,4],[5,6]], storage="compact")
+        self.assertEqual(A.storage, "compact")
+        self.assertEqual(A.get_size(), (2,3))
+        self.assertEqual(A.get_value(2,3), 6)
+        A.set_value(2,3,10)
+        self.assertEqual(A.get_value(2,3), 10)
+        self.assertEqual(A.values[1][2], 10)
+        self.assertEqual(str(A.matrix_multiply(B)),
+            str(Matrix([[22.0,28.0],[69.0,88.0]])))
+        self.assertEqual(str(A.transpose()),
+            str(Matrix([[1.0,4.0],[2.0,5.0],[3.0,10.0]])))
+        A.add_row([7,8,9])
+        A.add_column([0,0,0])
+        A.delete_row(1)
+        A.delete_column(1)
+        self.assertEqual(str(A), str(Matrix([[5.0,10.0,0.0],[8.0,9.0,0.0]])))
+        with self.assertRaises(AssertionError):
+            Matrix([[1,2]], storage="magic")
+        return
+
+    def test_validation(self):
+        A = Matrix([[1,2],[3,4]], validation="eager")
+        B = Matrix([[1,2],[3,4]])
+        C = Matrix([[1,2],[3,4]], validation="off")
+        self.assertEqual(A.validation, "eager")
+        self.assertEqual(B.validation, "on-construct")
+        self.assertEqual(B.matrix_add(B).validation, "on-construct")
+        A.values[0][0] = "hello world"
+        with self.assertRaises(AssertionError):
+            A.set_value(2,2,0)
+        with self.assertRaises(AssertionError):
+            B.set_value(1,1,"hello world")
+        C.set_value(1,1,2.5)
+        self.assertEqual(C.get_value(1,1), 2.5)
+        with self.assertRaises(AssertionError):
+            C.get_value(3,3)
+        with self.assertRaises(AssertionError):
+            Matrix([[1,2]], validation="magic")
+        return
+
+    def test_sparse(self):
+        A = SparseMatrix(3, 3, [(1,1,4), (2,3,-1), (3,2,2), (1,1,1)])
+        B = Matrix([[5,0,0],[0,0,-1],[0,2,0]])
+        self.assertEqual(A.nonzeros(), 3)
+        self.assertEqual(str(A), str(B))
+        self.assertEqual(A.get_value(1,1), 5)
+        self.assertEqual(A.get_value(1,2), 0)
+        self.assertEqual(str(SparseMatrix.from_matrix(B)), str(B))
+        self.assertEqual(str(A.transpose()), str(B.transpose()))
+        self.assertEqual(str(A.matrix_multiply(A)), str(B.matrix_multiply(B)))
+        self.assertEqual(str(A.matrix_multiply(B)), str(B.matrix_multiply(B)))
+        self.assertEqual(str(A.matrix_add(A)), str(B.matrix_add(B)))
+        self.assertEqual(A.matvec([1,2,3]), [5,-3,4])
+        with self.assertRaises(AssertionError):
+            SparseMatrix(2, 2, [(3,1,1)])
+        with self.assertRaises(AssertionError):
+            A.matrix_multiply(Matrix([[1,2]]))
+        return
+
+    def test_batch(self):
+        A = MatrixBatch([[[1,2],[3,4]], [[0,1],[1,0]]])
+        B = MatrixBatch([Matrix([[2,0,1],[1,3,2],[1,1,2]])] * 3)
+        self.assertEqual(A.get_shape(), (2,2,2))
+        self.assertEqual(A.determinant(), [-2.0, -1.0])
+        self.assertEqual(B.determinant(), [6.0, 6.0, 6.0])
+        self.assertEqual(str(A.matrix_multiply(A)[0]),
+            str(Matrix([[7.0,10.0],[15.0,22.0]])))
+        self.assertEqual(str(A.transpose()[0]), str(Matrix([[1.0,3.0],[2.0,4.0]])))
+        self.assertEqual(A.inverse()[1].values, [[0.0,1.0],[1.0,0.0]])
+        X = B.solve(Matrix([[1],[2],[3]]))[2]
+        self.assertEqual(str(X), str(Matrix([[-0.5],[-0.5],[2.0]])))
+        with self.assertRaises(AssertionError):
+            MatrixBatch([[[1,2],[2,4]]]).inverse()
+        with self.assertRaises(AssertionError):
+            MatrixBatch([[[1,2]], [[1],[2]]])
+        return
+
+    def test_lazy(self):
+        A = Matrix([[1,2],[3,4]])
+        B = Matrix([[4,3],[2,1]])
+        C = lazy(A).matrix_add(B).matrix_sub(A).scalar_multiply(2)
+        self.assertEqual(C.get_size(), (2,2))
+        self.assertEqual(str(C), str(Matrix([[8,6],[4,2]])))
+        self.assertEqual(C.get_value(1,1), 8)
+        D = lazy(A).matrix_multiply(B).scalar_add(1)
+        self.assertEqual(str(D.evaluate()), str(Matrix([[9,6],[21,14]])))
+        with self.assertRaises(AssertionError):
+            lazy(A).matrix_add(Matrix([[1,2]]))
+        E = lazy(A)
+        for i in range(1000):    # Split into passes of FUSION_DEPTH
+            E = E.matrix_add(B).scalar_add(-1)
+        self.assertEqual(E.values, [[3001,2002],[1003,4]])
+        E = lazy(A).scalar_multiply(1)
+        for i in range(60):    # Each node is compiled once, not 2^60 times
+            E = E.matrix_add(E)
+        self.assertEqual(E.values, [[2**60,2**61],[3*2**60,2**62]])
+        F = lazy(A).matrix_sub(B)
+        G = F.matrix_multiply(F).matrix_add(F).scalar_multiply(2)
+        self.assertEqual(G.values, [[10,-2],[2,22]])
+        self.assertEqual(F.evaluate().values, [[-3,-1],[1,3]])
+        return
+
+    def test_cache(self):
+        A = Matrix([[2,0,1],[1,3,2],[1,1,2]])
+        calls = []
+        value = A.memoize("key", lambda: calls.append(1) or 42)
+        self.assertEqual(A.memoize("key", lambda: calls.append(1) or 42), value)
+        self.assertEqual(len(calls), 1)
+        self.assertAlmostEqual(A.determinant(), 6)
+        version = A.version
+        A.set_value(3,3,1)
+        self.assertGreater(A.version, version)
+        self.assertAlmostEqual(A.determinant(), 0)
+        A.memoize("key", lambda: calls.append(1) or 42)
+        self.assertEqual(len(calls), 2)
+        B = A.copy()
+        B.set_value(1,1,0)
+        self.assertEqual(A.get_value(1,1), 2)
+        return
+
+    def test_views(self):
+        A = Matrix([[1,2,3],[4,5,6],[7,8,10]])
+        B = Matrix([[1,2,3],[4,5,6],[7,8,10]], storage="compact")
+        for M in (A, B):
+            self.assertEqual(M[1, 2], 6)
+            self.assertEqual(M[0:2, 1:].values, [[2,3],[5,6]])
+            self.assertEqual(M[:, 0].values, [[1],[4],[7]])
+            self.assertEqual(M.T.values, [[1,4,7],[2,5,8],[3,6,10]])
+            self.assertEqual(M.T[::2, 1:].values, [[4,7],[6,10]])
+            self.assertEqual(M.view_minor(2, 2).values, [[1,3],[7,10]])
+            self.assertTrue(M.T.is_view)
+            self.assertEqual(M.T.storage, M.storage)
+            self.assertAlmostEqual(M.view_minor(1, 1).determinant(), 2)
+            self.assertEqual(M[1:, :2].matrix_multiply(M.T[:2, 1:]).values,
+                [[41,68],[68,113]])
+        V = A[1:]
+        V.set_value(1, 1, 100)    # Writing copies the view
+        self.assertFalse(V.is_view)
+        self.assertEqual(A.get_value(2, 1), 4)
+        self.assertEqual(V.values, [[100,5,6],[7,8,10]])
+        W = B.T
+        B.scalar_multiply(2)    # Writing the parent detaches its views
+        self.assertEqual(W.values, [[1,4,7],[2,5,8],[3,6,10]])
+        self.assertEqual(B.T.values, [[2,8,14],[4,10,16],[6,12,20]])
+        self.assertRaises(IndexError, lambda: A[3, 0])
+        for M in (A, B):
+            # Writes through .values of a view copy it and empty its cache
+            V = M[0:2, 0:2]
+            first = V.determinant()
+            V.values[0][0] = 100
+            self.assertEqual(V.determinant(), 100*V.get_value(2, 2) - \
+                V.get_value(1, 2)*V.get_value(2, 1))
+            self.assertNotEqual(V.determinant(), first)
+            V = M[0:2, 0:2]
+            V.determinant()
+            V.values[1] = [0, 0]
+            self.assertEqual(V.determinant(), 0)
+            self.assertNotEqual(M.get_value(2, 1), 0)
+        C = Matrix([[1,2],[3,4]], storage="compact")
+        W = C.T
+        self.assertEqual(C.determinant(), -2)
+        C.values[0][1] = 50    # Detaches W and empties the cache of C
+        self.assertEqual(W.values, [[1,3],[2,4]])
+        self.assertEqual(C.determinant(), 4 - 150)
+        W = C.T
+        C.values[0:2] = [[5,6],[7,8]]
+        self.assertEqual(C.values, [[5,6],[7,8]])
+        self.assertEqual(W.values, [[1,3],[50,4]])
+        self.assertAlmostEqual(C.determinant(), 40 - 42)
+        with self.assertRaises(AssertionError):
+            C.values[0:2] = [[1,2]]
+        B = Matrix([[1,2],[3,4]])    # The same through list storage
+        W = B.T
+        self.assertAlmostEqual(B.determinant(), -2)
+        B.values[0][0] = 10
+        self.assertAlmostEqual(B.determinant(), 34)
+        self.assertEqual(W.values, [[1,3],[2,4]])
+        W = B[:, 1]
+        B.values[1] = [5, 6]
+        B.values[0][-1:] = [7]
+        self.assertEqual(B.values, [[10,7],[5,6]])
+        self.assertEqual(W.values, [[2],[4]])
+        self.assertAlmostEqual(B.determinant(), 60 - 35)
+        with self.assertRaises(AssertionError):
+            B.values[0][0:] = [1]
+        self.assertRaises(IndexError, lambda: B.values[2])
+        return
+
+    def test_operators(self):
+        A = Matrix([[1,2],[3,4]])
+        B = Matrix([[0,1],[1,0]], storage="compact")
+        self.assertEqual((A + B).values, [[1,3],[4,4]])
+        self.assertEqual((A - B).values, [[1,1],[2,4]])
+        self.assertEqual((A @ B).values, [[2,1],[4,3]])
+        self.assertEqual((A * B).values, (A @ B).values)
+        self.assertEqual((2 * A).values, [[2,4],[6,8]])
+        self.assertEqual((1 - A).values, [[0,-1],[-2,-3]])
+        self.assertEqual(A.values, [[1,2],[3,4]])    # Unchanged by operators
+        rows = A.values[0]
+        A += B
+        A *= B
+        self.assertEqual(A.values, [[3,1],[4,4]])
+        self.assertEqual(rows, [3,1])    # Still reads the first row
+        C = Matrix([[0,0],[0,0]])
+        self.assertIs(A.matrix_multiply(A, out=C), C)
+        self.assertEqual(C.values, [[13,7],[28,20]])
+        A.matrix_sub(A, out=A)
+        self.assertEqual(A.values, [[0,0],[0,0]])
+        self.assertRaises(AssertionError, lambda: B.matrix_add(B,
+            out=Matrix([[0]])))
+        self.assertRaises(TypeError, lambda: A + "1")
+        return
+
+    def test_save(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "a.mat")
+            for values in ([[1,2],[3,4]], [[1.5,2.0]], [[Fraction(1,3)],[2]]):
+                Matrix(values).save(path)
+                for mapped in (True, False):
+                    A = Matrix.load(path, mmap=mapped)
+                    self.assertEqual(A.values, values)
+                    self.assertEqual(type(A.get_value(1, 1)),
+                        type(values[0][0]))
+            Matrix([[1.0,2.0],[3.0,4.0]]).save(path)
+            A = Matrix.load(path)
+            self.assertEqual(A.storage, "compact")
+            A.scalar_add(1)    # Copies the mapped file, leaving it unchanged
+            self.assertEqual(A.values, [[2,3],[4,5]])
+            self.assertEqual(Matrix.load(path, verify=True).values,
+                [[1,2],[3,4]])
+            B = Matrix.load(path)
+            W = B.T
+            B.values[0][0] = 9    # Writes through .values copy the file too
+            B.values[1] = [7, 8]
+            self.assertEqual(B.values, [[9,2],[7,8]])
+            self.assertEqual(W.values, [[1,3],[2,4]])
+            self.assertEqual(Matrix.load(path).values, [[1,2],[3,4]])
+            del B, W
+            with open(path, "r+b") as file:
+                file.seek(-1, os.SEEK_END)
+                file.write(b"\x01")
+            self.assertRaises(AssertionError, Matrix.load, path, False)
+            self.assertRaises(AssertionError, Matrix([[2**64]]).save, path)
+            del A
+        return
+
+    def test_pickle(self):
+        for storage in ("list", "compact"):
+            A = Matrix([[1,2,3],[4,5,6]], storage=storage,
+                validation="eager")
+            W = A.T    # Views and cached results are not pickled
+            A.memoize("key", lambda: 1)
+            for M, values in ((A, [[1,2,3],[4,5,6]]),
+                    (W, [[1,4],[2,5],[3,6]]), (A[0, 1:], [[2,3]])):
+                B = pickle.loads(pickle.dumps(M))
+                self.assertEqual(B.values, values)
+                self.assertEqual(B.storage, storage)
+                self.assertEqual(B.validation, "eager")
+                self.assertFalse(B.is_view)
+                B.set_value(1, 1, 0)    # Independent of the original
+                self.assertEqual(M.values, values)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "a.mat")
+            Matrix([[1.0,2.0]]).save(path)
+            A = Matrix.load(path)
+            B = pickle.loads(pickle.dumps(A))
+            del A
+        self.assertEqual(B.values, [[1,2]])
+        return
+
+    def test_from_text(self):
+        text = "1 2 3\n\n# comment\n4 5.5 1/3\n"
+        A = Matrix.from_text(io.StringIO(text))
+        self.assertEqual(A.values, [[1,2,3],[4,5.5,Fraction(1,3)]])
+        self.assertIsInstance(A.get_value(1, 1), int)
+        B = Matrix.from_text(["1,2\n", "3, 4\n"], delimiter=",",
+            storage="compact")
+        self.assertEqual(B.storage, "compact")
+        self.assertEqual(B.values, [[1.0,2.0],[3.0,4.0]])
+        self.assertRaises(AssertionError, Matrix.from_text, ["1 2", "3"])
+        self.assertRaises(AssertionError, Matrix.from_text, ["1 x"])
+        self.assertRaises(AssertionError, Matrix.from_text, [])
+        self.assertEqual([matrix.parse_number(i) for i in ("2", "0.1",
+            "-1/3", "4/2")], [2, 0.1, Fraction(-1,3), 2])
+        self.assertIs(type(matrix.parse_number("0.5")), float)
+        self.assertIs(type(matrix.parse_number("4/2")), int)
+        self.assertRaises(ValueError, matrix.parse_number, "x")
+        return
+
+    def test_profile(self):
+        A = Matrix([[4,3,2],[1,5,7],[2,8,1]], validation="eager")
+        determinant = Matrix.determinant
+        with matrix.profile() as p:
+            A.determinant()
+            A.set_value(1, 1, 6)
+            A.matrix_multiply(A).copy()
+            self.assertRaises(AssertionError, matrix.profile().__enter__)
+        self.assertIs(Matrix.determinant, determinant)    # Restored
+        operations = p.operations
+        self.assertEqual(operations["Matrix.determinant"]["calls"], 1)
+        self.assertGreater(operations["Matrix.determinant"]["flops"], 0)
+        self.assertEqual(operations["Matrix.set_value"]["validations"], 1)
+        self.assertEqual(operations["Matrix.matrix_multiply"]["flops"], 54)
+        self.assertEqual(operations["Matrix.copy"]["copies"], 1)
+        self.assertEqual(operations["Matrix.copy"]["allocations"], 1)
+        self.assertIn("Matrix.determinant", p.report())
+        for name in ("get_size", "memoize", "mark_modified"):    # Helpers
+            self.assertNotIn("Matrix." + name, operations)
+        self.assertEqual(set(operations), {"Matrix.determinant",
+            "Matrix.set_value", "Matrix.check_validity",
+            "Matrix.matrix_multiply", "Matrix.copy"})
+        self.assertEqual(json.loads(p.report("json"))["operations"],
+            operations)
+        return
+
+    def test_parallel(self):
+        floats = Matrix([[i*0.37 - j*1.1 for j in range(5)] for i in range(4)])
+        ints = Matrix([[2**60 + i + j for j in range(4)] for i in range(4)])
+        fractions = Matrix([[Fraction(i+1, j+2) for j in range(3)]
+            for i in range(3)])
+        try:
+            for A in (floats, ints, fractions):
+                B = A.transpose()
+                serial = A.matrix_multiply(B)
+                result = parallel.parallel_multiply(A, B, workers=2,
+                    threshold=0)
+                self.assertEqual(result.values, serial.values)
+                self.assertEqual([type(j) for i in result.values for j in i],
+                    [type(j) for i in serial.values for j in i])
+        finally:
+            parallel.shutdown()
+        return
+
+    def test_backends(self):
+        class Recording:
+            def __init__(self):
+                self.calls = []
+            def accepts(self, *matrices):
+                return(all(isinstance(j, float) for i in matrices
+                    for k in i.values for j in k))
+            def det(self, a):
+                self.calls.append("det")
+                return(42)
+            def matmul(self, a, b):
+                self.calls.append("matmul")
+                return([[0] * b.get_size()[1]] * a.get_size()[0])
+
+        self.assertIn("python", backends.available_backends())
+        self.assertIs(backends.get_backend(), backends.get_backend("python"))
+        self.assertRaises(AssertionError, backends.get_backend, "missing")
+        self.assertRaises(AssertionError, backends.set_backend, "missing")
+        self.assertRaises(AssertionError, Matrix, [[1]], backend="missing")
+        recording = Recording()
+        backends.register_backend("recording", recording)
+        self.assertIs(backends.get_backend("recording"), recording)
+
+        A = Matrix([[1.0,2.0],[3.0,4.0]], backend="recording")
+        B = Matrix([[1.0,2.0],[3.0,4.0]])
+        self.assertEqual(A.backend, "recording")
+        self.assertEqual(A.determinant(), 42)
+        self.assertEqual(A.matrix_multiply(B).values, [[0,0],[0,0]])
+        self.assertEqual(A.matrix_add(B).values, [[2,4],[6,8]])    # No kernel
+        self.assertAlmostEqual(B.determinant(), -2)    # Own backend
+        self.assertEqual(recording.calls, ["det", "matmul"])
+        # Operands the backend does not accept stay in pure Python
+        C = Matrix([[1,2],[3,Fraction(1,2)]], backend="recording")
+        self.assertEqual(C.matrix_multiply(C).values,
+            [[7,3],[Fraction(9,2),Fraction(25,4)]])
+        self.assertEqual(A.matrix_multiply(C).values,
+            [[7,3],[15,8]])
+        self.assertEqual(recording.calls, ["det", "matmul"])
+
+        backends.set_backend("recording")    # Global default
+        try:
+            self.assertEqual(Matrix([[2.0]]).determinant(), 42)
+            self.assertAlmostEqual(Matrix([[2.0]], backend="python")
+                .determinant(), 2)
+        finally:
+            backends.set_backend("python")
+        self.assertAlmostEqual(Matrix([[2.0]]).determinant(), 2)
+        return
+
+    @unittest.skipIf(backends.numpy is None, "NumPy is not installed.")
+    def test_numpy(self):
+        self.assertIn("numpy", backends.available_backends())
+        rows = [[2.0,0.0,1.0],[1.0,3.0,2.0],[1.0,1.0,2.0]]
+        for storage in ("list", "compact"):
+            A = Matrix(rows, storage=storage, backend="numpy")
+            P = Matrix(rows, storage=storage)
+            for M, N in ((A.matrix_multiply(A), P.matrix_multiply(P)),
+                    (A.matrix_add(A), P.matrix_add(P)),
+                    (A.matrix_sub(P), P.matrix_sub(P)),
+                    (A.transpose(), P.transpose()), (A.T.matrix_add(A),
+                    P.T.matrix_add(P))):
+                for i, j in zip(M.values, N.values):
+                    for x, y in zip(i, j):
+                        self.assertAlmostEqual(x, y)
+            self.assertAlmostEqual(A.determinant(), 6)
+            M = advanced.matrix.Matrix(rows, storage=storage,
+                backend="numpy")
+            identity = advanced.inverse(M).matrix_multiply(M)
+            for i in range(3):
+                for j in range(3):
+                    self.assertAlmostEqual(identity.get_value(i+1, j+1),
+                        float(i == j))
+            x = advanced.solve(M, advanced.matrix.Matrix([[3.0],[6],[4]]))
+            for i, value in enumerate([1, 1, 1]):
+                self.assertAlmostEqual(x.get_value(i+1, 1), value)
+
+        # Integer and rational matrices are not converted to float64
+        A = Matrix([[2**60 + 1, 1],[0, Fraction(1,3)]], backend="numpy")
+        self.assertEqual(A.matrix_multiply(A).values,
+            [[(2**60 + 1)**2, 2**60 + 1 + Fraction(1,3)],[0,Fraction(1,9)]])
+        self.assertEqual(A.matrix_add(A).values,
+            [[2**61 + 2, 2],[0, Fraction(2,3)]])
+        self.assertIs(type(A.transpose().get_value(1, 1)), int)
+        return
+
     def test_errors(self):
         A = Matrix([[1,2,3],[4,5,6],[7,8,9]])
         with self.assertRaises(AssertionError):
@@ -177,5 +654,344 @@ class TestMatrix(unittest.TestCase):
         return
 
 
+class TestAdvanced(unittest.TestCase):
+    def assertMatrixAlmostEqual(self, A, B, places=7):
+        self.assertEqual(A.get_size(), B.get_size())
+        for i, j in zip(A.values, B.values):
+            for x, y in zip(i, j):
+                self.assertAlmostEqual(x, y, places=places)
+        return
+
+    def test_inverse(self):
+        M = advanced.matrix.Matrix
+        A = M([[2,0,1],[1,3,2],[1,1,2]])
+        I = M([[1,0,0],[0,1,0],[0,0,1]])
+        for method in ("gauss-jordan", "adjugate"):
+            self.assertMatrixAlmostEqual(
+                A.matrix_multiply(advanced.inverse(A, method=method)), I)
+            exact = advanced.inverse(A, method=method, exact=True)
+            self.assertEqual(A.matrix_multiply(exact).values, I.values)
+            self.assertEqual(exact.get_value(1, 1), Fraction(2, 3))
+            self.assertEqual(exact.get_value(1, 2), Fraction(1, 6))
+            # Whole entries are integers, as in the other exact results
+            exact = advanced.inverse(M([[2,1],[1,1]]), method=method,
+                exact=True)
+            self.assertEqual(exact.values, [[1,-1],[-1,2]])
+            for row in exact.values:
+                for x in row:
+                    self.assertIs(type(x), int)
+            for singular in (M([[1,2],[2,4]]), M([[0,0],[0,0]])):
+                with self.assertRaises(AssertionError):
+                    advanced.inverse(singular, method=method)
+                with self.assertRaises(AssertionError):
+                    advanced.inverse(singular, method=method, exact=True)
+        # Ill-scaled but not singular
+        B = M([[1e6,0],[0,1e-7]])
+        self.assertMatrixAlmostEqual(advanced.inverse(B),
+            M([[1e-6,0],[0,1e7]]))
+        return
+
+    def test_solve(self):
+        M = advanced.matrix.Matrix
+        A = M([[2,0,1],[1,3,2],[1,1,2]])
+        X = M([[1,-2],[0,4],[3,0.5]])
+        B = A.matrix_multiply(X)    # Two right-hand sides at once
+        self.assertMatrixAlmostEqual(advanced.solve(A, B), X)
+        x = advanced.solve(A, M([[5],[7],[7]]), exact=True)
+        self.assertEqual(x.values, [[1],[0],[3]])
+        self.assertEqual([type(row[0]) for row in x.values], [int] * 3)
+        x = advanced.solve(A, M([[1],[0],[0]]), exact=True)
+        self.assertEqual(x.values, [[Fraction(2,3)],[0],[Fraction(-1,3)]])
+        self.assertEqual([type(row[0]) for row in x.values],
+            [Fraction, int, Fraction])
+        factors = advanced.factorize(A)
+        self.assertAlmostEqual(factors.determinant(), 6)
+        self.assertMatrixAlmostEqual(factors.solve(B), X)
+        with self.assertRaises(TypeError):    # Shared, so read-only
+            factors.lu[0][0] = 0
+        with self.assertRaises(TypeError):
+            factors.perm[0] = 1
+        self.assertMatrixAlmostEqual(advanced.factorize(A).solve(B), X)
+        self.assertAlmostEqual(advanced.factorize(A).determinant(), 6)
+        A.set_value(1, 1, 4)    # A change discards the factorization
+        self.assertIsNot(advanced.factorize(A), factors)
+        self.assertAlmostEqual(advanced.factorize(A).determinant(), 14)
+        with self.assertRaises(AssertionError):
+            advanced.solve(M([[1,2],[2,4]]), M([[1],[2]]))
+        with self.assertRaises(AssertionError):
+            advanced.solve(A, M([[1],[2]]))
+        return
+
+    def test_row_operations(self):
+        M = advanced.matrix.Matrix
+        rows = [[1,2],[3,4]]
+        operations = [
+            (lambda A, **k: advanced.swap_rows(A, 0, 1, **k), [[3,4],[1,2]]),
+            (lambda A, **k: advanced.scale_row(A, 1, 2, **k), [[1,2],[6,8]]),
+            (lambda A, **k: advanced.add_multiple_times_row(A, 1, 0, -3,
+                **k), [[1,2],[0,-2]])]
+        for (operation, expected), storage in itertools.product(operations,
+                ("list", "compact")):
+            A = M([row[:] for row in rows], storage=storage)
+            B = operation(A)
+            self.assertIsNot(B, A)
+            self.assertEqual(B.values, expected)
+            self.assertEqual(A.values, rows)    # Left untouched
+            A.determinant()
+            W = A.T
+            C = operation(A, inplace=True)
+            self.assertIs(C, A)
+            self.assertEqual(A.values, expected)
+            self.assertEqual(W.values, [[1,3],[2,4]])    # Views keep theirs
+            self.assertAlmostEqual(A.determinant(), B.determinant())
+        return
+
+    def test_iterative(self):
+        # Tridiagonal, symmetric and strictly diagonally dominant
+        A = advanced.matrix.Matrix([[4,-1,0,0],[-1,4,-1,0],[0,-1,4,-1],
+            [0,0,-1,4]])
+        S = advanced.sparse.SparseMatrix.from_matrix(A)
+        rows = [list(map(float, row)) for row in A.values]
+        operator = lambda x: [sum(a * b for a, b in zip(row, x))
+            for row in rows]
+        x = [1, 2, -1, 0.5]
+        b = operator(x)
+
+        def check(solution, iterations=None):
+            self.assertTrue(solution.converged)
+            self.assertLessEqual(solution.residuals[-1], 1e-8)
+            self.assertEqual(solution.iterations,
+                len(solution.residuals) - 1)
+            if iterations is not None:
+                self.assertEqual(solution.iterations, iterations)
+            for i, value in enumerate(x):
+                self.assertAlmostEqual(solution.x.get_value(i + 1, 1), value)
+            return
+
+        for a in (A, S, operator):
+            check(advanced.conjugate_gradient(a, b))
+            check(advanced.gmres(a, b))
+            check(advanced.gmres(a, b, restart=2))
+            check(advanced.jacobi(a, b, diagonal=[4.0] * 4
+                if a is operator else None))
+        for a in (A, S):
+            check(advanced.gauss_seidel(a, advanced.matrix.Matrix(
+                [[i] for i in b])))
+            for solve in (advanced.conjugate_gradient, advanced.gmres):
+                check(solve(a, b, preconditioner="jacobi"))
+                # ILU(0) of a tridiagonal matrix is its exact LU
+                check(solve(a, b, preconditioner="ilu0"), 1)
+                check(solve(a, b, preconditioner=lambda r: [i / 4
+                    for i in r]))
+        self.assertRaises(AssertionError, advanced.gauss_seidel, operator, b)
+        self.assertRaises(AssertionError, advanced.jacobi, operator, b)
+        self.assertRaises(AssertionError, advanced.conjugate_gradient, A, b,
+            preconditioner="ssor")
+
+        # ILU(0) keeps the sparsity pattern, dropping the fill-in of LU
+        lower, diagonal, upper = advanced._ilu0(advanced._entries(
+            advanced.matrix.Matrix([[4,1,1],[1,4,0],[1,0,4]])))
+        self.assertEqual(lower, [[], [(0, 0.25)], [(0, 0.25)]])
+        self.assertEqual(diagonal, [4, 3.75, 3.75])
+        self.assertEqual(upper, [[(1, 1), (2, 1)], [], []])
+        self.assertEqual(advanced._ilu0_solve((lower, diagonal, upper),
+            [4, 1, 1]), [1, 0, 0])
+
+        # Iterations stop at max_iter, reporting that they did not converge
+        diverging = advanced.jacobi(advanced.matrix.Matrix([[1,3],[3,1]]),
+            [1, 1], max_iter=20)    # Not diagonally dominant
+        self.assertGreater(diverging.residuals[-1], 1)
+        for solution, iterations in ((advanced.jacobi(A, b, max_iter=2), 2),
+                (advanced.conjugate_gradient(A, b, max_iter=1), 1),
+                (advanced.gmres(A, b, max_iter=2, restart=1), 2),
+                (diverging, 20)):
+            self.assertFalse(solution.converged)
+            self.assertEqual(solution.iterations, iterations)
+            self.assertEqual(len(solution.residuals), iterations + 1)
+            self.assertGreater(solution.residuals[-1], 1e-8)
+
+        # A zero right-hand side is solved by zero without iterating
+        for solve in (advanced.conjugate_gradient, advanced.jacobi,
+                advanced.gauss_seidel, advanced.gmres):
+            solution = solve(A, [0, 0, 0, 0], x0=[1, 1, 1, 1])
+            self.assertTrue(solution.converged)
+            self.assertEqual(solution.iterations, 0)
+            self.assertEqual(solution.x.values, [[0.0]] * 4)
+        return
+
+    def test_adjoint(self):
+        def expansion(rows):
+            # adj(A)[i][j] is the (j, i) cofactor, by cofactor expansion
+            A = advanced.matrix.Matrix(rows)
+            n = len(rows)
+            return [[(-1) ** (i + j) * advanced.minor(A, j, i).determinant(
+                method="cofactor") for j in range(n)] for i in range(n)]
+
+        examples = (
+            [[2,0,1],[1,3,2],[1,1,2]],    # Full rank
+            [[Fraction(1,2),2,0],[1,Fraction(-1,3),4],[0,5,1]],
+            [[1,2,3],[4,5,6],[7,8,9]],    # Rank n - 1
+            [[0,1,2,3],[1,0,1,2],[2,1,0,1],[3,3,3,6]],
+            [[0,0],[0,3]],
+            [[1,2,3],[2,4,6],[3,6,9]],    # Rank n - 2, adjoint is zero
+            [[1,2,0,1],[2,4,0,2],[0,0,1,1],[1,2,1,2]])
+        for rows in examples:
+            expected = expansion([[Fraction(x) for x in row]
+                for row in rows])
+            for convert in (float, Fraction):
+                A = advanced.matrix.Matrix([[convert(x) for x in row]
+                    for row in rows])
+                if convert is Fraction:
+                    self.assertEqual(advanced.adjoint(A, exact=True)
+                        .values, expected)
+                self.assertMatrixAlmostEqual(advanced.adjoint(A, exact=True),
+                    advanced.matrix.Matrix(expected))
+                self.assertMatrixAlmostEqual(advanced.adjoint(A),
+                    advanced.matrix.Matrix(expected))
+                self.assertMatrixAlmostEqual(advanced.cofactor(A),
+                    advanced.matrix.Matrix(expected).transpose())
+        self.assertEqual(advanced.adjoint(advanced.matrix.Matrix([[5]]))
+            .values, [[1]])
+        return
+
+    def test_chain(self):
+        plan = advanced.chain_plan([(10,30), (30,5), (5,60)])
+        self.assertEqual(plan.order, "((M1 M2) M3)")
+        self.assertEqual(plan.flops, 2 * (10*30*5 + 10*5*60))
+        self.assertEqual(plan.naive_flops, 9000)
+        plan = advanced.chain_plan([(5,10), (10,100), (100,2)])
+        self.assertEqual(plan.order, "(M1 (M2 M3))")
+        self.assertEqual(plan.flops, 2 * (10*100*2 + 5*10*2))
+        self.assertEqual(plan.naive_flops, 2 * (5*10*100 + 5*100*2))
+        plan = advanced.chain_plan([(3,4)])
+        self.assertEqual((plan.order, plan.flops), ("M1", 0))
+        self.assertRaises(AssertionError, advanced.chain_plan,
+            [(2,3), (2,3)])
+
+        for shapes in ([(10,30), (30,5), (5,60)], [(5,10), (10,100), (100,2)],
+                [(4,1), (1,6), (6,3), (3,1), (1,5)]):
+            matrices = [advanced.matrix.Matrix([[(i * 7 + j * 3 + k) % 5 - 2
+                for j in range(n)] for i in range(m)])
+                for k, (m, n) in enumerate(shapes)]
+            expected = matrices[0]
+            for i in matrices[1:]:    # Left to right
+                expected = expected.matrix_multiply(i)
+            result, plan = advanced.multi_multiply(matrices,
+                return_plan=True)
+            self.assertEqual(result.values, expected.values)
+            self.assertEqual(plan.order, advanced.chain_plan(shapes).order)
+            self.assertEqual(advanced.multi_multiply(matrices).values,
+                expected.values)
+        self.assertIs(advanced.multi_multiply([matrices[0]]), matrices[0])
+        return
+
+    def test_reduced_row_echelon(self):
+        M = advanced.matrix.Matrix
+        R = advanced.reduced_row_echelon(M([[2,4,2],[1,3,4],[3,7,6]]),
+            exact=True)
+        self.assertEqual(R.values, [[1,0,-5],[0,1,3],[0,0,0]])
+        for row in R.values:
+            for x in row:
+                self.assertIs(type(x), int)    # Not Fraction(1, 1)
+        R = advanced.reduced_row_echelon(M([[3,1],[0,2]]), exact=True)
+        self.assertEqual(R.values, [[1,0],[0,1]])
+        R = advanced.reduced_row_echelon(M([[2,1,1],[0,3,1]]), exact=True)
+        self.assertEqual(R.values, [[1,0,Fraction(1,3)],[0,1,Fraction(1,3)]])
+        self.assertEqual([type(x) for x in R.values[0]],
+            [int, int, Fraction])
+        self.assertMatrixAlmostEqual(advanced.reduced_row_echelon(
+            M([[2.0,1,1],[0,3,1]])), R)
+        return
+
+
+class TestScript(unittest.TestCase):
+    def run_script(self, lines, **options):
+        # Gives the exit status and the records written for the lines
+        output = io.StringIO()
+        status = Script.runScript(lines, output=output, **options)
+        return(status, [json.loads(i) for i in output.getvalue()
+            .splitlines()])
+
+    def test_parse(self):
+        self.assertIsNone(Script.parseCommand("   # Only a comment"))
+        self.assertEqual(Script.parseCommand("C = MUL A B  # Product"),
+            ("C", "mul", ["A", "B"]))
+        self.assertEqual(Script.parseCommand("create A 1, 2; 3 4"),
+            (None, "create", ["A", "1,", "2;", "3", "4"]))
+        for line in ("frobnicate A", "det", "det A B", "C =", "create A"):
+            self.assertRaises(AssertionError, Script.parseCommand, line)
+        self.assertRaises(ValueError, Script.parseCommand, 'load A "a.mat')
+        return
+
+    def test_run(self):
+        lines = ["# Solve a small system", "create A 2 1; 1 1",
+            "create B 1; 2", "", "det A", "X = solve A B", "show X",
+            "inv A", "C = mul A X", "show C", "create F 1/2 0; 0 0.5",
+            "inv F", "det F"]
+        for trace in (True, False):
+            status, records = self.run_script(lines, trace_memory=trace)
+            self.assertEqual(status, 0)
+            self.assertEqual([i["line"] for i in records],
+                [2, 3, 5, 6, 7, 8, 9, 10, 11, 12, 13])
+            self.assertTrue(all(i["status"] == "ok" for i in records))
+            results = {i["command"]: i["result"] for i in records}
+            self.assertEqual(results["create A 2 1; 1 1"], None)
+            self.assertEqual(results["det A"], 1)
+            self.assertEqual(results["X = solve A B"],
+                {"matrix": "X", "size": [2, 1]})
+            self.assertEqual(results["show X"],
+                {"size": [2, 1], "values": [[-1], [3]]})
+            self.assertEqual(results["inv A"]["values"], [[1, -1], [-1, 2]])
+            self.assertEqual(results["show C"]["values"], [[1], [2]])
+            # Fractions are written as strings, floats stay floats
+            self.assertEqual(results["inv F"]["values"], [[2, 0], [0, 2.0]])
+            self.assertEqual(results["det F"], 0.25)
+            for i in records:
+                self.assertGreaterEqual(i["seconds"], 0)
+                if trace:
+                    self.assertGreaterEqual(i["peak_bytes"], 0)
+                else:
+                    self.assertIsNone(i["peak_bytes"])
+        status, records = self.run_script(["create A 1 2; 3 5",
+            "create B 1/3", "show B", "inv A"], trace_memory=False)
+        self.assertEqual(records[2]["result"]["values"], [["1/3"]])
+        self.assertEqual(records[3]["result"]["values"], [[-5, 2], [3, -1]])
+
+        with tempfile.TemporaryDirectory() as directory:
+            status, records = self.run_script(["create A 1 2; 3 4.5",
+                "save A {}".format(os.path.join(directory, "a.mat")),
+                "save A {}".format(os.path.join(directory, "a.csv")),
+                "load B {}".format(os.path.join(directory, "a.mat")),
+                "load C {}".format(os.path.join(directory, "a.csv")),
+                "show B", "show C"], trace_memory=False)
+            self.assertEqual(status, 0)
+            self.assertEqual(records[-2]["result"]["values"],
+                [[1, 2], [3, 4.5]])
+            self.assertEqual(records[-1]["result"], records[-2]["result"])
+        return
+
+    def test_errors(self):
+        # Every script stops at its failing line, exiting with 1
+        scripts = (
+            (["create A 1", "frobnicate A", "show A"], 'Unknown command'),
+            (["create A 1", 'load B "a.mat', "show A"], 'quotation'),
+            (["create A 1", "det A B", "show A"], 'takes 1 argument'),
+            (["create A 1", "X = det A", "show A"], 'does not give a matrix'),
+            (["create A 1", "show Z", "show A"], 'does not exist'),
+            (["create A 1", "create B 1 x", "show A"], ''),
+            (["create A 1 2; 2 4", "inv A", "show A"], 'not invertible'))
+        for lines, message in scripts:
+            status, records = self.run_script(lines, trace_memory=False)
+            self.assertEqual(status, 1)
+            self.assertEqual(len(records), 2)
+            self.assertEqual(records[0]["status"], "ok")
+            self.assertEqual(records[1]["line"], 2)
+            self.assertEqual(records[1]["command"], lines[1])
+            self.assertEqual(records[1]["status"], "error")
+            self.assertIn(message, records[1]["error"])
+            self.assertNotIn("result", records[1])
+        return
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,126 @@
+"""
+Seeded generators of the test matrices used by the benchmark suite.
+
+Every generator takes a random.Random and a size n and gives the rows of an
+n x n matrix, so that the same seed always gives the same matrices. All of
+them are invertible, so that every operation of the suite can run on them.
+"""
+
+import random
+
+
+def dense(rng: random.Random, n: int) -> list:
+    '''
+    A matrix of uniform random floats in [-1, 1).
+
+    args:
+        rng: The random number generator.
+        n: The number of rows and columns.
+
+    returns:
+        The rows of the matrix.
+    '''
+    return [[rng.uniform(-1, 1) for _ in range(n)] for _ in range(n)]
+
+
+def sparse(rng: random.Random, n: int, density: float = 0.1) -> list:
+    '''
+    A matrix with about density of its off-diagonal elements non-zero, and a
+    dominant diagonal so that it is invertible.
+
+    args:
+        rng: The random number generator.
+        n: The number of rows and columns.
+        density: The fraction of non-zero off-diagonal elements.
+
+    returns:
+        The rows of the matrix.
+    '''
+    rows = [[rng.uniform(-1, 1) if i != j and rng.random() < density else 0.0 for j in range(n)]
+            for i in range(n)]
+    for i in range(n):
+        rows[i][i] = 1 + sum(abs(x) for x in rows[i])
+
+    return rows
+
+
+def spd(rng: random.Random, n: int) -> list:
+    '''
+    A symmetric positive definite matrix, B * B^T + n * I for a dense B.
+
+    args:
+        rng: The random number generator.
+        n: The number of rows and columns.
+
+    returns:
+        The rows of the matrix.
+    '''
+    b = dense(rng, n)
+    rows = [[sum(x * y for x, y in zip(b[i], b[j])) for j in range(n)] for i in range(n)]
+    for i in range(n):
+        rows[i][i] += n
+
+    return rows
+
+
+def triangular(rng: random.Random, n: int) -> list:
+    '''
+    An upper triangular matrix with diagonal elements in [1, 2).
+
+    args:
+        rng: The random number generator.
+        n: The number of rows and columns.
+
+    returns:
+        The rows of the matrix.
+    '''
+    return [[0.0 if j < i else 1 + rng.random() if j == i else rng.uniform(-1, 1) for j in range(n)]
+            for i in range(n)]
+
+
+def ill_conditioned(rng: random.Random, n: int, shift: float = 1e-8) -> list:
+    '''
+    A Hilbert matrix, whose condition number grows exponentially with n, plus
+    shift times the identity so that it stays invertible within the pivot
+    tolerance at every size. It is slightly perturbed so that different seeds
+    give different matrices.
+
+    args:
+        rng: The random number generator.
+        n: The number of rows and columns.
+        shift: The amount added to the diagonal, which bounds the condition number.
+
+    returns:
+        The rows of the matrix.
+    '''
+    return [[1 / (i + j + 1) * (1 + 1e-12 * rng.random()) + (shift if i == j else 0) for j in range(n)]
+            for i in range(n)]
+
+
+def integer(rng: random.Random, n: int) -> list:
+    '''
+    A matrix of small integers with a dominant diagonal, which takes the
+    exact (Fraction) paths of the operations.
+
+    args:
+        rng: The random number generator.
+        n: The number of rows and columns.
+
+    returns:
+        The rows of the matrix.
+    '''
+    rows = [[rng.randint(-9, 9) for _ in range(n)] for _ in range(n)]
+    for i in range(n):
+        rows[i][i] = 1 + sum(abs(x) for j, x in enumerate(rows[i]) if j != i)
+
+    return rows
+
+
+GENERATORS = {
+    'dense': dense,
+    'sparse': sparse,
+    'spd': spd,
+    'triangular': triangular,
+    'ill-conditioned': ill_conditioned,
+    'integer': integer,
+}
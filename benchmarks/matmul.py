@@ -0,0 +1,80 @@
+"""
+Compares the blocked, transpose-aware Matrix.matrix_multiply against the
+original triple loop it replaced.
+
+Run from the repository root:
+    python -m benchmarks.matmul
+    python -m benchmarks.matmul --sizes 64 128 --repeat 3
+"""
+
+import argparse
+import random
+import time
+
+import MatrixProgram.matrix as matrix
+
+
+def naive_multiply(a: list, b: list) -> list:
+    '''
+    The original element-by-element triple loop, kept as the baseline.
+
+    args:
+        a: The rows of the left matrix.
+        b: The rows of the right matrix.
+
+    returns:
+        The rows of the product.
+    '''
+    m, n, p = len(a), len(b), len(b[0])
+    rows = [[0 for _ in range(p)] for _ in range(m)]
+    for i in range(m):
+        for j in range(p):
+            value = 0
+            for k in range(n):
+                value += a[i][k] * b[k][j]
+            rows[i][j] = value
+
+    return rows
+
+
+def best_time(func, repeat: int) -> float:
+    '''
+    Times a function a number of times and keeps the fastest run.
+
+    args:
+        func: The function to time, called without arguments.
+        repeat: The number of runs.
+
+    returns:
+        The fastest wall time in seconds.
+    '''
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[64, 256, 512])
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f'{"n":>6} {"triple loop (s)":>16} {"blocked (s)":>12} {"speedup":>8}')
+    for n in args.sizes:
+        a = [[rng.random() for _ in range(n)] for _ in range(n)]
+        b = [[rng.random() for _ in range(n)] for _ in range(n)]
+        A, B = matrix.Matrix(a), matrix.Matrix(b)
+
+        naive = best_time(lambda: naive_multiply(a, b), args.repeat)
+        blocked = best_time(lambda: A.matrix_multiply(B), args.repeat)
+        print(f'{n:>6} {naive:>16.4f} {blocked:>12.4f} {naive / blocked:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""
+Times every Matrix and operation.advanced operation on seeded test matrices
+across a sweep of sizes, recording the wall time and the tracemalloc peak
+of each, and compares two such runs to find regressions.
+
+Run from the repository root:
+    python -m benchmarks.suite run --output before.json
+    python -m benchmarks.suite run --sizes 8 16 --kinds dense integer --operations inverse solve
+    python -m benchmarks.suite compare before.json after.json --threshold 0.2
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import MatrixProgram.matrix as matrix
+import operation.advanced as advanced
+from benchmarks.generators import GENERATORS
+
+
+# Each operation is called with the rows of a test matrix, the matrix, a second
+# matrix of the same kind, a right-hand side column and whether to compute exactly.
+OPERATIONS = {
+    'construct': lambda rows, a, b, rhs, exact: matrix.Matrix(rows),
+    'matrix_add': lambda rows, a, b, rhs, exact: a.matrix_add(b),
+    'matrix_multiply': lambda rows, a, b, rhs, exact: a.matrix_multiply(b),
+    'transpose': lambda rows, a, b, rhs, exact: a.transpose(),
+    'determinant': lambda rows, a, b, rhs, exact: a.determinant(method='bareiss' if exact else 'lu'),
+    'inverse': lambda rows, a, b, rhs, exact: advanced.inverse(a, exact=exact),
+    'adjoint': lambda rows, a, b, rhs, exact: advanced.adjoint(a, exact=exact),
+    'row_echelon': lambda rows, a, b, rhs, exact: advanced.row_echelon(a, exact=exact),
+    'reduced_row_echelon': lambda rows, a, b, rhs, exact: advanced.reduced_row_echelon(a, exact=exact),
+    'solve': lambda rows, a, b, rhs, exact: advanced.solve(a, rhs, exact=exact),
+}
+
+
+def measure(func, reset, repeat: int) -> tuple:
+    '''
+    Times a function a number of times, keeping the fastest run, then runs it
+    once more under tracemalloc to find the peak memory it allocates.
+
+    args:
+        func: The function to measure, called without arguments.
+        reset: Called without arguments before every run, e.g. to empty caches.
+        repeat: The number of timed runs.
+
+    returns:
+        The fastest wall time in seconds and the peak allocation in bytes.
+    '''
+    best = float('inf')
+    for _ in range(repeat):
+        reset()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    # Traced separately, since tracemalloc slows allocation-heavy code down
+    reset()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        result = func()
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+    del result
+
+    return best, peak
+
+
+def run(sizes: list, kinds: list, operations: list, repeat: int = 3, seed: int = 0,
+        max_seconds: float = 10.0, progress=sys.stderr) -> dict:
+    '''
+    Runs the benchmark suite.
+
+    args:
+        sizes: The numbers of rows and columns of the test matrices.
+        kinds: The names of the generators of the test matrices.
+        operations: The names of the operations to time.
+        repeat: The number of timed runs of each operation, of which the fastest is kept.
+        seed: The seed of the generators.
+        max_seconds: Once an operation takes longer than this on a kind of matrix,
+                     the larger sizes of it are skipped.
+        progress: Where to print a line per result, or None.
+
+    returns:
+        The results, with the settings and the machine they were measured on.
+    '''
+    results = []
+    slow = set()
+    if progress is not None:
+        print(f'{"operation":<20} {"kind":<16} {"n":>5} {"seconds":>10} {"peak bytes":>12}', file=progress)
+
+    for n in sorted(sizes):
+        for kind in kinds:
+            # A generator of its own per kind and size, so that a subset of the
+            # suite gives the same matrices as the full suite
+            rng = random.Random(f'{seed}-{kind}-{n}')
+            rows = GENERATORS[kind](rng, n)
+            a = matrix.Matrix(rows)
+            b = matrix.Matrix(GENERATORS[kind](rng, n))
+            exact = a.is_exact()
+            rhs = matrix.Matrix([[row[0]] for row in GENERATORS[kind](rng, n)])
+
+            for name in operations:
+                if (name, kind) in slow:
+                    continue
+                func = OPERATIONS[name]
+                seconds, peak = measure(lambda: func(rows, a, b, rhs, exact), a.mark_modified, repeat)
+                results.append({'operation': name, 'kind': kind, 'n': n, 'seconds': seconds,
+                                'peak_bytes': peak})
+                if progress is not None:
+                    print(f'{name:<20} {kind:<16} {n:>5} {seconds:>10.5f} {peak:>12}', file=progress)
+                if seconds > max_seconds:
+                    slow.add((name, kind))
+
+    return {
+        'settings': {'sizes': sorted(sizes), 'kinds': kinds, 'operations': operations,
+                     'repeat': repeat, 'seed': seed},
+        'machine': {'python': platform.python_version(), 'implementation': platform.python_implementation(),
+                    'platform': platform.platform(), 'processor': platform.processor()},
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'results': results,
+    }
+
+
+def compare(old: dict, new: dict, threshold: float = 0.1, min_seconds: float = 1e-3,
+            output=sys.stdout) -> list:
+    '''
+    Compares two runs of the suite, printing the ratio of the new to the old
+    time and peak memory of every result they have in common.
+
+    args:
+        old: The results of the baseline run.
+        new: The results of the run to check.
+        threshold: The relative increase above which a result is a regression, e.g. 0.1 for 10%.
+        min_seconds: Times increasing by less than this are never regressions, since
+                     they are within the noise of the timer.
+        output: Where to print the comparison.
+
+    returns:
+        The regressions, as (operation, kind, n, what) tuples where what is "time" or "memory".
+    '''
+    def key(result: dict) -> tuple:
+        return result['operation'], result['kind'], result['n']
+
+    baseline = {key(result): result for result in old['results']}
+    regressions = []
+
+    print(f'{"operation":<20} {"kind":<16} {"n":>5} {"old (s)":>10} {"new (s)":>10} {"time":>7} {"memory":>7}',
+          file=output)
+    for result in new['results']:
+        before = baseline.pop(key(result), None)
+        if before is None:
+            continue
+
+        flags = []
+        time_ratio = result['seconds'] / before['seconds'] if before['seconds'] else float('inf')
+        if time_ratio > 1 + threshold and result['seconds'] - before['seconds'] >= min_seconds:
+            flags.append('time')
+        memory_ratio = result['peak_bytes'] / before['peak_bytes'] if before['peak_bytes'] else 1.0
+        if memory_ratio > 1 + threshold:
+            flags.append('memory')
+        regressions.extend(key(result) + (what,) for what in flags)
+
+        print(f'{result["operation"]:<20} {result["kind"]:<16} {result["n"]:>5} {before["seconds"]:>10.5f} '
+              f'{result["seconds"]:>10.5f} {time_ratio:>6.2f}x {memory_ratio:>6.2f}x'
+              + (f'  REGRESSION ({", ".join(flags)})' if flags else ''), file=output)
+
+    if baseline:
+        print(f'{len(baseline)} result(s) of the old run are missing from the new run.', file=output)
+    print(f'{len(regressions)} regression(s) above {threshold:.0%}.', file=output)
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run the suite and write the results as JSON')
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=[4, 8, 16, 32, 64])
+    run_parser.add_argument('--kinds', nargs='+', choices=list(GENERATORS), default=list(GENERATORS))
+    run_parser.add_argument('--operations', nargs='+', choices=list(OPERATIONS), default=list(OPERATIONS))
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--max-seconds', type=float, default=10.0,
+                            help='skip the larger sizes of an operation once it takes longer than this')
+    run_parser.add_argument('--output', help='file to write the results to (standard output by default)')
+
+    compare_parser = commands.add_parser('compare', help='compare two results files, exiting with 1 on regressions')
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help='relative increase counted as a regression (default 0.1)')
+    compare_parser.add_argument('--min-seconds', type=float, default=1e-3,
+                                help='smallest increase in time counted as a regression (default 0.001)')
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        results = run(args.sizes, args.kinds, args.operations, args.repeat, args.seed, args.max_seconds)
+        if args.output is None:
+            json.dump(results, sys.stdout, indent=1)
+            print()
+        else:
+            with open(args.output, 'w') as file:
+                json.dump(results, file, indent=1)
+    else:
+        with open(args.old) as file:
+            old = json.load(file)
+        with open(args.new) as file:
+            new = json.load(file)
+        if compare(old, new, args.threshold, args.min_seconds):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
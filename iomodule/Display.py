@@ -1,26 +1,57 @@
 import MatrixProgram.matrix as matrix
+import MatrixProgram.sparse as sparse
+import math
+import sys
+from fractions import Fraction
 
-def printMatrix(matrix: matrix.Matrix) -> None:
+def formatNumber(number) -> str:
     '''
-    Prints the matrix in a readable format.
+    Formats an element for printing: fractions as they are, other numbers rounded
+    to two decimals and written without a decimal point if the rounded value is whole.
     args:
-        matrix: The matrix to be printed.
+        number: The element.
+
+    returns:
+        The formatted element.
+    '''
+    if isinstance(number, Fraction):
+        return str(number)
+
+    # Round first, so that e.g. 32767.999 prints as 32768 rather than 32768.0.
+    number = round(number, 2)
+    if math.isfinite(number) and number == int(number):
+        return str(int(number))
+    return str(number)
+
+
+def printMatrix(mat: matrix.Matrix | sparse.SparseMatrix, max_rows: int = None, max_cols: int = None) -> None:
+    '''
+    Prints the matrix in a readable format. The middle rows and columns of a large
+    matrix are left out and shown as "...".
+    args:
+        mat: The matrix to be printed, either dense or sparse.
+        max_rows: The largest number of rows printed in full, matrix.PRINT_MAX_ROWS by default.
+        max_cols: The largest number of columns printed in full, matrix.PRINT_MAX_COLUMNS by default.
     
     returns:
         None
     '''
 
-    assert matrix, 'The matrix must not None Object Type.'
+    assert mat, 'The matrix must not None Object Type.'
 
-    format_number = lambda x: round(x, 2) if x % 1 else int(x)
-    
-    max_digits = [max(len(str(format_number(element))) for element in col) for col in zip(*matrix.values)]
-    
-    for row in matrix.values:
-        print('|', end=' ')
-        for i, element in enumerate(row):
-            print(str(format_number(element)).rjust(max_digits[i]), end=' ')
-        print('|')
+    m, n = mat.get_size()
+    if isinstance(mat, sparse.SparseMatrix):
+        element = lambda i, j: mat.get_value(i + 1, j + 1)
+    else:
+        values = mat.values
+        element = lambda i, j: values[i][j]
+
+    # Each shown element is formatted once, and the widths only depend on those.
+    cells = matrix.format_elements(element, m, n, formatNumber, max_rows, max_cols)
+    widths = [max(len(row[j]) for row in cells) for j in range(len(cells[0]))]
+
+    lines = ['| ' + ' '.join(cell.rjust(width) for cell, width in zip(row, widths)) + ' |' for row in cells]
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 
 def printMenu():
@@ -37,7 +68,10 @@ def printMenu():
     print('3. Delete a matrix')
     print('4. Basic operations on matrices')
     print('5. Advanced operations on matrices')
-    print('6. exit')
+    print('6. Save workspace')
+    print('7. Load workspace')
+    print('8. Load a matrix from a text file')
+    print('9. exit')
 
 
 def printBasicOperationsMenu():
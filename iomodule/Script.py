@@ -0,0 +1,220 @@
+import MatrixProgram.matrix as matrix
+import operation.advanced as advanced
+import json
+import shlex
+import sys
+import time
+import tracemalloc
+from fractions import Fraction
+
+
+# Number of arguments and description of each command of the script language.
+COMMANDS = {
+    'create': (None, 'create NAME ROW; ROW; ...   matrix from rows of numbers'),
+    'load': (2, 'load NAME PATH              .mat file, or text (.csv: commas)'),
+    'save': (2, 'save NAME PATH              .mat file, or text (.csv: commas)'),
+    'show': (1, 'show A                      elements of a matrix'),
+    'add': (2, 'add A B                     sum'),
+    'sub': (2, 'sub A B                     difference'),
+    'mul': (2, 'mul A B                     product'),
+    'transpose': (1, 'transpose A                 transpose'),
+    'det': (1, 'det A                       determinant'),
+    'inv': (1, 'inv A                       inverse'),
+    'ref': (1, 'ref A                       row echelon form'),
+    'rref': (1, 'rref A                      reduced row echelon form'),
+    'solve': (2, 'solve A B                   solution of A * X = B'),
+}
+
+
+def usage() -> str:
+    '''
+    Describes the script language.
+
+    args:
+        None
+
+    returns:
+        The description of every command, one per line.
+    '''
+    lines = ['One command per line, # starts a comment. "NAME = COMMAND ..." stores',
+             'a matrix result under NAME instead of printing its elements.']
+
+    return '\n'.join(lines + [f'    {description}' for _, description in COMMANDS.values()])
+
+
+def parseCommand(line: str) -> tuple:
+    '''
+    Splits a line of a script into its parts.
+
+    args:
+        line: The line, e.g. "C = mul A B".
+
+    returns:
+        The name to store the result under (or None), the command and its arguments,
+        or None for a blank line.
+    '''
+    tokens = shlex.split(line, comments=True)
+    if not tokens:
+        return None
+
+    target = None
+    if len(tokens) > 1 and tokens[1] == '=':
+        target, tokens = tokens[0], tokens[2:]
+        assert tokens, 'A command must follow "=".'
+
+    command, args = tokens[0].lower(), tokens[1:]
+    assert command in COMMANDS, f'Unknown command "{command}".'
+    count = COMMANDS[command][0]
+    if count is None:
+        assert len(args) >= 2, f'"{command}" needs a name and the rows of the matrix.'
+    else:
+        assert len(args) == count, f'"{command}" takes {count} argument(s), not {len(args)}.'
+
+    return target, command, args
+
+
+def executeCommand(matrices: dict, command: str, args: list):
+    '''
+    Runs one command of a script.
+
+    args:
+        matrices: The named matrices of the script, updated by create and load.
+        command: The command.
+        args: The arguments of the command.
+
+    returns:
+        The result of the command: a matrix, a number, or None.
+    '''
+    def get(name: str) -> matrix.Matrix:
+        assert name in matrices, f'Matrix "{name}" does not exist.'
+        return matrices[name]
+
+    match command:
+        case 'create':
+            # The rows are separated by semicolons, the elements by commas or spaces.
+            rows = ' '.join(args[1:]).replace(',', ' ').split(';')
+            matrices[args[0]] = matrix.Matrix.from_text(rows)
+            return None
+        case 'load':
+            name, path = args
+            if path.lower().endswith('.mat'):
+                matrices[name] = matrix.Matrix.load(path)
+            else:
+                matrices[name] = matrix.Matrix.from_text(path, delimiter=_delimiter(path))
+            return None
+        case 'save':
+            name, path = args
+            mat = get(name)
+            if path.lower().endswith('.mat'):
+                mat.save(path)
+            else:
+                separator = _delimiter(path) or ' '
+                with open(path, 'w') as file:
+                    for row in mat.values:
+                        file.write(separator.join(map(str, row)) + '\n')
+            return None
+        case 'show':
+            return get(args[0])
+        case 'add':
+            return get(args[0]).matrix_add(get(args[1]))
+        case 'sub':
+            return get(args[0]).matrix_sub(get(args[1]))
+        case 'mul':
+            return get(args[0]).matrix_multiply(get(args[1]))
+        case 'transpose':
+            return get(args[0]).transpose()
+        case 'det':
+            mat = get(args[0])
+            return mat.determinant(method='bareiss' if mat.is_exact() else 'lu')
+        case 'inv':
+            mat = get(args[0])
+            return advanced.inverse(mat, exact=mat.is_exact())
+        case 'ref':
+            mat = get(args[0])
+            return advanced.row_echelon(mat, exact=mat.is_exact())
+        case 'rref':
+            mat = get(args[0])
+            return advanced.reduced_row_echelon(mat, exact=mat.is_exact())
+        case 'solve':
+            mat, b = get(args[0]), get(args[1])
+            return advanced.solve(mat, b, exact=mat.is_exact() and b.is_exact())
+
+
+def _delimiter(path: str):
+    '''
+    Gives the delimiter of a text matrix file from its extension.
+    '''
+    return ',' if path.lower().endswith('.csv') else None
+
+
+def _number(value):
+    '''
+    Converts a number to a JSON value, writing fractions as strings such as "1/3".
+    '''
+    if isinstance(value, Fraction):
+        return value.numerator if value.denominator == 1 else str(value)
+
+    return value
+
+
+def runScript(lines, output=sys.stdout, trace_memory: bool = True) -> int:
+    '''
+    Runs a script without any prompts, writing one JSON object per command to the output:
+    the line number, the command, its status, its result, its wall time in seconds
+    and the peak memory it allocated in bytes (null if memory is not traced). Matrix
+    results stored under a name are reported by size only. The script stops at the
+    first command that fails.
+
+    args:
+        lines: The lines of the script, e.g. an open file.
+        output: Where to write the results.
+        trace_memory: Whether to measure peak memory with tracemalloc, which slows
+                      the commands down.
+
+    returns:
+        The exit status: 0 if every command succeeded, otherwise 1.
+    '''
+    matrices = {}
+    started = trace_memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+
+    try:
+        for number, line in enumerate(lines, 1):
+            record = {'line': number, 'command': line.strip()}
+            try:
+                parsed = parseCommand(line)
+                if parsed is None:
+                    continue
+                target, command, args = parsed
+
+                if trace_memory:
+                    tracemalloc.reset_peak()
+                    baseline = tracemalloc.get_traced_memory()[0]
+                start = time.perf_counter()
+                result = executeCommand(matrices, command, args)
+                seconds = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1] - baseline if trace_memory else None
+
+                if target is not None:
+                    assert isinstance(result, matrix.Matrix), f'"{command}" does not give a matrix.'
+                    matrices[target] = result
+                    m, n = result.get_size()
+                    result = {'matrix': target, 'size': [m, n]}
+                elif isinstance(result, matrix.Matrix):
+                    m, n = result.get_size()
+                    result = {'size': [m, n], 'values': [[_number(x) for x in row] for row in result.values]}
+                else:
+                    result = _number(result)
+
+                record.update(status='ok', result=result, seconds=seconds, peak_bytes=peak)
+                print(json.dumps(record), file=output)
+            except (AssertionError, OSError, ValueError) as e:
+                record.update(status='error', error=str(e))
+                print(json.dumps(record), file=output)
+                return 1
+    finally:
+        if started:
+            tracemalloc.stop()
+
+    return 0
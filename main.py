@@ -1,6 +1,10 @@
 import MatrixProgram.matrix as matrix
 import iomodule.Display as Display
+import iomodule.Script as Script
 import operation.advanced as advanced
+import argparse
+import os
+import sys
 from copy import deepcopy
 
 
@@ -24,9 +28,10 @@ def getMatrixFromUser() -> matrix.Matrix:
         for j in range(col):
             while True:
                 try:
-                    element = float(input(f'Enter the element ({i + 1} {j + 1}): '))    
+                    # Keep integer and fractional (e.g. 1/3) input exact, and decimals as floats.
+                    element = matrix.parse_number(input(f'Enter the element ({i + 1} {j + 1}): '))
                     break
-                except ValueError:
+                except (ValueError, ZeroDivisionError):
                     print('Input Invalid!')
                     pass
             row_input.append(element)
@@ -36,6 +41,26 @@ def getMatrixFromUser() -> matrix.Matrix:
     return mat
 
 
+def getMatrixFromFile() -> matrix.Matrix:
+    '''
+    Reads a matrix from a text file chosen by the user, with one row per line
+    and the elements separated by commas (.csv files) or whitespace.
+
+    args:
+        None
+
+    returns:
+        The matrix read from the file, or None if it could not be read.
+    '''
+    path = input('Enter the path of the file: ')
+    delimiter = ',' if path.lower().endswith('.csv') else None
+
+    try:
+        return matrix.Matrix.from_text(path, delimiter=delimiter)
+    except (AssertionError, OSError, UnicodeDecodeError) as e:
+        print(e)
+
+
 def getTwoMatrices(matrices: dict) -> tuple[matrix.Matrix, matrix.Matrix]:
     '''
     Gets two matrices from dictionary by the user input.
@@ -62,6 +87,65 @@ def getTwoMatrices(matrices: dict) -> tuple[matrix.Matrix, matrix.Matrix]:
     return mat1, mat2
 
 
+def saveWorkspace(matrices: dict) -> None:
+    '''
+    Saves every matrix to a directory chosen by the user, as one <name>.mat
+    file per matrix (see Matrix.save).
+
+    args:
+        matrices: The dictionary of matrices.
+
+    returns:
+        None
+    '''
+    directory = input('Enter the directory to save the workspace to: ')
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+        for name, mat in matrices.items():
+            mat.save(os.path.join(directory, f'{name}.mat'))
+        print(f'Saved {len(matrices)} matrices to {directory}.')
+    except (AssertionError, OSError) as e:
+        print(e)
+
+
+def loadWorkspace(matrices: dict) -> None:
+    '''
+    Loads every <name>.mat file of a directory chosen by the user as the
+    matrix <name>, replacing any matrix with the same name. Files are
+    memory-mapped, so even large matrices load instantly.
+
+    args:
+        matrices: The dictionary of matrices, updated in place.
+
+    returns:
+        None
+    '''
+    directory = input('Enter the directory to load the workspace from: ')
+
+    if not os.path.isdir(directory):
+        print(f'Directory "{directory}" does not exist. Please try again.')
+        return
+
+    loaded = 0
+    for file in sorted(os.listdir(directory)):
+        name, extension = os.path.splitext(file)
+        if extension != '.mat':
+            continue
+
+        if name not in matrices and len(matrices) == 26:
+            print('Cannot load more than 26 matrices.')
+            break
+
+        try:
+            matrices[name] = matrix.Matrix.load(os.path.join(directory, file))
+            loaded += 1
+        except (AssertionError, OSError) as e:
+            print(f'{file}: {e}')
+
+    print(f'Loaded {loaded} matrices from {directory}.')
+
+
 def main():
     matrices = {}
 
@@ -137,9 +221,7 @@ def main():
                                     continue
 
                                 try:
-                                    temp = deepcopy(mat2)
-                                    temp.scalar_multiply(-1)
-                                    result = mat1.matrix_add(temp)
+                                    result = mat1.matrix_sub(mat2)
                                     print('The difference of the matrices is:')
                                     Display.printMatrix(result)
                                 except AssertionError as e:
@@ -211,7 +293,8 @@ def main():
                                     continue
 
                                 try:
-                                    result = matrices[mat].determinant()
+                                    method = 'bareiss' if matrices[mat].is_exact() else 'lu'
+                                    result = matrices[mat].determinant(method=method)
                                     print(f'The determinant of the matrix is: {result}')
                                 except AssertionError as e:
                                     print(e)
@@ -224,7 +307,7 @@ def main():
                                     continue
 
                                 try:
-                                    result = advanced.inverse(matrices[mat])
+                                    result = advanced.inverse(matrices[mat], exact=matrices[mat].is_exact())
                                     print('The inverse of the matrix is:')
                                     Display.printMatrix(result)
                                 except AssertionError as e:
@@ -238,7 +321,7 @@ def main():
                                     continue
 
                                 try:
-                                    result = advanced.row_echelon(matrices[mat])
+                                    result = advanced.row_echelon(matrices[mat], exact=matrices[mat].is_exact())
                                     print('The row echelon form of the matrix is:')
                                     Display.printMatrix(result)
                                 except AssertionError as e:
@@ -252,7 +335,7 @@ def main():
                                     continue
 
                                 try:
-                                    result = advanced.reduced_row_echelon(matrices[mat])
+                                    result = advanced.reduced_row_echelon(matrices[mat], exact=matrices[mat].is_exact())
                                     print('The reduced row echelon form of the matrix is:')
                                     Display.printMatrix(result)
                                 except AssertionError as e:
@@ -272,7 +355,8 @@ def main():
                                     continue
 
                                 try:
-                                    result = advanced.solve(matrices[mat], matrices[b])
+                                    result = advanced.solve(matrices[mat], matrices[b],
+                                                            exact=matrices[mat].is_exact() and matrices[b].is_exact())
                                     print('The solution of the system of linear equations is:')
                                     Display.printMatrix(result)
                                 except AssertionError as e:
@@ -285,6 +369,35 @@ def main():
                     except ValueError:
                         print('Invalid choice. Please try again.')
                 case 6:
+                    # Save all the matrices to a directory.
+                    if len(matrices) == 0:
+                        print('No matrix to save.')
+                        continue
+
+                    saveWorkspace(matrices)
+                case 7:
+                    # Load the matrices saved in a directory.
+                    loadWorkspace(matrices)
+                case 8:
+                    # Create a matrix from a text file.
+                    if len(matrices) == 26:
+                        print('Cannot create more than 26 matrices.')
+                        continue
+
+                    name = input('Enter the name of the matrix: ')
+
+                    if name in matrices:
+                        print('Matrix with this name already exists.')
+                        continue
+
+                    mat = getMatrixFromFile()
+                    if mat is None:
+                        continue
+
+                    matrices[name] = mat
+                    m, n = mat.get_size()
+                    print(f'Matrix {name} ({m} x {n}) loaded.')
+                case 9:
                     # Exit the program.
                     print('Exiting the program.')
                     exit()
@@ -295,5 +408,40 @@ def main():
             print('Invalid choice. Please try again.')
 
 
+def parseArguments(argv: list = None) -> argparse.Namespace:
+    '''
+    Parses the command line arguments.
+
+    args:
+        argv: The arguments, sys.argv[1:] by default.
+
+    returns:
+        The parsed arguments.
+    '''
+    parser = argparse.ArgumentParser(
+        description='Matrix calculator. Interactive unless a script or commands are given, '
+                    'in which case one JSON result per command is printed.',
+        epilog=Script.usage(), formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--script', metavar='FILE',
+                        help='run the commands of a script file ("-" for standard input)')
+    parser.add_argument('--command', metavar='COMMAND', action='append', default=[],
+                        help='run a command, e.g. "det A" (may be repeated, runs after --script)')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='do not measure peak memory, which slows commands down')
+
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    main()
+    arguments = parseArguments()
+
+    if arguments.script is None and not arguments.command:
+        main()
+    else:
+        lines = list(arguments.command)
+        if arguments.script == '-':
+            lines = sys.stdin.read().splitlines() + lines
+        elif arguments.script is not None:
+            with open(arguments.script) as file:
+                lines = file.read().splitlines() + lines
+        sys.exit(Script.runScript(lines, trace_memory=not arguments.no_memory))
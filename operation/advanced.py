@@ -1,5 +1,12 @@
+import MatrixProgram.backends as backends
 import MatrixProgram.matrix as matrix
+import MatrixProgram.profiling as profiling
+import MatrixProgram.sparse as sparse
+import math
+import sys
 from copy import deepcopy
+from fractions import Fraction
+from operator import mul, sub
 
 
 def minor(mat: matrix.Matrix, row: int, col: int) -> matrix.Matrix:
@@ -23,93 +30,355 @@ def minor(mat: matrix.Matrix, row: int, col: int) -> matrix.Matrix:
     # Check if the row and column are valid.
     assert row >= 0 and row < m and col >= 0 and col < n, 'The row or column is invalid.'
     
-    # Calculate the minor.
-    minor = matrix.Matrix([[0 for _ in range(n - 1)] for _ in range(m - 1)])
-    for i in range(m):
-        for j in range(n):
-            if i != row and j != col:
-                minor.set_value(i - (i > row) + 1, j - (j > col) + 1, mat.get_value(i + 1, j + 1))
+    # Calculate the minor as a view sharing the elements of the matrix.
+    assert m > 1, 'The matrix has no minors.'
+    minor = mat.view_minor(row + 1, col + 1)
     
     return minor
 
 
-def cofactor(mat: matrix.Matrix) -> matrix.Matrix:
+def cofactor(mat: matrix.Matrix, exact: bool = False) -> matrix.Matrix:
     '''
-    Calculates the cofactor of a matrix.
+    Calculates the cofactor of a matrix, which is the transpose of its adjoint.
 
     args:
         mat: The matrix to calculate the cofactor of.
+        exact: Whether to use fraction-free (Bareiss) elimination so that the result is exact.
 
     returns:
         The cofactor of the matrix.
     '''
-    m, n = mat.get_size()
+    # Reuse the adjoint computed since the matrix last changed.
+    return mat.memoize(('adjoint', exact), lambda: _adjoint(mat, exact)).transpose()
 
-    # Check if the matrix is square.
-    assert m == n, 'The matrix is not square.'
 
-    # Calculate the cofactor.
-    cofactor = matrix.Matrix([[0 for _ in range(n)] for _ in range(m)])
-    for i in range(m):
-        for j in range(n):
-            cofactor.set_value(i + 1, j + 1, (-1) ** (i + j) * minor(mat, i, j).determinant())
-    
-    return cofactor
-
-
-def adjoint(mat: matrix.Matrix) -> matrix.Matrix:
+def adjoint(mat: matrix.Matrix, exact: bool = False) -> matrix.Matrix:
     '''
-    Calculates the adjoint of a matrix.
+    Calculates the adjoint (adjugate) of a matrix.
+
+    Instead of the n^2 minor determinants of the definition, a single
+    elimination on [A | I] is used, in O(n^3). If A is invertible,
+    adj(A) = det(A) * A^-1. Otherwise adj(A) is zero when the rank of A is
+    n - 2 or less, and when the rank is n - 1 it is c * x * y^T, where x and
+    y span the null spaces of A and A^T and c follows from one minor.
 
     args:
         mat: The matrix to calculate the adjoint of.
+        exact: Whether to use fraction-free (Bareiss) elimination so that the result is exact.
 
     returns:
         The adjoint of the matrix.
     '''
+    # Reuse the adjoint computed since the matrix last changed.
+    return mat.memoize(('adjoint', exact), lambda: _adjoint(mat, exact)).copy()
+
+
+def _adjoint(mat: matrix.Matrix, exact: bool) -> matrix.Matrix:
+    '''
+    Calculates the adjoint of a matrix without looking at its cache.
+    '''
     m, n = mat.get_size()
 
     # Check if the matrix is square.
     assert m == n, 'The matrix is not square.'
 
-    # Calculate the adjoint.
-    adjoint = cofactor(mat)
-    adjoint = adjoint.transpose()
+    identity = [[int(i == j) for j in range(n)] for i in range(n)]
+    if n == 1:
+        adj = identity
+    elif exact:
+        adj = _exact_adjoint(mat, identity)
+    else:
+        aug = _augment_identity(mat)
+        det, pivots = _gauss_jordan(aug, n)
+        if len(pivots) == n:
+            adj = [[det * x for x in row[n:]] for row in aug]
+        else:
+            adj = _rank_one_adjoint(mat, aug, pivots, exact)
+        matrix.give_rows(aug)
+
+    if exact:
+        return mat.like(adj, storage='list')
+
+    return mat.like(adj)
+
+
+def _exact_adjoint(mat: matrix.Matrix, identity: list) -> list:
+    '''
+    Calculates the adjoint of a matrix exactly with fraction-free Gauss-Jordan
+    elimination on [A | I]. For an invertible matrix every pivot ends up equal
+    to +-det(A) and the right half to +-adj(A), so integer matrices never leave
+    the integers.
+
+    args:
+        mat: The square matrix.
+        identity: The rows of the identity matrix of the same size.
+
+    returns:
+        The rows of the adjoint.
+    '''
+    n = mat.get_size()[0]
+    rows = [row + extra for row, extra in zip(_exact_values(mat), identity)]
+    aug, sign, pivots = matrix.bareiss_eliminate(rows, reduce=True, columns=n)
+    if len(pivots) < n:
+        return _rank_one_adjoint(mat, aug, pivots, True)
+
+    adj = [[sign * x for x in row[n:]] for row in aug]
+
+    return [[_simplify(x) for x in row] for row in adj]
+
+
+def _rank_one_adjoint(mat: matrix.Matrix, aug: list, pivots: list, exact: bool) -> list:
+    '''
+    Calculates the adjoint of a singular matrix from the reduced form of [A | I].
+
+    args:
+        mat: The square matrix.
+        aug: The reduced rows of [A | I], with the pivot rows first.
+        pivots: The column of the pivot of each nonzero row of A.
+        exact: Whether aug holds exact (fraction-free) values.
+
+    returns:
+        The rows of the adjoint.
+    '''
+    n = mat.get_size()[0]
+
+    # A rank of n - 2 or less leaves every minor of order n - 1 singular.
+    if len(pivots) < n - 1:
+        return [[0 if exact else 0.0 for _ in range(n)] for _ in range(n)]
+
+    # A * x = 0, with x read off the pivot rows at the single free column.
+    free = next(c for c in range(n) if c not in pivots)
+    x = [0] * n
+    x[free] = aug[0][pivots[0]]
+    for k, c in enumerate(pivots):
+        x[c] = -aug[k][free]
+
+    # y^T * A = 0, since the last row of A was reduced to zero by the row
+    # operations recorded in the right half.
+    y = aug[n - 1][n:]
+
+    # adj(A) = c * x * y^T, with c fixed by the largest cofactor of the product.
+    j = max(range(n), key=lambda k: abs(x[k]))
+    i = max(range(n), key=lambda k: abs(y[k]))
+    sub = minor(mat, i, j)
+    det = sub.determinant(method='bareiss') if exact else sub.determinant()
+    c = (-1) ** (i + j) * (Fraction(det) if exact else det) / (x[j] * y[i])
+    adj = [[c * x[a] * y[b] for b in range(n)] for a in range(n)]
+
+    if exact:
+        return [[_simplify(value) for value in row] for row in adj]
+
+    return adj
+
+
+def _simplify(value):
+    '''
+    Gives an exact value as an integer when it is one.
+    '''
+    if isinstance(value, Fraction) and value.denominator == 1:
+        return value.numerator
+
+    return value
+
+
+def _augment_identity(mat: matrix.Matrix) -> list:
+    '''
+    Builds the augmented matrix [A | I] as floats in scratch rows taken from
+    the workspace pool of the matrix module.
+
+    args:
+        mat: The square matrix A.
+
+    returns:
+        The rows of [A | I], to be given back to the pool once no longer needed.
+    '''
+    n = mat.get_size()[0]
+    aug = matrix.take_rows(n, 2 * n)
+    zeros = [0.0] * n
+    for i, (target, row) in enumerate(zip(aug, mat.values)):
+        target[:n] = map(float, row)
+        target[n:] = zeros
+        target[n + i] = 1.0
+
+    return aug
+
+
+def _gauss_jordan(aug: list, n: int) -> tuple:
+    '''
+    Reduces an augmented matrix [A | B] in place with a Gauss-Jordan sweep
+    using partial pivoting, choosing pivots only among the n columns of A and
+    skipping columns without one. Pivot rows are scaled to a leading
+    coefficient of 1 and moved to the top.
+
+    args:
+        aug: The rows of [A | B] as floats.
+        n: The number of columns of A.
+
+    returns:
+        The determinant of A (zero if A is singular) and the column of the pivot of each nonzero row.
+    '''
+    m, width = len(aug), len(aug[0])
+    # Compare each pivot against the scale of its own column of A.
+    tolerances = [matrix.PIVOT_TOLERANCE * max(abs(row[c]) for row in aug) for c in range(n)]
+    det = 1.0
+    pivots = []
+
+    for c in range(n):
+        k = len(pivots)
+        if k == m:
+            break
+
+        # Pick the largest pivot in the current column.
+        pivot_row = max(range(k, m), key=lambda r: abs(aug[r][c]))
+        if abs(aug[pivot_row][c]) <= tolerances[c]:
+            det = 0.0
+            continue
+
+        if pivot_row != k:
+            aug[k], aug[pivot_row] = aug[pivot_row], aug[k]
+            det = -det
+
+        # Scale the pivot row to have a leading coefficient of 1.
+        pivot = aug[k]
+        pivot_value = pivot[c]
+        det *= pivot_value
+        for j in range(c, width):
+            pivot[j] /= pivot_value
+
+        # Eliminate the current column from every other row.
+        for r in range(m):
+            if r == k:
+                continue
+            row = aug[r]
+            factor = row[c]
+            if factor != 0:
+                for j in range(c, width):
+                    row[j] -= factor * pivot[j]
+
+        pivots.append(c)
+
+    return det, pivots
+
+
+def _exact_values(mat: matrix.Matrix) -> list:
+    '''
+    Copies the elements of a matrix, converting floats to the exactly equal fractions.
+
+    args:
+        mat: The matrix to copy.
+
+    returns:
+        The rows of the matrix with only integer and rational elements.
+    '''
+    return [[Fraction(x) if isinstance(x, float) else x for x in row] for row in mat.values]
+
+
+def _exact_reduce(mat: matrix.Matrix, augment: list) -> list:
+    '''
+    Solves A * X = B exactly with fraction-free Gauss-Jordan elimination on [A | B],
+    dividing by the pivots only at the end.
+
+    args:
+        mat: The square matrix of coefficients A.
+        augment: The rows of B.
+
+    returns:
+        The rows of X as fractions, or integers where they are whole.
+    '''
+    n = mat.get_size()[0]
+    rows = [row + list(extra) for row, extra in zip(_exact_values(mat), augment)]
+    reduced, _, pivots = matrix.bareiss_eliminate(rows, reduce=True)
+
+    # Check if the matrix is invertible.
+    assert pivots[:n] == list(range(n)), 'The matrix is not invertible.'
 
-    return adjoint
+    return [[_simplify(Fraction(x) / reduced[i][i]) for x in reduced[i][n:]] for i in range(n)]
 
 
-def inverse(mat: matrix.Matrix) -> matrix.Matrix:
+def inverse(mat: matrix.Matrix, method: str = 'gauss-jordan', exact: bool = False) -> matrix.Matrix:
     '''
     Calculates the inverse of a matrix.
 
-    Using the formula:
+    The default method reduces the augmented matrix [A | I] to [I | A^-1]
+    with a single Gauss-Jordan sweep using partial pivoting, in O(n^3).
+    The 'adjugate' method uses the formula:
     A^-1 = 1 / det(A) * adj(A)
+    With exact=True, fraction-free Gauss-Jordan elimination is used instead
+    and the result holds exact fractions.
 
     args:
         mat: The matrix to calculate the inverse of.
+        method: Either 'gauss-jordan' or 'adjugate'.
+        exact: Whether to compute with exact rational arithmetic.
     
     returns:
         The inverse of the matrix.
     '''
+    # Reuse the inverse computed since the matrix last changed.
+    return mat.memoize(('inverse', method, exact), lambda: _inverse(mat, method, exact)).copy()
+
+
+def _inverse(mat: matrix.Matrix, method: str, exact: bool) -> matrix.Matrix:
+    '''
+    Calculates the inverse of a matrix without looking at its cache.
+    '''
     # Check if the matrix is square.
     m, n = mat.get_size()
     assert m == n, 'The matrix is not square.'
-    
+    assert method in ('gauss-jordan', 'adjugate'), 'The method is invalid.'
+
+    if exact:
+        identity = [[int(i == j) for j in range(n)] for i in range(n)]
+        return mat.like(_exact_reduce(mat, identity), storage='list')
+
+    if method == 'adjugate':
+        return _adjugate_inverse(mat)
+
+    # Dispatch to the backend of the matrix if it has a kernel.
+    kernel = backends.get_kernel('inverse', mat)
+    if kernel is not None:
+        return mat.like(kernel(mat))
+
+    # Reduce the augmented matrix [A | I] to [I | A^-1].
+    aug = _augment_identity(mat)
+    _, pivots = _gauss_jordan(aug, n)
+
+    # Check if the matrix is invertible.
+    assert len(pivots) == n, 'The matrix is not invertible.'
+
+    inverse = mat.like([row[n:] for row in aug])
+    matrix.give_rows(aug)
+
+    return inverse
+
+
+def _adjugate_inverse(mat: matrix.Matrix) -> matrix.Matrix:
+    '''
+    Calculates the inverse of a matrix from its adjoint and determinant.
+
+    args:
+        mat: The matrix to calculate the inverse of.
+
+    returns:
+        The inverse of the matrix.
+    '''
+    m, n = mat.get_size()
+
     # Check if the matrix is invertible.
-    assert mat.determinant() != 0, 'The matrix is not invertible.'
+    det = mat.determinant()
+    assert det != 0, 'The matrix is not invertible.'
     
     # Calculate the inverse.
     inverse = adjoint(mat)
 
     for i in range(m):
         for j in range(n):
-            inverse.set_value(i + 1, j + 1, inverse.get_value(i + 1, j + 1) / mat.determinant())
+            inverse.set_value(i + 1, j + 1, inverse.get_value(i + 1, j + 1) / det)
 
     return inverse
     
 
-def swap_rows(mat: matrix.Matrix, row1: int, row2: int) -> matrix.Matrix:
+def swap_rows(mat: matrix.Matrix, row1: int, row2: int, inplace: bool = False) -> matrix.Matrix:
     '''
     Swaps two rows of a matrix.
 
@@ -117,6 +386,7 @@ def swap_rows(mat: matrix.Matrix, row1: int, row2: int) -> matrix.Matrix:
         mat: The matrix to swap the rows of.
         row1: The first row to swap.
         row2: The second row to swap.
+        inplace: Whether to modify the matrix itself instead of a copy.
 
     returns:
         The matrix with the rows swapped.
@@ -126,16 +396,15 @@ def swap_rows(mat: matrix.Matrix, row1: int, row2: int) -> matrix.Matrix:
     # Check if the rows are valid.
     assert row1 >= 0 and row1 < m and row2 >= 0 and row2 < m, 'The rows are invalid.'
 
-    # Swap the rows.
-    new_mat = deepcopy(mat)
-    for i in range(n):
-        new_mat.set_value(row1 + 1, i + 1, mat.get_value(row2 + 1, i + 1))
-        new_mat.set_value(row2 + 1, i + 1, mat.get_value(row1 + 1, i + 1))
+    # Swap the rows; writes through .values copy shared elements and empty the cache first.
+    new_mat = mat if inplace else deepcopy(mat)
+    values = new_mat.values
+    values[row1], values[row2] = values[row2][:], values[row1][:]
 
     return new_mat
 
 
-def scale_row(mat: matrix.Matrix, row: int, factor: float) -> matrix.Matrix:
+def scale_row(mat: matrix.Matrix, row: int, factor: float, inplace: bool = False) -> matrix.Matrix:
     '''
     Scales a row of a matrix by a factor.
 
@@ -143,6 +412,7 @@ def scale_row(mat: matrix.Matrix, row: int, factor: float) -> matrix.Matrix:
         mat: The matrix to scale the row of.
         row: The row to scale.
         factor: The factor to scale the row by.
+        inplace: Whether to modify the matrix itself instead of a copy.
 
     returns:
         The matrix with the row scaled.
@@ -153,14 +423,14 @@ def scale_row(mat: matrix.Matrix, row: int, factor: float) -> matrix.Matrix:
     assert row >= 0 and row < m, 'The row is invalid.'
 
     # Scale the row.
-    new_mat = deepcopy(mat)
-    for i in range(n):
-        new_mat.set_value(row + 1, i + 1, mat.get_value(row + 1, i + 1) * factor)
+    new_mat = mat if inplace else deepcopy(mat)
+    values = new_mat.values
+    values[row] = [x * factor for x in values[row]]
 
     return new_mat
 
 
-def add_multiple_times_row(mat: matrix.Matrix, row1: int, row2: int, factor: float) -> matrix.Matrix:
+def add_multiple_times_row(mat: matrix.Matrix, row1: int, row2: int, factor: float, inplace: bool = False) -> matrix.Matrix:
     '''
     Adds a multiple of a row to another row of a matrix.
 
@@ -169,6 +439,7 @@ def add_multiple_times_row(mat: matrix.Matrix, row1: int, row2: int, factor: flo
         row1: The row to add the multiple of a row to.
         row2: The row to add the multiple of a row.
         factor: The factor to multiply the row by.
+        inplace: Whether to modify the matrix itself instead of a copy.
 
     returns:
         The matrix with the multiple of a row added to another row.
@@ -179,27 +450,25 @@ def add_multiple_times_row(mat: matrix.Matrix, row1: int, row2: int, factor: flo
     assert row1 >= 0 and row1 < m and row2 >= 0 and row2 < m, 'The rows are invalid.'
 
     # Add the multiple of a row to another row.
-    new_mat = deepcopy(mat)
-    for i in range(n):
-        new_mat.set_value(row1 + 1, i + 1, mat.get_value(row1 + 1, i + 1) + mat.get_value(row2 + 1, i + 1) * factor)
+    new_mat = mat if inplace else deepcopy(mat)
+    values = new_mat.values
+    values[row1] = [x + y * factor for x, y in zip(values[row1], values[row2])]
 
     return new_mat
 
 
-def row_echelon(mat: matrix.Matrix) -> matrix.Matrix:
+def _row_echelon_inplace(ref: matrix.Matrix) -> None:
     '''
-    Calculates the row echelon form of a matrix.
+    Reduces a matrix to row echelon form in place.
 
     args:
-        mat: The matrix to calculate the row echelon form of.
+        ref: The matrix to reduce.
 
     returns:
-        The row echelon form of the matrix.
+        None
     '''
-    m, n = mat.get_size()
-
-    # Create a copy of the matrix.
-    ref = deepcopy(mat)
+    m, n = ref.get_size()
+    values = ref.values
 
     # Iterate through the rows.
     last_nonzero_row = m
@@ -208,71 +477,204 @@ def row_echelon(mat: matrix.Matrix) -> matrix.Matrix:
             break
 
         # Find the first row with a nonzero entry in the current column.
-        pivot_row = next((r for r in range(i, m) if ref.get_value(r + 1, i + 1) != 0), None)
+        pivot_row = next((r for r in range(i, m) if values[r][i] != 0), None)
 
         # If no nonzero entry is found, move to the next column.
         if pivot_row is None:
             last_nonzero_row -= 1
-            ref = swap_rows(ref, i, last_nonzero_row)
+            swap_rows(ref, i, last_nonzero_row, inplace=True)
             continue
 
         # Swap the current row with the pivot row.
         if pivot_row != i:
-            ref = swap_rows(ref, i, pivot_row)
+            swap_rows(ref, i, pivot_row, inplace=True)
 
         # Add multiples of the current row to lower rows to eliminate entries in the current column.
-        pivot_value = ref.get_value(i + 1, i + 1)
+        pivot_value = values[i][i]
         for r in range(i + 1, m):
-            factor = ref.get_value(r + 1, i + 1)
+            factor = values[r][i]
             if factor != 0:
-                ref = add_multiple_times_row(ref, r, i, -factor / pivot_value)
+                add_multiple_times_row(ref, r, i, -factor / pivot_value, inplace=True)
+
+
+def row_echelon(mat: matrix.Matrix, exact: bool = False) -> matrix.Matrix:
+    '''
+    Calculates the row echelon form of a matrix.
+
+    args:
+        mat: The matrix to calculate the row echelon form of.
+        exact: Whether to use fraction-free (Bareiss) elimination, which keeps
+               integer matrices integer and gives exact results.
+
+    returns:
+        The row echelon form of the matrix.
+    '''
+    # Reuse the row echelon form computed since the matrix last changed.
+    return mat.memoize(('row_echelon', exact), lambda: _row_echelon(mat, exact)).copy()
+
+
+def _row_echelon(mat: matrix.Matrix, exact: bool) -> matrix.Matrix:
+    '''
+    Calculates the row echelon form of a matrix without looking at its cache.
+    '''
+    if exact:
+        ref, _, _ = matrix.bareiss_eliminate(_exact_values(mat))
+        return mat.like(ref, storage='list')
+
+    # Create a copy of the matrix and eliminate in place.
+    ref = deepcopy(mat)
+    _row_echelon_inplace(ref)
 
     # Return the row echelon form.
     return ref
 
 
-def reduced_row_echelon(mat: matrix.Matrix) -> matrix.Matrix:
+def reduced_row_echelon(mat: matrix.Matrix, exact: bool = False) -> matrix.Matrix:
     '''
     Calculates the reduced row echelon form of a matrix.
 
     args:
         mat: The matrix to calculate the reduced row echelon form of.
+        exact: Whether to use fraction-free (Bareiss) elimination, dividing by
+               the pivots only at the end so that the result holds exact fractions.
 
     returns:
         The reduced row echelon form of the matrix.
     '''
+    # Reuse the reduced row echelon form computed since the matrix last changed.
+    return mat.memoize(('reduced_row_echelon', exact), lambda: _reduced_row_echelon(mat, exact)).copy()
+
+
+def _reduced_row_echelon(mat: matrix.Matrix, exact: bool) -> matrix.Matrix:
+    '''
+    Calculates the reduced row echelon form of a matrix without looking at its cache.
+    '''
     m, n = mat.get_size()
 
-    # Create a copy of the matrix.
-    rref = deepcopy(mat)
+    if exact:
+        rref, _, pivots = matrix.bareiss_eliminate(_exact_values(mat), reduce=True)
+        for i, pivot_col in enumerate(pivots):
+            pivot_value = rref[i][pivot_col]
+            rref[i] = [Fraction(x) / pivot_value for x in rref[i]]
+        # Give whole results as integers, as the adjoint does.
+        rref = [[_simplify(x) for x in row] for row in rref]
+        return mat.like(rref, storage='list')
 
-    rref = row_echelon(rref)
+    # Create a copy of the matrix and eliminate in place.
+    rref = deepcopy(mat)
+    _row_echelon_inplace(rref)
+    values = rref.values
 
     # Scale the pivot rows to have a leading coefficient of 1.
     for i in range(min(m, n)):
-        pivot_col = next((c for c in range(i, n) if rref.get_value(i + 1, c + 1) != 0), None)
+        pivot_col = next((c for c in range(i, n) if values[i][c] != 0), None)
         if pivot_col is not None:
-            pivot_value = rref.get_value(i + 1, pivot_col + 1)
-            rref = scale_row(rref, i, 1 / pivot_value)
+            pivot_value = values[i][pivot_col]
+            scale_row(rref, i, 1 / pivot_value, inplace=True)
 
     # Convert the matrix to reduced row echelon form.
     for i in range(min(m, n) - 1, -1, -1):
-        pivot_col = next((c for c in range(i, n) if rref.get_value(i + 1, c + 1) != 0), None)
+        pivot_col = next((c for c in range(i, n) if values[i][c] != 0), None)
         if pivot_col is not None:
             for row in range(i):
-                rref = add_multiple_times_row(rref, row, i, -rref.get_value(row + 1, pivot_col + 1))
+                add_multiple_times_row(rref, row, i, -values[row][pivot_col], inplace=True)
 
     # Return the reduced row echelon form.
     return rref
 
 
-def solve(mat: matrix.Matrix, b: matrix.Matrix) -> matrix.Matrix:
+class LUFactorization:
+    '''
+    The LU factorization P * A = L * U of a square matrix, computed once with
+    partial pivoting and reused to solve against any number of right-hand
+    sides in O(n^2) per column.
+
+    attributes:
+        lu: L (below the diagonal, unit diagonal implied) and U packed into one tuple of rows.
+        perm: perm[i] is the original row of A that ended up in row i, as a tuple.
+        sign: The sign of the row permutation.
+        singular: Whether a zero pivot was encountered.
+    '''
+
+    def __init__(self, mat: matrix.Matrix):
+        '''
+        Factorizes a matrix.
+
+        args:
+            mat: The square matrix to factorize.
+        '''
+        m, n = mat.get_size()
+
+        # Check if the matrix is square.
+        assert m == n, 'The matrix is not square.'
+
+        self.n = n
+        lu, perm, self.sign, self.singular = matrix.lu_decompose(mat.values)
+
+        # The factors are shared by every caller of factorize, so they are kept immutable.
+        self.lu = tuple(map(tuple, lu))
+        self.perm = tuple(perm)
+
+    def determinant(self) -> float:
+        '''
+        Calculates the determinant of the factorized matrix.
+
+        returns:
+            The determinant of the matrix.
+        '''
+        if self.singular:
+            return 0.0
+
+        det = float(self.sign)
+        for i in range(self.n):
+            det *= self.lu[i][i]
+
+        return det
+
+    def solve(self, b: matrix.Matrix) -> matrix.Matrix:
+        '''
+        Solves A * X = B by forward and back substitution.
+
+        args:
+            b: The matrix of constants, either a column vector or n x k.
+
+        returns:
+            The n x k solution of the system of linear equations.
+        '''
+        # Check if the matrix is invertible.
+        assert not self.singular, 'The matrix is not invertible.'
+
+        # Check if the matrix and the constants have the same number of rows.
+        assert self.n == b.get_size()[0], 'The matrix and the vector do not have the same number of rows.'
+
+        # Substitute with the packed factors.
+        x = matrix.lu_solve(self.lu, self.perm, b.values)
+
+        return b.like(x)
+
+
+def factorize(mat: matrix.Matrix) -> LUFactorization:
+    '''
+    Calculates the LU factorization of a matrix so that it can be reused to
+    solve many systems with the same coefficients.
+
+    args:
+        mat: The square matrix to factorize.
+
+    returns:
+        The LU factorization of the matrix, shared with earlier calls while the matrix is unchanged.
+    '''
+    return mat.memoize(('factorize',), lambda: LUFactorization(mat))
+
+
+def solve(mat: matrix.Matrix, b: matrix.Matrix, exact: bool = False) -> matrix.Matrix:
     '''
     Solves a system of linear equations.
 
     args:
         mat: The matrix of coefficients.
-        b: The matrix of constants.
+        b: The matrix of constants, either a column vector or n x k for several right-hand sides at once.
+        exact: Whether to use fraction-free elimination so that the solution holds exact fractions.
 
     returns:
         The solution of the system of linear equations.
@@ -282,14 +684,574 @@ def solve(mat: matrix.Matrix, b: matrix.Matrix) -> matrix.Matrix:
     # Check if the matrix is square.
     assert m == n, 'The matrix is not square.'
 
-    # Check if the matrix is invertible.
-    assert mat.determinant() != 0, 'The matrix is not invertible.'
-
     # Check if the matrix and the vector have the same number of rows.
     assert m == b.get_size()[0], 'The matrix and the vector do not have the same number of rows.'
-    assert b.get_size()[1] == 1, 'The vector is not a column vector.'
+
+    if exact:
+        return b.like(_exact_reduce(mat, _exact_values(b)), storage='list')
+
+    # Dispatch to the backend of the matrix if it has a kernel.
+    kernel = backends.get_kernel('solve', mat, b)
+    if kernel is not None:
+        return b.like(kernel(mat, b))
 
     # Solve the system of linear equations.
-    solution = inverse(mat).matrix_multiply(b)
+    solution = factorize(mat).solve(b)
 
     return solution
+
+
+class ChainPlan:
+    '''
+    The evaluation order chosen for a chain of matrix products.
+
+    attributes:
+        order: The parenthesization, with the matrices numbered from 1, e.g. '((M1 M2) M3)'.
+        flops: The estimated floating point operations of that order (2 * m * n * p per product).
+        naive_flops: The estimated floating point operations of multiplying from left to right.
+        split: split[i][j] is where the product of matrices i to j is split in two.
+    '''
+
+    def __init__(self, order: str, flops: int, naive_flops: int, split: list):
+        self.order = order
+        self.flops = flops
+        self.naive_flops = naive_flops
+        self.split = split
+
+    def __repr__(self) -> str:
+        return f'ChainPlan({self.order}, flops={self.flops}, naive_flops={self.naive_flops})'
+
+
+def chain_plan(shapes: list) -> ChainPlan:
+    '''
+    Finds the cheapest order to multiply a chain of matrices with the classic
+    O(k^3) dynamic program over the sizes of the matrices.
+
+    args:
+        shapes: The (rows, columns) of each matrix of the chain.
+
+    returns:
+        The plan of the cheapest evaluation order.
+    '''
+    k = len(shapes)
+
+    # Check if the matrices can be multiplied in sequence.
+    assert k > 0, 'The chain is empty.'
+    for (m1, n1), (m2, n2) in zip(shapes, shapes[1:]):
+        assert n1 == m2, 'The matrices are not of compatible size.'
+
+    dims = [shapes[0][0]] + [n for _, n in shapes]
+
+    # cost[i][j] is the fewest multiply-adds needed for matrices i to j.
+    cost = [[0] * k for _ in range(k)]
+    split = [[0] * k for _ in range(k)]
+    for length in range(1, k):
+        for i in range(k - length):
+            j = i + length
+            cost[i][j] = None
+            for s in range(i, j):
+                value = cost[i][s] + cost[s + 1][j] + dims[i] * dims[s + 1] * dims[j + 1]
+                if cost[i][j] is None or value < cost[i][j]:
+                    cost[i][j], split[i][j] = value, s
+
+    def order(i: int, j: int) -> str:
+        if i == j:
+            return f'M{i + 1}'
+        return f'({order(i, split[i][j])} {order(split[i][j] + 1, j)})'
+
+    naive = sum(dims[0] * dims[s] * dims[s + 1] for s in range(1, k))
+
+    return ChainPlan(order(0, k - 1), 2 * cost[0][k - 1], 2 * naive, split)
+
+
+def multi_multiply(matrices: list, return_plan: bool = False):
+    '''
+    Multiplies a chain of matrices in the cheapest order.
+
+    args:
+        matrices: The matrices to multiply, from left to right.
+        return_plan: Whether to also return the chosen plan, e.g. to log it.
+
+    returns:
+        The product of the matrices, and the ChainPlan if return_plan is set.
+    '''
+    assert matrices and all(isinstance(mat, matrix.Matrix) for mat in matrices), 'The chain must be a list of matrices.'
+
+    plan = chain_plan([mat.get_size() for mat in matrices])
+
+    def product(i: int, j: int) -> matrix.Matrix:
+        if i == j:
+            return matrices[i]
+        s = plan.split[i][j]
+        return product(i, s).matrix_multiply(product(s + 1, j))
+
+    result = product(0, len(matrices) - 1)
+
+    if return_plan:
+        return result, plan
+    return result
+
+
+class IterativeSolution:
+    '''
+    The result of an iterative solver.
+
+    attributes:
+        x: The approximate solution as an n x 1 matrix.
+        converged: Whether the relative residual fell below the tolerance.
+        iterations: The number of iterations performed.
+        residuals: The relative residual norm ||b - A x|| / ||b|| before the first iteration and after each one
+                   (for GMRES, the estimate it minimizes).
+    '''
+
+    def __init__(self, x: matrix.Matrix, converged: bool, iterations: int, residuals: list):
+        self.x = x
+        self.converged = converged
+        self.iterations = iterations
+        self.residuals = residuals
+
+    def __repr__(self) -> str:
+        return (f'IterativeSolution(converged={self.converged}, iterations={self.iterations}, '
+                f'residual={self.residuals[-1]:.3g})')
+
+
+def _operator(a) -> tuple:
+    '''
+    Gives the product of an operator with a vector, so that the iterative solvers
+    only need matrix-vector products.
+
+    args:
+        a: A square Matrix, a square SparseMatrix, or a function giving A * x for a list x.
+
+    returns:
+        The function giving A * x for a list x, and the size n of A (None for a function).
+    '''
+    if isinstance(a, matrix.Matrix):
+        m, n = a.get_size()
+        assert m == n, 'The matrix is not square.'
+        rows = [list(map(float, row)) for row in a.values]
+        return (lambda x: [sum(map(mul, row, x)) for row in rows]), n
+
+    if isinstance(a, sparse.SparseMatrix):
+        m, n = a.get_size()
+        assert m == n, 'The matrix is not square.'
+        return a.matvec, n
+
+    assert callable(a), 'The operator must be a matrix, a sparse matrix or a function.'
+    return a, None
+
+
+def _entries(a) -> list:
+    '''
+    Gives the nonzero elements of each row of a matrix.
+
+    args:
+        a: A Matrix or a SparseMatrix.
+
+    returns:
+        For each row, the columns of its nonzero elements in increasing order and their values.
+    '''
+    if isinstance(a, sparse.SparseMatrix):
+        indptr, indices, data = a.indptr, a.indices, a.data
+        return [(list(indices[indptr[i]:indptr[i + 1]]), [float(x) for x in data[indptr[i]:indptr[i + 1]]])
+                for i in range(len(indptr) - 1)]
+
+    assert isinstance(a, matrix.Matrix), 'This method needs the elements of the matrix, not only a function.'
+    entries = []
+    for row in a.values:
+        columns = [j for j, x in enumerate(row) if x != 0]
+        entries.append((columns, [float(row[j]) for j in columns]))
+
+    return entries
+
+
+def _diagonal(entries: list) -> list:
+    '''
+    Gives the diagonal of a matrix from the nonzero elements of its rows.
+
+    args:
+        entries: The nonzero elements of each row, as given by _entries.
+
+    returns:
+        The diagonal elements.
+    '''
+    diagonal = []
+    for i, (columns, values) in enumerate(entries):
+        value = values[columns.index(i)] if i in columns else 0.0
+        assert value != 0, 'The diagonal of the matrix must not contain zeros.'
+        diagonal.append(value)
+
+    return diagonal
+
+
+def _ilu0(entries: list) -> tuple:
+    '''
+    Calculates the incomplete LU factorization ILU(0), which keeps only the elements
+    of L and U where the matrix itself has nonzeros, so it costs O(nonzeros) memory.
+
+    args:
+        entries: The nonzero elements of each row, as given by _entries.
+
+    returns:
+        The elements of L below the diagonal (unit diagonal implied), the diagonal of U
+        and the elements of U above the diagonal, as (column, value) pairs per row.
+    '''
+    rows = [dict(zip(columns, values)) for columns, values in entries]
+    for i, row in enumerate(rows):
+        for k in sorted(row):
+            if k >= i:
+                break
+            pivot = rows[k].get(k, 0.0)
+            assert pivot != 0, 'ILU(0) met a zero pivot.'
+            factor = row[k] = row[k] / pivot
+            for j, value in rows[k].items():
+                if j > k and j in row:
+                    row[j] -= factor * value
+
+    lower = [[(j, x) for j, x in row.items() if j < i] for i, row in enumerate(rows)]
+    upper = [[(j, x) for j, x in row.items() if j > i] for i, row in enumerate(rows)]
+    diagonal = [row.get(i, 0.0) for i, row in enumerate(rows)]
+    assert all(diagonal), 'ILU(0) met a zero pivot.'
+
+    return lower, diagonal, upper
+
+
+def _ilu0_solve(factors: tuple, r: list) -> list:
+    '''
+    Solves L * U * z = r by forward and back substitution with the factors of _ilu0.
+    '''
+    lower, diagonal, upper = factors
+    y = []
+    for i, terms in enumerate(lower):
+        y.append(r[i] - sum(x * y[j] for j, x in terms))
+    z = [0.0] * len(y)
+    for i in range(len(y) - 1, -1, -1):
+        z[i] = (y[i] - sum(x * z[j] for j, x in upper[i])) / diagonal[i]
+
+    return z
+
+
+def _preconditioner(a, preconditioner):
+    '''
+    Gives the function applying the inverse of a preconditioner M to a vector.
+
+    args:
+        a: The operator of the system.
+        preconditioner: None, 'jacobi' (M is the diagonal of A), 'ilu0' (M = L * U from ILU(0)),
+                        or a function giving M^-1 * r for a list r.
+
+    returns:
+        The function, or None without a preconditioner.
+    '''
+    if preconditioner is None or callable(preconditioner):
+        return preconditioner
+
+    assert preconditioner in ('jacobi', 'ilu0'), 'The preconditioner must be None, "jacobi", "ilu0" or a function.'
+    if preconditioner == 'jacobi':
+        inverse_diagonal = [1 / x for x in _diagonal(_entries(a))]
+        return lambda r: list(map(mul, inverse_diagonal, r))
+
+    factors = _ilu0(_entries(a))
+    return lambda r: _ilu0_solve(factors, r)
+
+
+def _start(a, b, x0) -> tuple:
+    '''
+    Prepares an iterative solve of A * x = b.
+
+    args:
+        a: The operator, see _operator.
+        b: The right-hand side, an n x 1 matrix or a list of n numbers.
+        x0: The initial guess in the same form, or None for zeros.
+
+    returns:
+        The product function of A, b and x0 as lists of floats, and the norm of b.
+    '''
+    matvec, n = _operator(a)
+    b = _as_vector(b)
+    assert n is None or n == len(b), 'The matrix and the vector do not have the same number of rows.'
+    x = [0.0] * len(b) if x0 is None else _as_vector(x0)
+    assert len(x) == len(b), 'The initial guess and the vector do not have the same number of rows.'
+
+    return matvec, b, x, math.sqrt(_dot(b, b))
+
+
+def _as_vector(v) -> list:
+    '''
+    Converts a column vector, given as an n x 1 matrix or a list of numbers, to a list of floats.
+    '''
+    if isinstance(v, matrix.Matrix):
+        assert v.get_size()[1] == 1, 'The vector must be a column vector.'
+        return [float(row[0]) for row in v.values]
+
+    return [float(x) for x in v]
+
+
+def _dot(u: list, v: list) -> float:
+    '''
+    Calculates the dot product of two vectors.
+    '''
+    return sum(map(mul, u, v))
+
+
+def _residual(matvec, b: list, x: list) -> list:
+    '''
+    Calculates the residual b - A * x.
+    '''
+    return list(map(sub, b, matvec(x)))
+
+
+def _finish(x: list, converged: bool, residuals: list) -> IterativeSolution:
+    '''
+    Packs the result of an iterative solver.
+    '''
+    return IterativeSolution(matrix.Matrix([[value] for value in x]), converged, len(residuals) - 1,
+                             residuals)
+
+
+def conjugate_gradient(a, b, x0=None, tol: float = 1e-8, max_iter: int = None,
+                       preconditioner=None) -> IterativeSolution:
+    '''
+    Solves A * x = b for a symmetric positive definite A with the (preconditioned)
+    conjugate gradient method, which needs one product with A per iteration.
+
+    args:
+        a: A square Matrix, a square SparseMatrix, or a function giving A * x for a list x.
+        b: The right-hand side, an n x 1 matrix or a list of n numbers.
+        x0: The initial guess in the same form, zeros by default.
+        tol: The relative residual ||b - A x|| / ||b|| to stop at.
+        max_iter: The largest number of iterations, 10 * n by default.
+        preconditioner: None, 'jacobi', 'ilu0' or a function giving M^-1 * r for a list r,
+                        where M must be symmetric positive definite.
+
+    returns:
+        The solution, whether it converged and the residual after each iteration.
+    '''
+    matvec, b, x, b_norm = _start(a, b, x0)
+    if b_norm == 0:
+        return _finish([0.0] * len(b), True, [0.0])
+    precondition = _preconditioner(a, preconditioner)
+    max_iter = 10 * len(b) if max_iter is None else max_iter
+
+    r = _residual(matvec, b, x)
+    residuals = [math.sqrt(_dot(r, r)) / b_norm]
+    z = precondition(r) if precondition else r
+    p = list(z)
+    rz = _dot(r, z)
+
+    while residuals[-1] > tol and len(residuals) <= max_iter:
+        ap = matvec(p)
+        curvature = _dot(p, ap)
+        assert curvature > 0, 'The matrix is not positive definite.'
+        alpha = rz / curvature
+        x = [xi + alpha * pi for xi, pi in zip(x, p)]
+        r = [ri - alpha * api for ri, api in zip(r, ap)]
+        residuals.append(math.sqrt(_dot(r, r)) / b_norm)
+
+        # Make the next direction conjugate to the previous ones.
+        z = precondition(r) if precondition else r
+        rz, rz_old = _dot(r, z), rz
+        beta = rz / rz_old
+        p = [zi + beta * pi for zi, pi in zip(z, p)]
+
+    return _finish(x, residuals[-1] <= tol, residuals)
+
+
+def jacobi(a, b, x0=None, tol: float = 1e-8, max_iter: int = None, diagonal: list = None) -> IterativeSolution:
+    '''
+    Solves A * x = b with the Jacobi method, x <- x + D^-1 (b - A x) where D is the
+    diagonal of A, which converges for strictly diagonally dominant matrices.
+
+    args:
+        a: A square Matrix, a square SparseMatrix, or a function giving A * x for a list x.
+        b: The right-hand side, an n x 1 matrix or a list of n numbers.
+        x0: The initial guess in the same form, zeros by default.
+        tol: The relative residual ||b - A x|| / ||b|| to stop at.
+        max_iter: The largest number of iterations, 10 * n by default.
+        diagonal: The diagonal of A, only needed when A is a function.
+
+    returns:
+        The solution, whether it converged and the residual after each iteration.
+    '''
+    matvec, b, x, b_norm = _start(a, b, x0)
+    if b_norm == 0:
+        return _finish([0.0] * len(b), True, [0.0])
+    if diagonal is None:
+        diagonal = _diagonal(_entries(a))
+    assert len(diagonal) == len(b) and all(diagonal), 'The diagonal must have one nonzero element per row.'
+    max_iter = 10 * len(b) if max_iter is None else max_iter
+
+    r = _residual(matvec, b, x)
+    residuals = [math.sqrt(_dot(r, r)) / b_norm]
+    while residuals[-1] > tol and len(residuals) <= max_iter:
+        x = [xi + ri / di for xi, ri, di in zip(x, r, diagonal)]
+        r = _residual(matvec, b, x)
+        residuals.append(math.sqrt(_dot(r, r)) / b_norm)
+
+    return _finish(x, residuals[-1] <= tol, residuals)
+
+
+def gauss_seidel(a, b, x0=None, tol: float = 1e-8, max_iter: int = None) -> IterativeSolution:
+    '''
+    Solves A * x = b with the Gauss-Seidel method, which sweeps the rows using each
+    updated element straight away. It converges for strictly diagonally dominant
+    or symmetric positive definite matrices, usually about twice as fast as Jacobi.
+    Each sweep reads the rows of A, so A must be a Matrix or a SparseMatrix.
+
+    args:
+        a: A square Matrix or a square SparseMatrix.
+        b: The right-hand side, an n x 1 matrix or a list of n numbers.
+        x0: The initial guess in the same form, zeros by default.
+        tol: The relative residual ||b - A x|| / ||b|| to stop at.
+        max_iter: The largest number of sweeps, 10 * n by default.
+
+    returns:
+        The solution, whether it converged and the residual after each sweep.
+    '''
+    matvec, b, x, b_norm = _start(a, b, x0)
+    if b_norm == 0:
+        return _finish([0.0] * len(b), True, [0.0])
+    entries = _entries(a)
+    diagonal = _diagonal(entries)
+    max_iter = 10 * len(b) if max_iter is None else max_iter
+
+    r = _residual(matvec, b, x)
+    residuals = [math.sqrt(_dot(r, r)) / b_norm]
+    while residuals[-1] > tol and len(residuals) <= max_iter:
+        for i, (columns, values) in enumerate(entries):
+            total = sum(value * x[j] for j, value in zip(columns, values) if j != i)
+            x[i] = (b[i] - total) / diagonal[i]
+        r = _residual(matvec, b, x)
+        residuals.append(math.sqrt(_dot(r, r)) / b_norm)
+
+    return _finish(x, residuals[-1] <= tol, residuals)
+
+
+def gmres(a, b, x0=None, tol: float = 1e-8, max_iter: int = None, restart: int = 30,
+          preconditioner=None) -> IterativeSolution:
+    '''
+    Solves A * x = b for any invertible A with restarted GMRES, which picks the
+    element of the growing Krylov space minimizing the residual, using Givens
+    rotations to update the least squares problem at each iteration. The
+    preconditioner is applied on the right, so the residuals are those of the
+    original system.
+
+    args:
+        a: A square Matrix, a square SparseMatrix, or a function giving A * x for a list x.
+        b: The right-hand side, an n x 1 matrix or a list of n numbers.
+        x0: The initial guess in the same form, zeros by default.
+        tol: The relative residual ||b - A x|| / ||b|| to stop at.
+        max_iter: The largest total number of iterations over all restarts, 10 * n by default.
+        restart: The number of iterations between restarts, which bounds the memory to
+                 restart + 1 vectors.
+        preconditioner: None, 'jacobi', 'ilu0' or a function giving M^-1 * r for a list r.
+
+    returns:
+        The solution, whether it converged and the residual after each iteration.
+    '''
+    matvec, b, x, b_norm = _start(a, b, x0)
+    if b_norm == 0:
+        return _finish([0.0] * len(b), True, [0.0])
+    precondition = _preconditioner(a, preconditioner)
+    max_iter = 10 * len(b) if max_iter is None else max_iter
+    assert restart > 0, 'The restart length must be positive.'
+
+    r = _residual(matvec, b, x)
+    beta = math.sqrt(_dot(r, r))
+    residuals = [beta / b_norm]
+
+    while residuals[-1] > tol and len(residuals) <= max_iter:
+        basis = [[ri / beta for ri in r]]
+        directions, columns, cosines, sines = [], [], [], []
+        g = [beta]    # Right-hand side of the least squares problem, rotated
+
+        for j in range(min(restart, max_iter - len(residuals) + 1)):
+            z = precondition(basis[j]) if precondition else basis[j]
+            directions.append(z)
+            w = matvec(z)
+
+            # Orthogonalize against the basis with modified Gram-Schmidt.
+            h = []
+            for v in basis:
+                hij = _dot(w, v)
+                w = [wk - hij * vk for wk, vk in zip(w, v)]
+                h.append(hij)
+            h_next = math.sqrt(_dot(w, w))
+            h.append(h_next)
+
+            # Apply the earlier rotations, then the one zeroing the new subdiagonal element.
+            for i, (c, s) in enumerate(zip(cosines, sines)):
+                h[i], h[i + 1] = c * h[i] + s * h[i + 1], c * h[i + 1] - s * h[i]
+            radius = math.hypot(h[j], h[j + 1])
+            assert radius != 0, 'GMRES broke down: the matrix is singular.'
+            cosines.append(h[j] / radius)
+            sines.append(h[j + 1] / radius)
+            h[j], h[j + 1] = radius, 0.0
+            g.append(-sines[j] * g[j])
+            g[j] *= cosines[j]
+            columns.append(h)
+
+            residuals.append(abs(g[j + 1]) / b_norm)
+            if residuals[-1] <= tol or h_next == 0:
+                break
+            basis.append([wk / h_next for wk in w])
+
+        # Solve the triangular system for the coefficients of the directions.
+        k = len(columns)
+        y = [0.0] * k
+        for i in range(k - 1, -1, -1):
+            y[i] = (g[i] - sum(columns[j][i] * y[j] for j in range(i + 1, k))) / columns[i][i]
+        for yi, z in zip(y, directions):
+            x = [xk + yi * zk for xk, zk in zip(x, z)]
+
+        # Restart from the true residual.
+        r = _residual(matvec, b, x)
+        beta = math.sqrt(_dot(r, r))
+        if beta == 0:
+            break
+
+    return _finish(x, beta / b_norm <= tol, residuals)
+
+
+def _row_cost(reads: int, writes: int, flops: int):
+    '''
+    Gives the profiling cost function of a row operation, counting per element of a row.
+    '''
+    def cost(args: tuple, kwargs: dict, result: matrix.Matrix) -> dict:
+        n = result.get_size()[1]
+        return {'flops': flops * n, 'reads': reads * n, 'writes': writes * n}
+
+    return cost
+
+
+def _gauss_jordan_cost(args: tuple, kwargs: dict, result: tuple) -> dict:
+    '''
+    Gives the profiling cost of a Gauss-Jordan sweep: every pivot row is scaled
+    and subtracted from every other row, from the pivot column on.
+    '''
+    aug = args[0]
+    m, width = len(aug), len(aug[0])
+    updates = sum(m * (width - c) for c in result[1])
+
+    return {'flops': 2 * updates, 'reads': 2 * updates}
+
+
+def _register_profiling() -> None:
+    '''
+    Registers the operations of this module, and the kernel behind inverse and
+    adjoint, to be counted and timed by matrix.profile().
+    '''
+    module = sys.modules[__name__]
+    costs = {
+        'swap_rows': _row_cost(2, 2, 0),
+        'scale_row': _row_cost(1, 1, 1),
+        'add_multiple_times_row': _row_cost(2, 1, 2),
+    }
+    for name in ('minor', 'cofactor', 'adjoint', 'inverse', 'swap_rows', 'scale_row', 'add_multiple_times_row',
+                 'row_echelon', 'reduced_row_echelon', 'factorize', 'solve', 'chain_plan', 'multi_multiply',
+                 'conjugate_gradient', 'jacobi', 'gauss_seidel', 'gmres'):
+        profiling.register(module, name, cost=costs.get(name))
+    profiling.register(module, '_gauss_jordan', cost=_gauss_jordan_cost, operation=False)
+
+
+_register_profiling()